@@ -12,7 +12,6 @@ from f2.log.logger import logger
 from f2.utils.utils import merge_config, get_resource_path, check_proxy_avail
 from f2.utils.conf_manager import ConfigManager
 from f2.i18n.translator import TranslationManager, _
-from f2.apps.bark.utils import ClientConfManager
 
 
 def handler_help(
@@ -293,6 +292,9 @@ def bark(
     # cli参数为配置文件的热修改，可以随时修改每一个参数。
     ##################
 
+    # 应用工具模块较重，仅在执行命令时导入 (The app utils module is heavy, import it on run)
+    from f2.apps.bark.utils import ClientConfManager
+
     # 读取低频主配置文件
     main_manager = ConfigManager(f2.APP_CONFIG_FILE_PATH)
     main_conf_path = get_resource_path(f2.APP_CONFIG_FILE_PATH)
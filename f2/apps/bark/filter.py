@@ -23,4 +23,6 @@ class BarkNotificationFilter(JSONModel):
         return self._data
 
     def _to_dict(self) -> Dict:
-        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+        return {
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
+        }
@@ -1,10 +1,38 @@
 # path: f2/apps/douyin/algorithm/webcast_signature.py
 
+import json
+import asyncio
 import execjs
 import hashlib
+import functools
+import threading
+
 from pathlib import Path
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
 from f2.utils.utils import get_resource_path
 
+# 每个 JS 上下文缓存的用户代理数量 (Number of User-Agents with a cached JS context)
+CONTEXT_CACHE_SIZE = 8
+
+# 批量签名辅助函数，一次运行时调用即可签名多个 X-MS-STUB
+# (Batch helper that signs many X-MS-STUB values in a single runtime call)
+_BATCH_HELPER = """
+function get_signatures(stubs) {
+    return stubs.map(function (stub) {
+        return get_signature(stub)["X-Bogus"];
+    });
+}
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _read_script() -> str:
+    """读取并缓存签名脚本 (Read and cache the signature script)"""
+    js_path = get_resource_path("apps/douyin/algorithm/webcast_signature.js")
+    return Path(js_path).read_text(encoding="utf-8")
+
 
 class DouyinWebcastSignature:
     """
@@ -12,12 +40,22 @@ class DouyinWebcastSignature:
 
     该类用于生成抖音直播间的签名，通过传入直播间 ID 和用户唯一 ID，计算并返回签名。签名通过执行 JavaScript 代码计算生成，并结合其他参数进行 MD5 加密。
 
+    脚本只从磁盘读取一次，编译后的 JS 上下文按用户代理缓存在进程级的小型 LRU 池中，
+    多个实例与线程共享同一个上下文。`execjs` 的外部运行时（如 Node.js）每次调用都会启动一个进程，
+    因此需要签名多个直播间时应使用 `get_signatures`，在一次运行时调用中完成全部签名。
+
     类属性:
     - user_agent (str): 自定义的用户代理字符串。如果未指定，使用默认的浏览器 UA。
+    - _contexts (dict): 用户代理到已编译 JS 上下文的映射。
+    - _lock (threading.Lock): 保护上下文池的锁。
 
     类方法:
     - __init__: 初始化方法，接受一个可选的 user_agent 参数，用于设置请求头中的用户代理。
+    - get_context: 获取（或编译）用户代理对应的 JS 上下文。
     - get_signature: 根据直播间 ID 和用户唯一 ID 生成签名。
+    - get_signatures: 在一次运行时调用中为多个直播间生成签名。
+    - get_signature_async: 在执行器中生成签名，不阻塞事件循环。
+    - get_signatures_async: 在执行器中批量生成签名。
 
     异常处理:
     - 在获取签名过程中，可能会由于 JavaScript 执行错误或文件读取问题而抛出异常。
@@ -30,6 +68,9 @@ class DouyinWebcastSignature:
         # 获取直播间签名
         signature = signature_handler.get_signature("7382517534467115826", "7382524529011246630")
 
+        # 批量获取多个直播间的签名
+        signatures = signature_handler.get_signatures(room_ids, "7382524529011246630")
+
         # 输出签名
         print(signature)
     ```
@@ -44,6 +85,9 @@ class DouyinWebcastSignature:
     - `hashlib` 用于计算 MD5 值。
     """
 
+    _contexts: Dict[str, "execjs.ExternalRuntime.Context"] = {}
+    _lock: threading.Lock = threading.Lock()
+
     def __init__(self, user_agent: str = None):
         self.user_agent = (
             user_agent
@@ -51,45 +95,132 @@ class DouyinWebcastSignature:
             else "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
         )  # 自定义 ua，为空则设置一个默认 ua
 
-    def get_signature(self, room_id: str, user_unique_id: str) -> str:
+    @classmethod
+    def get_context(cls, user_agent: str):
         """
-        获取直播间签名
+        获取用户代理对应的已编译 JS 上下文，池满时淘汰最久未使用的上下文
+        (Get the compiled JS context for the User-Agent, evicting the least recently
+        used one when the pool is full)
 
         Args:
-            room_id: (str) 直播间 ID
-            user_unique_id: (str) 用户唯一 ID
+            user_agent: (str) 用户代理
 
         Returns:
-            signature: (str) 签名
+            ctx: execjs 运行环境
         """
-        # 使用 importlib_resources 读取库中的 js 文件
-        js_path = get_resource_path("apps/douyin/algorithm/webcast_signature.js")
-        # 读取 js 文件，确保使用 utf-8 编码
-        js_code = Path(js_path).read_text()
-
-        # 在 js_code 中动态设置 user_agent
-        js_code = f"""
-        _navigator = {{
-            userAgent: "{self.user_agent}"
-        }};
-        {js_code}
+        with cls._lock:
+            ctx = cls._contexts.pop(user_agent, None)
+            if ctx is None:
+                # 在 js_code 中动态设置 user_agent
+                js_code = f"""
+                _navigator = {{
+                    userAgent: {json.dumps(user_agent)}
+                }};
+                {_read_script()}
+                {_BATCH_HELPER}
+                """
+                ctx = execjs.compile(js_code)
+
+            cls._contexts[user_agent] = ctx
+            while len(cls._contexts) > CONTEXT_CACHE_SIZE:
+                cls._contexts.pop(next(iter(cls._contexts)))
+            return ctx
+
+    @staticmethod
+    def get_x_ms_stub(room_id: str, user_unique_id: str) -> str:
         """
+        计算待签名字符串的 MD5 值 (Compute the MD5 of the string to be signed)
 
-        # 创建 execjs 运行环境
-        ctx = execjs.compile(js_code)
+        Args:
+            room_id: (str) 直播间 ID
+            user_unique_id: (str) 用户唯一 ID
 
+        Returns:
+            x_ms_stub: (str) X-MS-STUB
+        """
         # 构造待 signature 的字符串
         raw_string = f"live_id=1,aid=6383,version_code=180800,webcast_sdk_version=1.0.14-beta.0,room_id={room_id},sub_room_id=,sub_channel_id=,did_rule=3,user_unique_id={user_unique_id},device_platform=web,device_type=,ac=,identity=audience"
 
         # md5 计算 X-MS-STUB
-        x_ms_stub = hashlib.md5(raw_string.encode("utf-8")).hexdigest()
+        return hashlib.md5(raw_string.encode("utf-8")).hexdigest()
+
+    def get_signature(self, room_id: str, user_unique_id: str) -> str:
+        """
+        获取直播间签名
+
+        Args:
+            room_id: (str) 直播间 ID
+            user_unique_id: (str) 用户唯一 ID
+
+        Returns:
+            signature: (str) 签名
+        """
+        x_ms_stub = self.get_x_ms_stub(room_id, user_unique_id)
 
         # 调用 js 函数计算 signature
-        result = ctx.call("get_signature", x_ms_stub)
+        result = self.get_context(self.user_agent).call("get_signature", x_ms_stub)
 
         # 加密参数的 key 为 X-Bogus
         return result.get("X-Bogus")
 
+    def get_signatures(self, room_ids: List[str], user_unique_id: str) -> List[str]:
+        """
+        在一次运行时调用中获取多个直播间的签名
+
+        Args:
+            room_ids: (List[str]) 直播间 ID 列表
+            user_unique_id: (str) 用户唯一 ID
+
+        Returns:
+            signatures: (List[str]) 签名列表，顺序与 room_ids 一致
+        """
+        if not room_ids:
+            return []
+
+        stubs = [self.get_x_ms_stub(room_id, user_unique_id) for room_id in room_ids]
+        return self.get_context(self.user_agent).call("get_signatures", stubs)
+
+    async def get_signature_async(
+        self, room_id: str, user_unique_id: str, executor: Optional[Executor] = None
+    ) -> str:
+        """
+        在执行器中获取直播间签名，默认使用事件循环的线程池
+
+        Args:
+            room_id: (str) 直播间 ID
+            user_unique_id: (str) 用户唯一 ID
+            executor: (Executor) 线程池
+
+        Returns:
+            signature: (str) 签名
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, self.get_signature, room_id, user_unique_id
+        )
+
+    async def get_signatures_async(
+        self,
+        room_ids: List[str],
+        user_unique_id: str,
+        executor: Optional[Executor] = None,
+    ) -> List[str]:
+        """
+        在执行器中批量获取直播间签名，默认使用事件循环的线程池
+
+        Args:
+            room_ids: (List[str]) 直播间 ID 列表
+            user_unique_id: (str) 用户唯一 ID
+            executor: (Executor) 线程池
+
+        Returns:
+            signatures: (List[str]) 签名列表，顺序与 room_ids 一致
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, self.get_signatures, room_ids, user_unique_id
+        )
+
 
 if __name__ == "__main__":
     signature_handler = DouyinWebcastSignature(
@@ -1,6 +1,5 @@
 # path: f2/apps/douyin/crawler.py
 
-import json
 import gzip
 import asyncio
 import traceback
@@ -11,15 +10,26 @@ from websockets import (
     ConnectionClosedOK,
     WebSocketServerProtocol,
     WebSocketServer,
+    broadcast,
     serve,
 )
 from urllib.parse import urlencode
 
-from f2.log.logger import logger, trace_logger
-from f2.i18n.translator import _
-from f2.crawlers.base_crawler import BaseCrawler, WebSocketCrawler
+from f2.log.logger import logger, lazy_logger, trace_logger
+from f2.i18n.translator import _, N_
+from f2.crawlers.base_crawler import (
+    BaseCrawler,
+    WebSocketCrawler,
+    WSS_LOG_INTERVAL,
+    WSS_QUEUE_SIZE,
+    WSS_WORKERS,
+)
+from f2.crawlers.danmaku_archive import DanmakuArchive
+from f2.crawlers.danmaku_supervisor import DanmakuRelayServer
 from f2.utils.utils import BaseEndpointManager
+from f2.utils.json_backend import dumps
 from f2.apps.douyin.api import DouyinAPIEndpoints as dyendpoint
+from f2.apps.douyin.filter import PostCommentFilter
 from f2.apps.douyin.model import (
     UserProfile,
     UserPost,
@@ -49,7 +59,8 @@ from f2.apps.douyin.utils import (
     XBogusManager,
     ABogusManager,
     ClientConfManager,
-    TokenManager,
+    msToken_provider,
+    ttwid_pool,
 )
 from f2.apps.douyin.proto.douyin_webcast_pb2 import (
     PushFrame,
@@ -200,7 +211,9 @@ class DouyinCrawler(BaseCrawler):
             params.model_dump(),
         )
         logger.debug(_("作品评论接口地址：{0}").format(endpoint))
-        return await self._fetch_get_json(endpoint)
+        return await self._fetch_get_json(
+            endpoint, fields=PostCommentFilter._json_fields
+        )
 
     async def fetch_post_comment_reply(self, params: PostCommentReply):
         endpoint = self.bogus_manager.model_2_endpoint(
@@ -209,7 +222,9 @@ class DouyinCrawler(BaseCrawler):
             params.model_dump(),
         )
         logger.debug(_("作品评论回复接口地址：{0}").format(endpoint))
-        return await self._fetch_get_json(endpoint)
+        return await self._fetch_get_json(
+            endpoint, fields=PostCommentFilter._json_fields
+        )
 
     async def fetch_post_feed(self, params: PostDetail):
         endpoint = self.bogus_manager.model_2_endpoint(
@@ -257,10 +272,12 @@ class DouyinCrawler(BaseCrawler):
         return await self._fetch_get_json(endpoint)
 
     async def fetch_live_room_id(self, params: UserLive2):
-        original_headers = self.aclient.headers.copy()
+        # 共享客户端不能修改其默认请求头，只替换当前实例的请求头
+        # (The pooled client is shared, so only this crawler's headers are swapped)
+        original_headers = self.crawler_headers
         try:
             # 避免invalid session
-            self.aclient.headers.update({"Cookie": ""})
+            self.crawler_headers = original_headers | {"Cookie": ""}
             endpoint = self.bogus_manager.model_2_endpoint(
                 self.headers.get("User-Agent"),
                 dyendpoint.LIVE_INFO_ROOM_ID,
@@ -269,7 +286,7 @@ class DouyinCrawler(BaseCrawler):
             logger.debug(_("直播接口地址（room_id）：{0}").format(endpoint))
             return await self._fetch_get_json(endpoint)
         finally:
-            self.aclient.headers = original_headers
+            self.crawler_headers = original_headers
 
     async def fetch_following_live(self, params: FollowingUserLive):
         endpoint = self.bogus_manager.model_2_endpoint(
@@ -353,7 +370,16 @@ class DouyinCrawler(BaseCrawler):
         logger.debug(_("作品统计接口地址：{0}").format(endpoint))
         return await self._fetch_post_json(endpoint, data=params.model_dump())
 
+    def handle_http_status_error(self, http_error, url: str, attempt: int):
+        # 鉴权失败时淘汰当前 msToken，后续请求改用令牌池中的下一个
+        # (Retire the msToken on auth failures so later requests use the next pooled one)
+        if getattr(http_error.response, "status_code", None) in (401, 403):
+            msToken_provider.report_failure()
+        super().handle_http_status_error(http_error, url, attempt)
+
     async def __aenter__(self):
+        # 在执行器中预先准备 msToken，构建请求模型时直接读取 (Warm msToken before models are built)
+        await msToken_provider.get()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -364,15 +390,27 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
     # 是否显示直播间消息
     show_message = False
 
-    def __init__(self, kwargs: dict = None, callbacks: dict = None):
+    def __init__(
+        self,
+        kwargs: dict = None,
+        callbacks: dict = None,
+        relay: DanmakuRelayServer = None,
+        channel: str = None,
+        archive: DanmakuArchive = None,
+    ):
         self.__class__.show_message = bool(kwargs.get("show_message", True))
         # 需要与cli同步
-        self.headers = kwargs.get("headers", {}) | {
-            "Cookie": f"ttwid={TokenManager.gen_ttwid()};"
-        }
+        # ttwid 在连接前从令牌池异步获取 (ttwid is taken from the pool before connecting)
+        self.headers = dict(kwargs.get("headers", {}))
         self.callbacks = callbacks or {}
         self.timeout = kwargs.get("timeout", 10)
         self.connected_clients = set()  # 管理连接的客户端
+        # 多直播间模式下共用的转发服务器与频道 (Shared relay and channel in multi-room mode)
+        self.relay = relay
+        self.channel = channel
+        # 弹幕归档，为 None 时不保存 (Danmaku archive, nothing is saved when None)
+        self.archive = archive
+        self.room_id = channel or ""
         super().__init__(
             wss_headers=self.headers,
             callbacks=self.callbacks,
@@ -380,6 +418,9 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
             proxy=kwargs.get("proxies", {"http://": None, "https://": None}).get(
                 "http://"
             ),
+            queue_size=kwargs.get("queue_size", WSS_QUEUE_SIZE),
+            workers=kwargs.get("workers", WSS_WORKERS),
+            overflow=kwargs.get("overflow", "drop_oldest"),
         )
 
     @classmethod
@@ -396,8 +437,14 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
         logger.debug(
             _("[FetchLiveDanmaku] [🔗 直播弹幕接口地址] | [地址：{0}]").format(endpoint)
         )
+        self.room_id = str(params.room_id)
+        self.headers["Cookie"] = f"ttwid={await ttwid_pool.get()};"
         await self.connect_websocket(endpoint)
 
+        # 由 DanmakuSupervisor 统一提供转发服务器 (The supervisor owns the relay server)
+        if self.relay is not None:
+            return await self.receive_messages()
+
         server_task = asyncio.create_task(self.start_server())
         try:
             return await self.receive_messages()
@@ -416,10 +463,13 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
             message (bytes): WebSocket 消息的字节数据
         """
         try:
+            if self.archive is not None:
+                self.archive.append_frame(self.room_id, message)
+
             wss_package = PushFrame()
             wss_package.ParseFromString(message)
 
-            logger.debug(_("[WssPackage] [📦Wss包] | [{0}]").format(wss_package))
+            lazy_logger.debug(N_("[WssPackage] [📦Wss包] | [{0}]"), wss_package)
 
             log_id = wss_package.logId
             decompressed = gzip.decompress(wss_package.payload)
@@ -427,8 +477,11 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
             payload_package = Response()
             payload_package.ParseFromString(decompressed)
 
-            logger.debug(
-                _("[PayloadPackage] [📦Payload包] | [{0}]").format(payload_package)
+            self.stats.messages += len(payload_package.messages)
+            self.record_resume(payload_package.cursor, payload_package.internal_ext)
+
+            lazy_logger.debug(
+                N_("[PayloadPackage] [📦Payload包] | [{0}]"), payload_package
             )
 
             # 发送 ack 包
@@ -437,6 +490,7 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
             # 并发处理每个消息
             tasks = []
+            methods = []
             for msg in payload_package.messages:
                 method = msg.method
                 payload = msg.payload
@@ -445,11 +499,13 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
                 if method in self.callbacks:
                     # 创建异步任务
                     tasks.append(self.callbacks[method](data=payload))
+                    methods.append(method)
                 else:
-                    logger.warning(
-                        _(
-                            "[HandleWssMessage] [❌未找到对应的回调函数] | [方法：{0}]"
-                        ).format(method)
+                    lazy_logger.warning(
+                        N_("[HandleWssMessage] [❌未找到对应的回调函数] | [方法：{0}]"),
+                        method,
+                        key=method,
+                        interval=WSS_LOG_INTERVAL,
                     )
 
             # 并发运行所有回调
@@ -462,10 +518,12 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
                         logger.error(
                             _(
                                 "[HandleWssMessage] [⚠️ 回调执行出错] | [方法：{0}] | [错误：{1}]"
-                            ).format(payload_package.messages[i].method, result)
+                            ).format(methods[i], result)
                         )
                     else:
                         if result is not None:
+                            if self.archive is not None:
+                                self.archive.append(self.room_id, methods[i], result)
                             # 转发处理后的数据
                             await self.broadcast_message(result)
 
@@ -496,7 +554,7 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
         ack.logId = log_id
         ack.payloadType = internal_ext
         data = ack.SerializeToString()
-        logger.debug(_("[SendAck] [💓 发送 ack 包] | [日志ID：{0}]").format(log_id))
+        lazy_logger.debug(N_("[SendAck] [💓 发送 ack 包] | [日志ID：{0}]"), log_id)
         await self.websocket.send(data)
 
     async def send_ping(self) -> None:
@@ -604,18 +662,27 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
             message: 要转发的消息（字符串格式）
         """
 
+        if self.relay is not None:
+            self.relay.publish(self.channel, message)
+            return
+
+        # 没有客户端连接时无需序列化 (Nothing to serialize when no client is connected)
+        if not self.connected_clients:
+            return
+
         if not isinstance(message, str):
             try:
-                message = json.dumps(message, ensure_ascii=False)
-            except (json.JSONDecodeError, TypeError) as exc:
+                message = dumps(message)
+            except (ValueError, TypeError) as exc:
                 trace_logger.error(traceback.format_exc())
                 logger.error(
                     _("[BroadcastMessage] [❌ 消息格式错误] | [错误：{0}]").format(exc)
                 )
                 return
 
-        tasks = [client.send(message) for client in self.connected_clients]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # 每条消息只编码一次，同一帧写入所有客户端，跳过写缓冲已满的慢客户端
+        # (Encode once and write the same frame to every client, skipping slow ones)
+        broadcast(self.connected_clients, message)
 
     # 定义所有的回调消息函数
     @classmethod
@@ -632,12 +699,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         roomMessage = RoomMessage()
         roomMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            roomMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -661,12 +724,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         likeMessage = LikeMessage()
         likeMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                likeMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            likeMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -694,12 +753,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         memberMessage = MemberMessage()
         memberMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                memberMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            memberMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -726,12 +781,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         chatMessage = ChatMessage()
         chatMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                chatMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            chatMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -755,12 +806,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         giftMessage = GiftMessage()
         giftMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                giftMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            giftMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -784,12 +831,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         socialMessage = SocialMessage()
         socialMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                socialMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            socialMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -813,12 +856,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         roomUserSeqMessage = RoomUserSeqMessage()
         roomUserSeqMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomUserSeqMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            roomUserSeqMessage, preserving_proto_field_name=True
         )
         ranks = data_json.get("ranksList", [])
         top_users = ", ".join(
@@ -846,12 +885,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         updateFanTicketMessage = UpdateFanTicketMessage()
         updateFanTicketMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                updateFanTicketMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            updateFanTicketMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -875,12 +910,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         commonTextMessage = CommonTextMessage()
         commonTextMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                commonTextMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            commonTextMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -902,12 +933,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         matchAgainstScoreMessage = MatchAgainstScoreMessage()
         matchAgainstScoreMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                matchAgainstScoreMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            matchAgainstScoreMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -931,12 +958,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         fansClubMessage = EcomFansClubMessage()
         fansClubMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                fansClubMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            fansClubMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -960,12 +983,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         statsMessage = RoomStatsMessage()
         statsMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                statsMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            statsMessage, preserving_proto_field_name=True
         )
 
         # 提取关键信息
@@ -995,12 +1014,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         liveShoppingMessage = LiveShoppingMessage()
         liveShoppingMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                liveShoppingMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            liveShoppingMessage, preserving_proto_field_name=True
         )
 
         msg_type = data_json.get("msg_type", "N/A")
@@ -1027,12 +1042,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         liveEcomGeneralMessage = LiveEcomGeneralMessage()
         liveEcomGeneralMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                liveEcomGeneralMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            liveEcomGeneralMessage, preserving_proto_field_name=True
         )
         # # data字段由Base64编码了
         # content_type = data_json.get("content_type", "N/A")
@@ -1059,10 +1070,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         roomStreamAdaptationMessage = RoomStreamAdaptationMessage()
         roomStreamAdaptationMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomStreamAdaptationMessage, preserving_proto_field_name=True
-            )
+        data_json = json_format.MessageToDict(
+            roomStreamAdaptationMessage, preserving_proto_field_name=True
         )
 
         # adaptation_type = data_json.get("adaptation_type", "N/A")
@@ -1089,12 +1098,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         ranklistHourEntranceMessage = RanklistHourEntranceMessage()
         ranklistHourEntranceMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                ranklistHourEntranceMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            ranklistHourEntranceMessage, preserving_proto_field_name=True
         )
 
         # 提取关键信息
@@ -1131,12 +1136,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         productChangeMessage = ProductChangeMessage()
         productChangeMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                productChangeMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            productChangeMessage, preserving_proto_field_name=True
         )
         cls._log(
             _("[WebcastProductChangeMessage] [🔄商品变更消息] | [内容：{0}]").format(
@@ -1159,12 +1160,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         notifyEffectMessage = NotifyEffectMessage()
         notifyEffectMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                notifyEffectMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            notifyEffectMessage, preserving_proto_field_name=True
         )
         cls._log(
             _("[WebcastNotifyEffectMessage] [📢通知效果消息] | [内容：{0}]").format(
@@ -1187,12 +1184,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         lightGiftMessage = LightGiftMessage()
         lightGiftMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                lightGiftMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            lightGiftMessage, preserving_proto_field_name=True
         )
 
         gift_id = data_json.get("gift_info", {}).get("gift_id", "N/A")
@@ -1221,12 +1214,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         profitInteractionScoreMessage = ProfitInteractionScoreMessage()
         profitInteractionScoreMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                profitInteractionScoreMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            profitInteractionScoreMessage, preserving_proto_field_name=True
         )
 
         interaction_score_status = data_json.get("interaction_score_status", "N/A")
@@ -1254,12 +1243,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         roomRankMessage = RoomRankMessage()
         roomRankMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomRankMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            roomRankMessage, preserving_proto_field_name=True
         )
 
         # 获取前三名用户的 ID
@@ -1288,12 +1273,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         fansclubMessage = FansclubMessage()
         fansclubMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                fansclubMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            fansclubMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -1317,12 +1298,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         hotRoomMessage = HotRoomMessage()
         hotRoomMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                hotRoomMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            hotRoomMessage, preserving_proto_field_name=True
         )
         cls._log(
             _("[WebcastHotRoomMessage] [🔥热门房间消息] | [内容：{0}]").format(
@@ -1345,12 +1322,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         inRoomBannerMessage = InRoomBannerMessage()
         inRoomBannerMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                inRoomBannerMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            inRoomBannerMessage, preserving_proto_field_name=True
         )
         # cls._log(
         #     _("[WebcastInRoomBannerMessage] [🚩房间内横幅消息] | [内容：{0}]").format(
@@ -1373,12 +1346,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         screenChatMessage = ScreenChatMessage()
         screenChatMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                screenChatMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            screenChatMessage, preserving_proto_field_name=True
         )
         cls._log(
             _("[WebcastScreenChatMessage] [📺管理员全局聊天消息] | [内容：{0}]").format(
@@ -1401,12 +1370,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         roomDataSyncMessage = RoomDataSyncMessage()
         roomDataSyncMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomDataSyncMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            roomDataSyncMessage, preserving_proto_field_name=True
         )
 
         # sync_key = data_json.get("syncKey", "N/A")
@@ -1433,12 +1398,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         linkerContributeMessage = LinkerContributeMessage()
         linkerContributeMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkerContributeMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkerContributeMessage, preserving_proto_field_name=True
         )
 
         user_id = data_json.get("user_id", "N/A")
@@ -1466,12 +1427,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         emojiChatMessage = EmojiChatMessage()
         emojiChatMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                emojiChatMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            emojiChatMessage, preserving_proto_field_name=True
         )
         cls._log(
             _("[WebcastEmojiChatMessage] [😊表情聊天消息] | [内容：{0}]").format(
@@ -1494,12 +1451,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         linkMicMethod = LinkMicMethod()
         linkMicMethod.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkMicMethod,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkMicMethod, preserving_proto_field_name=True
         )
 
         message_type = data_json.get("message_type", "N/A")
@@ -1526,12 +1479,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         linkMessage = LinkMessage()
         linkMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkMessage, preserving_proto_field_name=True
         )
 
         message_type = data_json.get("message_type", "N/A")
@@ -1558,12 +1507,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         battleTeamTaskMessage = BattleTeamTaskMessage()
         battleTeamTaskMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                battleTeamTaskMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            battleTeamTaskMessage, preserving_proto_field_name=True
         )
         # 提取关键信息
         battle_id = data_json.get("team_task", {}).get("battle_id", "N/A")
@@ -1591,12 +1536,8 @@ class DouyinWebSocketCrawler(WebSocketCrawler):
 
         hotChatMessage = HotChatMessage()
         hotChatMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                hotChatMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            hotChatMessage, preserving_proto_field_name=True
         )
         cls._log(
             _("[WebcastHotChatMessage] [🔥热聊消息] | [内容：{0}]").format(data_json)
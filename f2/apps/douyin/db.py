@@ -96,6 +96,25 @@ class AsyncUserDB(BaseDB):
             )
             await self.commit()
 
+    async def update_last_aweme_ids(self, last_aweme_ids: dict) -> None:
+        """
+        批量更新多个用户的 last_aweme_id，在一个事务中使用 executemany 写入
+
+        Args:
+            last_aweme_ids (dict): sec_user_id 到 last_aweme_id 的映射
+        """
+        if not last_aweme_ids:
+            return
+
+        async with self.transaction():
+            await self.executemany(
+                f"UPDATE {self.TABLE_NAME} SET last_aweme_id = ? WHERE sec_user_id=?",
+                [
+                    (aweme_id, sec_user_id)
+                    for sec_user_id, aweme_id in last_aweme_ids.items()
+                ],
+            )
+
     async def get_user_info(self, sec_user_id: str) -> dict:
         """
         获取用户信息
@@ -255,35 +274,26 @@ class AsyncVideoDB(BaseDB):
         await self.commit()
 
     async def batch_insert_videos(
-        self, video_data_list: list, ignore_fields=None
-    ) -> None:
+        self, video_data_list: list, ignore_fields=None, update: bool = True
+    ) -> int:
         """
-        批量添加视频信息
+        批量添加视频信息，整批使用一条语句写入
 
         Args:
             video_data_list (list): 视频信息列表
             ignore_fields (list): 要忽略的字段列表，例如 ["field1", "field2"]
-        """
-        # 如果 ignore_fields 未提供或者为 None，将其设置为空列表
-        ignore_fields = ignore_fields or []
+            update (bool): 已存在的视频是否更新，为 False 时只添加新视频
 
-        # 删除要忽略的字段
-        for field in ignore_fields:
-            for video_data in video_data_list:
-                if field in video_data:
-                    del video_data[field]
-
-        keys = ", ".join(video_data_list[0].keys())
-        placeholders = ", ".join(["?" for _ in range(len(video_data_list[0]))])
-
-        # 构建插入数据的元组列表
-        values = [tuple(video_data.values()) for video_data in video_data_list]
-
-        await self.execute(
-            f"INSERT OR REPLACE INTO {self.TABLE_NAME} ({keys}) VALUES ({placeholders})",
-            values,
+        Returns:
+            int: 写入的行数
+        """
+        return await self.bulk_insert(
+            self.TABLE_NAME,
+            video_data_list,
+            conflict_keys=("aweme_id",),
+            ignore_fields=ignore_fields,
+            update=update,
         )
-        await self.commit()
 
     async def get_video_info(self, aweme_id: str) -> dict:
         """
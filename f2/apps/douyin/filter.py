@@ -125,9 +125,7 @@ class UserProfileFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -342,9 +340,7 @@ class UserPostFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -500,9 +496,7 @@ class UserCollectsFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -625,9 +619,7 @@ class UserMusicCollectionFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -850,9 +842,7 @@ class UserFollowingFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -1426,13 +1416,15 @@ class PostDetailFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
 class PostCommentFilter(JSONModel):
+    # 评论接口只解码用到的字段，跳过 extra、log_pb 等其余顶层字段
+    # (Decode only the fields used here, skipping extra, log_pb and the rest)
+    _json_fields = ("status_code", "has_more", "total", "cursor", "comments")
+
     @property
     def api_status_code(self):
         return self._get_attr_value("$.status_code")
@@ -1539,9 +1531,7 @@ class PostCommentFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -1689,9 +1679,7 @@ class UserLiveFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -1807,9 +1795,7 @@ class UserLive2Filter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -1852,9 +1838,7 @@ class UserLiveStatusFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -2124,9 +2108,7 @@ class FriendFeedFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -2191,9 +2173,7 @@ class LiveImFetchFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -2243,9 +2223,7 @@ class QueryUserFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -2369,9 +2347,7 @@ class FollowingUserLiveFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -2618,9 +2594,7 @@ class HomePostSearchFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -2670,9 +2644,7 @@ class SuggestWordFilter(JSONModel):
 
     def _to_dict(self) -> Dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
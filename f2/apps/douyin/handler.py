@@ -15,6 +15,12 @@ from f2.apps.bark.utils import ClientConfManager as BarkClientConfManager
 from f2.apps.douyin.db import AsyncUserDB, AsyncVideoDB
 from f2.apps.douyin.crawler import DouyinCrawler, DouyinWebSocketCrawler
 from f2.apps.douyin.dl import DouyinDownloader
+from f2.crawlers.danmaku_archive import DanmakuArchive
+from f2.crawlers.danmaku_supervisor import (
+    DanmakuRelayServer,
+    DanmakuRoom,
+    DanmakuSupervisor,
+)
 from f2.apps.douyin.model import (
     UserPost,
     UserProfile,
@@ -92,6 +98,7 @@ DY_LIVE_STATUS_MAPPING = {
     # 3: _("直播中"),
     4: _("已关播"),
 }
+DY_LIVE_STATUS_ENDED = 4
 
 
 class DouyinHandler:
@@ -225,14 +232,9 @@ class DouyinHandler:
             ignore_fields (list): 剔除的字段
         """
 
-        # 尝试从数据库中获取作品数据
-        local_video_data = await db.get_video_info(aweme_data.get("aweme_id"))
-
-        # 如果作品不在数据库中，将其添加到数据库
-        if not local_video_data:
-            # 从服务器获取当前作品最新数据
-            # current_video_data = await fetch_one_video(aweme_data.get("aweme_id"))
-            await db.add_video_info(ignore_fields=ignore_fields, **aweme_data)
+        # 作品不在数据库中时添加，已存在则保持不变，只需一条语句
+        # (Insert the video only if it is missing, in a single statement)
+        await db.batch_insert_videos([aweme_data], ignore_fields, update=False)
 
     @mode_handler("one")
     async def handle_one_video(self):
@@ -357,14 +359,16 @@ class DouyinHandler:
         async for aweme_data_list in self.fetch_user_post_videos(
             sec_user_id, min_cursor, max_cursor, page_counts, max_counts
         ):
+            aweme_list = aweme_data_list._to_list()
+
             # 创建下载任务
             await self.downloader.create_download_tasks(
-                self.kwargs, aweme_data_list._to_list(), user_path
+                self.kwargs, aweme_list, user_path
             )
 
-            # # 一次性批量插入作品数据到数据库
-            # async with AsyncVideoDB("douyin_videos.db") as db:
-            #     await db.batch_insert_videos(aweme_data_list._to_list(), ignore_fields)
+            # 一次性批量插入作品数据到数据库
+            async with AsyncVideoDB("douyin_videos.db") as db:
+                await db.batch_insert_videos(aweme_list, self.ignore_fields)
 
     async def fetch_user_post_videos(
         self,
@@ -484,18 +488,16 @@ class DouyinHandler:
         async for aweme_data_list in self.fetch_user_like_videos(
             sec_user_id, max_cursor, page_counts, max_counts
         ):
+            aweme_list = aweme_data_list._to_list()
+
             # 创建下载任务
             await self.downloader.create_download_tasks(
-                self.kwargs, aweme_data_list._to_list(), user_path
+                self.kwargs, aweme_list, user_path
             )
 
-            # async with AsyncVideoDB("douyin_videos.db") as db:
-            #     for aweme_data in aweme_data_list:
-            #         await get_or_add_video_data(aweme_data, db, ignore_fields)
-
-            # # 一次性批量插入作品数据到数据库
-            # async with AsyncVideoDB("douyin_videos.db") as db:
-            #     await db.batch_insert_videos(aweme_data_list, ignore_fields)
+            # 一次性批量插入作品数据到数据库
+            async with AsyncVideoDB("douyin_videos.db") as db:
+                await db.batch_insert_videos(aweme_list, self.ignore_fields)
 
     async def fetch_user_like_videos(
         self,
@@ -2010,6 +2012,61 @@ class DouyinHandler:
 
         return live_im
 
+    @staticmethod
+    def default_wss_callbacks() -> Dict[str, Any]:
+        """
+        默认的弹幕回调函数，包含所有已实现的消息类型
+
+        Return:
+            callbacks: Dict[str, Any]: 消息类型与回调函数的映射
+        """
+
+        return {
+            "WebcastRoomMessage": DouyinWebSocketCrawler.WebcastRoomMessage,
+            "WebcastLikeMessage": DouyinWebSocketCrawler.WebcastLikeMessage,
+            "WebcastMemberMessage": DouyinWebSocketCrawler.WebcastMemberMessage,
+            "WebcastChatMessage": DouyinWebSocketCrawler.WebcastChatMessage,
+            "WebcastGiftMessage": DouyinWebSocketCrawler.WebcastGiftMessage,
+            "WebcastSocialMessage": DouyinWebSocketCrawler.WebcastSocialMessage,
+            "WebcastRoomUserSeqMessage": DouyinWebSocketCrawler.WebcastRoomUserSeqMessage,
+            "WebcastUpdateFanTicketMessage": DouyinWebSocketCrawler.WebcastUpdateFanTicketMessage,
+            "WebcastCommonTextMessage": DouyinWebSocketCrawler.WebcastCommonTextMessage,
+            "WebcastMatchAgainstScoreMessage": DouyinWebSocketCrawler.WebcastMatchAgainstScoreMessage,
+            "WebcastEcomFansClubMessage": DouyinWebSocketCrawler.WebcastEcomFansClubMessage,
+            "WebcastRanklistHourEntranceMessage": DouyinWebSocketCrawler.WebcastRanklistHourEntranceMessage,
+            "WebcastRoomStatsMessage": DouyinWebSocketCrawler.WebcastRoomStatsMessage,
+            "WebcastLiveShoppingMessage": DouyinWebSocketCrawler.WebcastLiveShoppingMessage,
+            "WebcastLiveEcomGeneralMessage": DouyinWebSocketCrawler.WebcastLiveEcomGeneralMessage,
+            "WebcastProductChangeMessage": DouyinWebSocketCrawler.WebcastProductChangeMessage,
+            "WebcastRoomStreamAdaptationMessage": DouyinWebSocketCrawler.WebcastRoomStreamAdaptationMessage,
+            "WebcastNotifyEffectMessage": DouyinWebSocketCrawler.WebcastNotifyEffectMessage,
+            "WebcastLightGiftMessage": DouyinWebSocketCrawler.WebcastLightGiftMessage,
+            "WebcastProfitInteractionScoreMessage": DouyinWebSocketCrawler.WebcastProfitInteractionScoreMessage,
+            "WebcastRoomRankMessage": DouyinWebSocketCrawler.WebcastRoomRankMessage,
+            "WebcastFansclubMessage": DouyinWebSocketCrawler.WebcastFansclubMessage,
+            "WebcastHotRoomMessage": DouyinWebSocketCrawler.WebcastHotRoomMessage,
+            "WebcastLinkMicMethod": DouyinWebSocketCrawler.WebcastLinkMicMethod,
+            "WebcastLinkerContributeMessage": DouyinWebSocketCrawler.WebcastLinkerContributeMessage,
+            "WebcastEmojiChatMessage": DouyinWebSocketCrawler.WebcastEmojiChatMessage,
+            "WebcastScreenChatMessage": DouyinWebSocketCrawler.WebcastScreenChatMessage,
+            "WebcastRoomDataSyncMessage": DouyinWebSocketCrawler.WebcastRoomDataSyncMessage,
+            "WebcastInRoomBannerMessage": DouyinWebSocketCrawler.WebcastInRoomBannerMessage,
+            "WebcastLinkMessage": DouyinWebSocketCrawler.WebcastLinkMessage,
+            "WebcastBattleTeamTaskMessage": DouyinWebSocketCrawler.WebcastBattleTeamTaskMessage,
+            "WebcastHotChatMessage": DouyinWebSocketCrawler.WebcastHotChatMessage,
+            # TODO: 以下消息类型暂未实现
+            # WebcastLinkMicArmiesMethod
+            # WebcastLinkmicPlayModeUpdateScoreMessage
+            # WebcastSandwichBorderMessage
+            # WebcastLuckyBoxTempStatusMessage
+            # WebcastLotteryEventMessage
+            # WebcastLotteryEventNewMessage
+            # WebcastDecorationUpdateMessage
+            # WebcastDecorationModifyMethod
+            # WebcastLinkSettingNotifyMessage
+            # WebcastLinkMicBattleMethod
+        }
+
     async def fetch_live_danmaku(
         self,
         room_id: str,
@@ -2017,6 +2074,7 @@ class DouyinHandler:
         internal_ext: str,
         cursor: str,
         wss_callbacks: dict = None,
+        archive: DanmakuArchive = None,
     ):
         """
         通过WebSocket连接获取直播间弹幕，再通过回调函数处理弹幕数据。
@@ -2026,6 +2084,7 @@ class DouyinHandler:
             user_unique_id: str: 用户ID
             internal_ext: str: 内部扩展参数
             cursor: str: 弹幕cursor
+            archive: DanmakuArchive: 弹幕归档，默认不保存
 
         Return:
             self.websocket: DouyinWebSocketCrawler: WebSocket连接对象
@@ -2033,56 +2092,14 @@ class DouyinHandler:
 
         if not wss_callbacks:
             logger.warning(_("没有设置回调函数，默认使用所有回调函数"))
-            wss_callbacks = {
-                "WebcastRoomMessage": DouyinWebSocketCrawler.WebcastRoomMessage,
-                "WebcastLikeMessage": DouyinWebSocketCrawler.WebcastLikeMessage,
-                "WebcastMemberMessage": DouyinWebSocketCrawler.WebcastMemberMessage,
-                "WebcastChatMessage": DouyinWebSocketCrawler.WebcastChatMessage,
-                "WebcastGiftMessage": DouyinWebSocketCrawler.WebcastGiftMessage,
-                "WebcastSocialMessage": DouyinWebSocketCrawler.WebcastSocialMessage,
-                "WebcastRoomUserSeqMessage": DouyinWebSocketCrawler.WebcastRoomUserSeqMessage,
-                "WebcastUpdateFanTicketMessage": DouyinWebSocketCrawler.WebcastUpdateFanTicketMessage,
-                "WebcastCommonTextMessage": DouyinWebSocketCrawler.WebcastCommonTextMessage,
-                "WebcastMatchAgainstScoreMessage": DouyinWebSocketCrawler.WebcastMatchAgainstScoreMessage,
-                "WebcastEcomFansClubMessage": DouyinWebSocketCrawler.WebcastEcomFansClubMessage,
-                "WebcastRanklistHourEntranceMessage": DouyinWebSocketCrawler.WebcastRanklistHourEntranceMessage,
-                "WebcastRoomStatsMessage": DouyinWebSocketCrawler.WebcastRoomStatsMessage,
-                "WebcastLiveShoppingMessage": DouyinWebSocketCrawler.WebcastLiveShoppingMessage,
-                "WebcastLiveEcomGeneralMessage": DouyinWebSocketCrawler.WebcastLiveEcomGeneralMessage,
-                "WebcastProductChangeMessage": DouyinWebSocketCrawler.WebcastProductChangeMessage,
-                "WebcastRoomStreamAdaptationMessage": DouyinWebSocketCrawler.WebcastRoomStreamAdaptationMessage,
-                "WebcastNotifyEffectMessage": DouyinWebSocketCrawler.WebcastNotifyEffectMessage,
-                "WebcastLightGiftMessage": DouyinWebSocketCrawler.WebcastLightGiftMessage,
-                "WebcastProfitInteractionScoreMessage": DouyinWebSocketCrawler.WebcastProfitInteractionScoreMessage,
-                "WebcastRoomRankMessage": DouyinWebSocketCrawler.WebcastRoomRankMessage,
-                "WebcastFansclubMessage": DouyinWebSocketCrawler.WebcastFansclubMessage,
-                "WebcastHotRoomMessage": DouyinWebSocketCrawler.WebcastHotRoomMessage,
-                "WebcastLinkMicMethod": DouyinWebSocketCrawler.WebcastLinkMicMethod,
-                "WebcastLinkerContributeMessage": DouyinWebSocketCrawler.WebcastLinkerContributeMessage,
-                "WebcastEmojiChatMessage": DouyinWebSocketCrawler.WebcastEmojiChatMessage,
-                "WebcastScreenChatMessage": DouyinWebSocketCrawler.WebcastScreenChatMessage,
-                "WebcastRoomDataSyncMessage": DouyinWebSocketCrawler.WebcastRoomDataSyncMessage,
-                "WebcastInRoomBannerMessage": DouyinWebSocketCrawler.WebcastInRoomBannerMessage,
-                "WebcastLinkMessage": DouyinWebSocketCrawler.WebcastLinkMessage,
-                "WebcastBattleTeamTaskMessage": DouyinWebSocketCrawler.WebcastBattleTeamTaskMessage,
-                "WebcastHotChatMessage": DouyinWebSocketCrawler.WebcastHotChatMessage,
-                # TODO: 以下消息类型暂未实现
-                # WebcastLinkMicArmiesMethod
-                # WebcastLinkmicPlayModeUpdateScoreMessage
-                # WebcastSandwichBorderMessage
-                # WebcastLuckyBoxTempStatusMessage
-                # WebcastLotteryEventMessage
-                # WebcastLotteryEventNewMessage
-                # WebcastDecorationUpdateMessage
-                # WebcastDecorationModifyMethod
-                # WebcastLinkSettingNotifyMessage
-                # WebcastLinkMicBattleMethod
-            }
+            wss_callbacks = self.default_wss_callbacks()
 
-        async with DouyinWebSocketCrawler(self.kwargs, callbacks=wss_callbacks) as wss:
-            signature = DouyinWebcastSignature(
+        async with DouyinWebSocketCrawler(
+            self.kwargs, callbacks=wss_callbacks, archive=archive
+        ) as wss:
+            signature = await DouyinWebcastSignature(
                 ClientConfManager.user_agent()
-            ).get_signature(room_id, user_unique_id)
+            ).get_signature_async(room_id, user_unique_id)
 
             params = LiveWebcast(
                 room_id=room_id,
@@ -2101,6 +2118,88 @@ class DouyinHandler:
 
             return
 
+    async def fetch_live_danmaku_rooms(
+        self,
+        rooms: List[Dict[str, str]],
+        wss_callbacks: dict = None,
+        archive: DanmakuArchive = None,
+    ) -> Dict[str, dict]:
+        """
+        在同一进程中同时获取多个直播间的弹幕，所有直播间共用一个本地转发服务器，
+        客户端连接 ws://host:port/<room_id> 接收对应直播间的消息，连接 ws://host:port/ 接收全部消息。
+        断开后自动重连并从最近的 cursor 与 internal_ext 续传。
+
+        Args:
+            rooms: List[Dict[str, str]]: 直播间列表，每项包含 room_id、user_unique_id、internal_ext、cursor
+            wss_callbacks: dict: 回调函数，默认使用所有回调函数
+            archive: DanmakuArchive: 弹幕归档，默认不保存
+
+        Return:
+            stats: Dict[str, dict]: 每个直播间的统计数据
+        """
+
+        if not wss_callbacks:
+            logger.warning(_("没有设置回调函数，默认使用所有回调函数"))
+            wss_callbacks = self.default_wss_callbacks()
+
+        signer = DouyinWebcastSignature(ClientConfManager.user_agent())
+
+        async def connect(room: DanmakuRoom, relay: DanmakuRelayServer) -> str:
+            user_unique_id = room.extra.get("user_unique_id", "")
+            async with DouyinWebSocketCrawler(
+                self.kwargs,
+                callbacks=wss_callbacks,
+                relay=relay,
+                channel=room.room_id,
+                archive=archive,
+            ) as wss:
+                room.attach(wss)
+                try:
+                    signature = await signer.get_signature_async(
+                        room.room_id, user_unique_id
+                    )
+                    params = LiveWebcast(
+                        room_id=room.room_id,
+                        user_unique_id=user_unique_id,
+                        internal_ext=room.internal_ext,
+                        cursor=room.cursor,
+                        signature=signature,
+                    )
+                    result = await wss.fetch_live_danmaku(params)
+                finally:
+                    room.detach(wss)
+
+            # 连接断开后确认是否已关播，避免对已结束的直播间无限重连
+            # (Check whether the stream is over before the supervisor reconnects)
+            if result != "ended" and await self._is_live_room_ended(room.room_id):
+                return "ended"
+            return result
+
+        wss_conf = ClientConfManager.wss()
+        supervisor = DanmakuSupervisor(
+            connect, wss_conf.get("domain"), wss_conf.get("port")
+        )
+        for room in rooms:
+            supervisor.add_room(**room)
+
+        logger.info(_("开始监控 {0} 个直播间的弹幕").format(len(supervisor.rooms)))
+        return await supervisor.run()
+
+    async def _is_live_room_ended(self, room_id: str) -> bool:
+        """
+        检查直播间是否已关播 (Check whether the live room has gone offline)
+
+        Args:
+            room_id: str: 直播间ID
+
+        Return:
+            ended: bool: 已关播时为 True，状态未知时为 False
+        """
+
+        async with DouyinCrawler(self.kwargs) as crawler:
+            response = await crawler.fetch_live_room_id(UserLive2(room_id=room_id))
+        return UserLive2Filter(response).live_status == DY_LIVE_STATUS_ENDED
+
     async def fetch_user_following_lives(self) -> FollowingUserLiveFilter:
         """
         用于获取关注用户的直播间信息。
@@ -1,10 +1,14 @@
 # path: f2/apps/douyin/models.py
 
 from typing import Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from urllib.parse import quote, unquote
 
-from f2.apps.douyin.utils import TokenManager, VerifyFpManager, ClientConfManager
+from f2.apps.douyin.utils import (
+    ClientConfManager,
+    msToken_provider,
+    verifyFp_provider,
+)
 
 
 # Base Model
@@ -35,10 +39,7 @@ class BaseRequestModel(BaseModel):
     downlink: int = 10
     effective_type: str = "4g"
     round_trip_time: int = 100
-    try:
-        msToken: str = TokenManager.gen_real_msToken()
-    except:
-        msToken: str = TokenManager.gen_real_msToken()
+    msToken: str = Field(default_factory=msToken_provider.current)
 
 
 class BaseLiveModel(BaseModel):
@@ -62,7 +63,7 @@ class BaseLiveModel(BaseModel):
 
 
 class BaseLiveModel2(BaseModel):
-    verifyFp: str = VerifyFpManager.gen_verify_fp()
+    verifyFp: str = Field(default_factory=verifyFp_provider.current)
     type_id: str = "0"
     live_id: str = "1"
     sec_user_id: str = ""
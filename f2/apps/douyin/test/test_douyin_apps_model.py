@@ -34,3 +34,12 @@ def test_abogus_manager():
     )
 
     assert final_endpoint, "Failed to get a final endpoint."
+
+
+def test_abogus_manager_caches_signer():
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
+
+    signer = ABogusManager.get_signer(user_agent)
+
+    assert ABogusManager.get_signer(user_agent) is signer
+    assert ABogusManager.get_signer(user_agent, "1|2|3") is not signer
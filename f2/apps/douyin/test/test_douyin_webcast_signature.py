@@ -11,3 +11,28 @@ def test_DouyinWebcastSignature():
     )
     assert signature is not None
     assert len(signature) == 16
+
+
+def test_DouyinWebcastSignature_reuses_context():
+    user_agent = ClientConfManager.user_agent()
+    ctx = DouyinWebcastSignature.get_context(user_agent)
+    assert DouyinWebcastSignature.get_context(user_agent) is ctx
+
+
+def test_DouyinWebcastSignature_batch():
+    room_ids = [str(7383573503129258802 + i) for i in range(5)]
+    user_unique_id = "7383588170770138661"
+    signatures = DouyinWebcastSignature(ClientConfManager.user_agent()).get_signatures(
+        room_ids, user_unique_id
+    )
+    assert len(signatures) == len(room_ids)
+    assert all(len(signature) == 16 for signature in signatures)
+    assert DouyinWebcastSignature().get_signatures([], user_unique_id) == []
+
+
+@pytest.mark.asyncio
+async def test_DouyinWebcastSignature_async():
+    signature = await DouyinWebcastSignature(
+        ClientConfManager.user_agent()
+    ).get_signature_async("7383573503129258802", "7383588170770138661")
+    assert len(signature) == 16
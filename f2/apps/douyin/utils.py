@@ -7,9 +7,10 @@ import time
 import httpx
 import random
 import asyncio
+import threading
 import traceback
 
-from typing import Union
+from typing import Dict, Tuple, Union
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -19,6 +20,9 @@ from f2.log.logger import logger, trace_logger
 from f2.utils.xbogus import XBogus as XB
 from f2.utils.abogus import ABogus as AB, BrowserFingerprintGenerator as BrowserFpGen
 from f2.utils.conf_manager import ConfigManager
+from f2.utils._sign import BatchSignMixin
+from f2.utils.token_pool import TokenPool
+from f2.utils.token_provider import AsyncTokenProvider
 from f2.utils.utils import (
     gen_random_str,
     get_timestamp,
@@ -547,7 +551,22 @@ class VerifyFpManager:
         return cls.gen_verify_fp()
 
 
-class XBogusManager:
+# 后台预生成并轮询分发的令牌池 (Token pools filled in the background and handed out round-robin)
+msToken_pool = TokenPool("douyin_msToken", TokenManager.gen_real_msToken)
+ttwid_pool = TokenPool("douyin_ttwid", TokenManager.gen_ttwid, ttl=86400)
+
+# 惰性获取并按有效期轮换的请求令牌 (Request tokens fetched lazily and rotated by TTL)
+msToken_provider = AsyncTokenProvider(
+    "msToken",
+    msToken_pool.get,
+    ttl=300,
+    fallback=TokenManager.gen_false_msToken,
+    on_failure=msToken_pool.report_failure,
+)
+verifyFp_provider = AsyncTokenProvider("verifyFp", VerifyFpManager.gen_verify_fp)
+
+
+class XBogusManager(BatchSignMixin):
     @classmethod
     def str_2_endpoint(
         cls,
@@ -588,7 +607,75 @@ class XBogusManager:
         return final_endpoint
 
 
-class ABogusManager:
+class ABogusManager(BatchSignMixin):
+    """
+    A-Bogus 签名管理器 (A-Bogus Signature Manager)
+
+    每个 User-Agent 在运行期间使用同一个浏览器指纹，并按 (UA, 指纹) 缓存 ABogus 签名器，
+    UA 加密数组、指纹数组等只与 UA 和指纹相关的部分只在创建签名器时计算一次。
+
+    类属性:
+    - _fingerprints (dict): User-Agent 到浏览器指纹的映射。
+    - _signers (dict): (User-Agent, 指纹) 到 ABogus 签名器的映射。
+    - _lock (threading.Lock): 用于保证线程安全的锁。
+
+    类方法:
+    - get_signer: 获取（或创建）缓存的签名器。
+    - get_fingerprint: 获取 UA 在本次运行中使用的浏览器指纹。
+    - str_2_endpoint: 为参数字符串生成 A-Bogus。
+    - model_2_endpoint: 为参数字典生成带 A-Bogus 的完整端点。
+    - sign_many / sign_many_async: 批量签名，见 BatchSignMixin。
+    """
+
+    _fingerprints: Dict[str, str] = {}
+    _signers: Dict[Tuple[str, str], AB] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_fingerprint(cls, user_agent: str) -> str:
+        """
+        获取 UA 在本次运行中使用的浏览器指纹 (Get the fingerprint used for the UA in this run)
+
+        Args:
+            user_agent (str): 用户代理 (User-Agent)
+
+        Returns:
+            str: 浏览器指纹 (Browser fingerprint)
+        """
+        with cls._lock:
+            browser_fp = cls._fingerprints.get(user_agent)
+            if browser_fp is None:
+                browser_fp = BrowserFpGen.generate_fingerprint("Edge")
+                cls._fingerprints[user_agent] = browser_fp
+            return browser_fp
+
+    @classmethod
+    def _sign_kwargs(cls, user_agent: str) -> dict:
+        # 子进程中使用与主进程相同的指纹 (Keep the fingerprint consistent in worker processes)
+        return {"browser_fp": cls.get_fingerprint(user_agent)}
+
+    @classmethod
+    def get_signer(cls, user_agent: str, browser_fp: str = "") -> AB:
+        """
+        获取缓存的签名器，未指定指纹时使用该 UA 的固定指纹
+        (Get a cached signer, using the fixed fingerprint of the UA if none is given)
+
+        Args:
+            user_agent (str): 用户代理 (User-Agent)
+            browser_fp (str): 浏览器指纹 (Browser fingerprint)
+
+        Returns:
+            ABogus: 签名器 (Signer)
+        """
+        browser_fp = browser_fp or cls.get_fingerprint(user_agent)
+        with cls._lock:
+            key = (user_agent, browser_fp)
+            signer = cls._signers.get(key)
+            if signer is None:
+                signer = AB(fp=browser_fp, user_agent=user_agent)
+                cls._signers[key] = signer
+            return signer
+
     @classmethod
     def str_2_endpoint(
         cls,
@@ -597,10 +684,7 @@ class ABogusManager:
         body: str = "",
     ) -> str:
         try:
-            browser_fp = BrowserFpGen.generate_fingerprint("Edge")
-            final_endpoint = AB(fp=browser_fp, user_agent=user_agent).generate_abogus(
-                params, body
-            )
+            final_endpoint = cls.get_signer(user_agent).generate_abogus(params, body)
         except Exception as e:
             trace_logger.error(traceback.format_exc())
             raise RuntimeError(_("生成A-Bogus失败: {0})").format(e))
@@ -614,6 +698,7 @@ class ABogusManager:
         base_endpoint: str,
         params: dict,
         body: str = "",
+        browser_fp: str = "",
     ) -> str:
         if not isinstance(params, dict):
             raise TypeError(_("参数必须是字典类型"))
@@ -621,8 +706,7 @@ class ABogusManager:
         param_str = "&".join([f"{k}={v}" for k, v in params.items()])
 
         try:
-            browser_fp = BrowserFpGen.generate_fingerprint("Edge")
-            ab_value = AB(fp=browser_fp, user_agent=user_agent).generate_abogus(
+            ab_value = cls.get_signer(user_agent, browser_fp).generate_abogus(
                 param_str, body
             )
         except Exception as e:
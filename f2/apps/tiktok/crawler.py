@@ -1,6 +1,5 @@
 # path: f2/apps/tiktok/crawler.py
 
-import json
 import gzip
 import asyncio
 import traceback
@@ -11,13 +10,23 @@ from websockets import (
     ConnectionClosedOK,
     WebSocketServerProtocol,
     WebSocketServer,
+    broadcast,
     serve,
 )
 
-from f2.log.logger import logger, trace_logger
-from f2.i18n.translator import _
-from f2.crawlers.base_crawler import BaseCrawler, WebSocketCrawler
+from f2.log.logger import logger, lazy_logger, trace_logger
+from f2.i18n.translator import _, N_
+from f2.crawlers.base_crawler import (
+    BaseCrawler,
+    WebSocketCrawler,
+    WSS_LOG_INTERVAL,
+    WSS_QUEUE_SIZE,
+    WSS_WORKERS,
+)
+from f2.crawlers.danmaku_archive import DanmakuArchive
+from f2.crawlers.danmaku_supervisor import DanmakuRelayServer
 from f2.utils.utils import BaseEndpointManager
+from f2.utils.json_backend import dumps
 from f2.apps.tiktok.api import TiktokAPIEndpoints as tkendpoint
 from f2.apps.tiktok.model import (
     UserProfile,
@@ -34,7 +43,7 @@ from f2.apps.tiktok.model import (
     LiveImFetch,
     LiveWebcast,
 )
-from f2.apps.tiktok.utils import XBogusManager, ClientConfManager
+from f2.apps.tiktok.utils import XBogusManager, ClientConfManager, msToken_provider
 from f2.apps.tiktok.proto.tiktok_webcast_pb2 import (
     PushFrame,
     Response,
@@ -52,8 +61,12 @@ from f2.apps.tiktok.proto.tiktok_webcast_pb2 import (
     LinkLayerMessage,
     RoomMessage,
     OecLiveShoppingMessage,
+    ControlMessage,
 )
 
+# ControlMessage 中表示直播结束的状态 (ControlMessage status announcing the end of the stream)
+LIVE_END_CONTROL_STATUS = 3
+
 
 class TiktokCrawler(BaseCrawler):
     def __init__(
@@ -185,7 +198,16 @@ class TiktokCrawler(BaseCrawler):
         payload_package.ParseFromString(response.content)
         return payload_package
 
+    def handle_http_status_error(self, http_error, url: str, attempt: int):
+        # 鉴权失败时淘汰当前 msToken，后续请求改用令牌池中的下一个
+        # (Retire the msToken on auth failures so later requests use the next pooled one)
+        if getattr(http_error.response, "status_code", None) in (401, 403):
+            msToken_provider.report_failure()
+        super().handle_http_status_error(http_error, url, attempt)
+
     async def __aenter__(self):
+        # 在执行器中预先准备 msToken，构建请求模型时直接读取 (Warm msToken before models are built)
+        await msToken_provider.get()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -196,13 +218,26 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
     # 是否显示直播间消息
     show_message = False
 
-    def __init__(self, kwargs: dict = None, callbacks: dict = {}):
+    def __init__(
+        self,
+        kwargs: dict = None,
+        callbacks: dict = {},
+        relay: DanmakuRelayServer = None,
+        channel: str = None,
+        archive: DanmakuArchive = None,
+    ):
         self.__class__.show_message = bool(kwargs.get("show_message", True))
         # 需要与cli同步
         self.headers = kwargs.get("headers", {}) | {"Cookie": kwargs.get("cookie", {})}
         self.callbacks = callbacks or {}
         self.timeout = kwargs.get("timeout", 10)
         self.connected_clients = set()  # 管理连接的客户端
+        # 多直播间模式下共用的转发服务器与频道 (Shared relay and channel in multi-room mode)
+        self.relay = relay
+        self.channel = channel
+        # 弹幕归档，为 None 时不保存 (Danmaku archive, nothing is saved when None)
+        self.archive = archive
+        self.room_id = channel or ""
         super().__init__(
             wss_headers=self.headers,
             callbacks=self.callbacks,
@@ -210,6 +245,9 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
             proxy=kwargs.get("proxies", {"http://": None, "https://": None}).get(
                 "http://"
             ),
+            queue_size=kwargs.get("queue_size", WSS_QUEUE_SIZE),
+            workers=kwargs.get("workers", WSS_WORKERS),
+            overflow=kwargs.get("overflow", "drop_oldest"),
         )
 
     @classmethod
@@ -224,8 +262,13 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
             params.model_dump(),
         )
         logger.debug(_("直播弹幕接口地址：{0}").format(endpoint))
+        self.room_id = str(params.room_id)
         await self.connect_websocket(endpoint)
 
+        # 由 DanmakuSupervisor 统一提供转发服务器 (The supervisor owns the relay server)
+        if self.relay is not None:
+            return await self.receive_messages()
+
         server_task = asyncio.create_task(self.start_server())
         try:
             return await self.receive_messages()
@@ -244,12 +287,15 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
             message (bytes): WebSocket 消息的字节数据
         """
         try:
+            if self.archive is not None:
+                self.archive.append_frame(self.room_id, message)
+
             wss_package = PushFrame()
             wss_package.ParseFromString(message)
 
             log_id = wss_package.logid
 
-            logger.debug(_("[WssPackage] [📦Wss包] | [{0}]").format(wss_package))
+            lazy_logger.debug(N_("[WssPackage] [📦Wss包] | [{0}]"), wss_package)
 
             # 检查数据是否为 gzip 格式
             if wss_package.payload[:2] == b"\x1f\x8b":
@@ -259,14 +305,20 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
                     trace_logger.error(traceback.format_exc())
                     return
             else:
-                logger.warning(_("解压缩数据时出错，数据不是 gzip 格式，无法解压缩"))
+                lazy_logger.warning(
+                    N_("解压缩数据时出错，数据不是 gzip 格式，无法解压缩"),
+                    interval=WSS_LOG_INTERVAL,
+                )
                 decompressed = wss_package.payload
 
             payload_package = Response()
             payload_package.ParseFromString(decompressed)
 
-            logger.debug(
-                _("[PayloadPackage] [📦Payload包] | [{0}]").format(payload_package)
+            self.stats.messages += len(payload_package.messages)
+            self.record_resume(payload_package.cursor, payload_package.internalExt)
+
+            lazy_logger.debug(
+                N_("[PayloadPackage] [📦Payload包] | [{0}]"), payload_package
             )
 
             # 发送 ack 包
@@ -278,19 +330,32 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
                 method = msg.method
                 payload = msg.payload
 
+                if method == "WebcastControlMessage":
+                    control = ControlMessage()
+                    control.ParseFromString(payload)
+                    if control.status == LIVE_END_CONTROL_STATUS:
+                        await self.end_live()
+
                 # 调用对应的回调函数处理消息
                 if method in self.callbacks:
                     processed_data = await self.callbacks[method](data=payload)
                     # 转发处理后的数据
                     if processed_data is not None:
+                        if self.archive is not None:
+                            self.archive.append(self.room_id, method, processed_data)
                         await self.broadcast_message(processed_data)
                 else:
-                    logger.warning(
-                        _(
-                            "[HandleWssMessage] [❌未找到对应的回调函数] | [方法：{0}]"
-                        ).format(method)
+                    lazy_logger.warning(
+                        N_("[HandleWssMessage] [❌未找到对应的回调函数] | [方法：{0}]"),
+                        method,
+                        key=method,
+                        interval=WSS_LOG_INTERVAL,
                     )
 
+            # 直播结束后连接已关闭，无需保活 (The connection is closed once the stream ends)
+            if self.live_ended:
+                return
+
             # 增加保活机制
             await self.send_ack(log_id, payload_package.internalExt)
 
@@ -321,7 +386,7 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
         ack.logid = log_id
         ack.payload_type = internal_ext
         data = ack.SerializeToString()
-        logger.debug(_("[SendAck] [💓 发送 ack 包] | [日志ID：{0}]").format(log_id))
+        lazy_logger.debug(N_("[SendAck] [💓 发送 ack 包] | [日志ID：{0}]"), log_id)
         await self.websocket.send(data)
 
     async def send_ping(self) -> None:
@@ -433,17 +498,26 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
             message: 要转发的消息（字符串格式）
         """
 
+        if self.relay is not None:
+            self.relay.publish(self.channel, message)
+            return
+
+        # 没有客户端连接时无需序列化 (Nothing to serialize when no client is connected)
+        if not self.connected_clients:
+            return
+
         if not isinstance(message, str):
             try:
-                message = json.dumps(message, ensure_ascii=False)
-            except (json.JSONDecodeError, TypeError) as exc:
+                message = dumps(message)
+            except (ValueError, TypeError) as exc:
                 logger.error(
                     _("[BroadcastMessage] [❌ 消息格式错误] | [错误：{0}]").format(exc)
                 )
                 return
 
-        tasks = [client.send(message) for client in self.connected_clients]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # 每条消息只编码一次，同一帧写入所有客户端，跳过写缓冲已满的慢客户端
+        # (Encode once and write the same frame to every client, skipping slow ones)
+        broadcast(self.connected_clients, message)
 
     @classmethod
     async def WebcastChatMessage(cls, data: bytes) -> dict:
@@ -459,12 +533,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         chatMessage = ChatMessage()
         chatMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                chatMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            chatMessage, preserving_proto_field_name=True
         )
 
         nick_name = data_json.get("user").get("nickname")
@@ -491,12 +561,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         memberMessage = MemberMessage()
         memberMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                memberMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            memberMessage, preserving_proto_field_name=True
         )
 
         nick_name = data_json.get("user").get("nickname")
@@ -522,12 +588,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         roomUserSeqMessage = RoomUserSeqMessage()
         roomUserSeqMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomUserSeqMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            roomUserSeqMessage, preserving_proto_field_name=True
         )
         ranks = data_json.get("ranks")
         if not ranks:
@@ -560,12 +622,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         giftMessage = GiftMessage()
         giftMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                giftMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            giftMessage, preserving_proto_field_name=True
         )
         nick_name = data_json.get("user").get("nickname", "N/A")
         gift_name = data_json.get("gift").get("describe", "N/A")
@@ -592,12 +650,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         socialMessage = SocialMessage()
         socialMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                socialMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            socialMessage, preserving_proto_field_name=True
         )
         nick_name = data_json.get("user").get("nickname")
 
@@ -622,12 +676,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         likeMessage = LikeMessage()
         likeMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                likeMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            likeMessage, preserving_proto_field_name=True
         )
         nick_name = data_json.get("user").get("nickname")
 
@@ -652,12 +702,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         linkMicFanTicketMethod = LinkMicFanTicketMethod()
         linkMicFanTicketMethod.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkMicFanTicketMethod,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkMicFanTicketMethod, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -679,12 +725,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         linkMicMethod = LinkMicMethod()
         linkMicMethod.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkMicMethod,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkMicMethod, preserving_proto_field_name=True
         )
 
         cls._log(_("[WebcastLinkMicMethod] [🎤连麦消息] {0}").format(data_json))
@@ -704,12 +746,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         userFanTicket = UserFanTicket()
         userFanTicket.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                userFanTicket,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            userFanTicket, preserving_proto_field_name=True
         )
 
         cls._log(_("[WebcastUserFanTicket] [🎟️用户粉丝团] {0}").format(data_json))
@@ -729,12 +767,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         linkMessage = LinkMessage()
         linkMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkMessage, preserving_proto_field_name=True
         )
 
         cls._log(_("[WebcastLinkMessage] [🎤连麦消息] {0}").format(data_json))
@@ -754,12 +788,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         linkMicBattle = LinkMicBattle()
         linkMicBattle.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkMicBattle,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkMicBattle, preserving_proto_field_name=True
         )
 
         cls._log(_("[WebcastLinkMicBattle] [🎤连麦对决] {0}").format(data_json))
@@ -779,12 +809,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         linkLayerMessage = LinkLayerMessage()
         linkLayerMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                linkLayerMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            linkLayerMessage, preserving_proto_field_name=True
         )
 
         cls._log(_("[WebcastLinkLayerMessage] [🎤连麦层信息] {0}").format(data_json))
@@ -804,12 +830,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         roomMessage = RoomMessage()
         roomMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                roomMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            roomMessage, preserving_proto_field_name=True
         )
 
         cls._log(_("[WebcastRoomMessage] [📜直播间消息] {0}").format(data_json))
@@ -829,12 +851,8 @@ class TiktokWebSocketCrawler(WebSocketCrawler):
 
         oecLiveShoppingMessage = OecLiveShoppingMessage()
         oecLiveShoppingMessage.ParseFromString(data)
-        data_json = json.loads(
-            json_format.MessageToJson(
-                oecLiveShoppingMessage,
-                preserving_proto_field_name=True,
-                ensure_ascii=False,
-            )
+        data_json = json_format.MessageToDict(
+            oecLiveShoppingMessage, preserving_proto_field_name=True
         )
 
         cls._log(
@@ -89,6 +89,22 @@ class AsyncUserDB(BaseDB):
             )
             await self.commit()
 
+    async def update_last_aweme_ids(self, last_aweme_ids: dict) -> None:
+        """
+        批量更新多个用户的 last_aweme_id，在一个事务中使用 executemany 写入
+
+        Args:
+            last_aweme_ids (dict): secUid 到 last_aweme_id 的映射
+        """
+        if not last_aweme_ids:
+            return
+
+        async with self.transaction():
+            await self.executemany(
+                f"UPDATE {self.TABLE_NAME} SET last_aweme_id = ? WHERE secUid=?",
+                [(aweme_id, secUid) for secUid, aweme_id in last_aweme_ids.items()],
+            )
+
     async def get_user_info(self, secUid: str = "", uniqueId: str = "") -> dict:
         """
         获取用户信息
@@ -26,18 +26,32 @@ class TiktokDownloader(BaseDownloader):
             )
 
         super().__init__(kwargs)
+        # 待写入的 last_aweme_id (Pending last_aweme_id updates)
+        self._last_aweme_ids = {}
 
     async def save_last_aweme_id(self, secUid: str, aweme_id: str) -> None:
         """
-        保存最后一个请求的aweme_id
-        (Save the last requested aweme_id)
+        记录最后一个请求的aweme_id，同一页内的更新会合并，由 flush_last_aweme_ids 统一写入
+        (Record the last requested aweme_id, coalesced and written by flush_last_aweme_ids)
 
         Args:
             aweme_id (str): 作品id (aweme_id)
         """
 
+        self._last_aweme_ids[secUid] = aweme_id
+
+    async def flush_last_aweme_ids(self) -> None:
+        """
+        将合并后的 last_aweme_id 一次性写入数据库
+        (Write the coalesced last_aweme_id updates in one commit)
+        """
+
+        if not self._last_aweme_ids:
+            return
+
+        last_aweme_ids, self._last_aweme_ids = self._last_aweme_ids, {}
         async with AsyncUserDB("tiktok_users.db") as db:
-            await db.update_user_info(secUid=secUid, last_aweme_id=aweme_id)
+            await db.update_last_aweme_ids(last_aweme_ids)
 
     async def filter_aweme_datas_by_interval(
         self, aweme_datas: Union[list, dict], interval: str
@@ -144,10 +158,14 @@ class TiktokDownloader(BaseDownloader):
             # refresh_per_second=2,
             vertical_overflow="visible",
         ) as live:
-            for aweme_data in aweme_datas_list:
-                await self.handler_download(kwargs, aweme_data, user_path)
-                # 手动刷新防止过快闪屏
-                live.refresh()
+            try:
+                for aweme_data in aweme_datas_list:
+                    await self.handler_download(kwargs, aweme_data, user_path)
+                    # 手动刷新防止过快闪屏
+                    live.refresh()
+            finally:
+                # 每页只提交一次 last_aweme_id (Commit last_aweme_id once per page)
+                await self.flush_last_aweme_ids()
 
             # 延时更新，避免过快刷新导致界面错乱
             await asyncio.sleep(0.2)
@@ -100,9 +100,7 @@ class UserProfileFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -352,9 +350,7 @@ class UserPostFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -425,9 +421,7 @@ class UserPlayListFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -664,9 +658,7 @@ class PostDetailFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -884,9 +876,7 @@ class PostSearchFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -1033,9 +1023,7 @@ class UserLiveFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -1057,9 +1045,7 @@ class CheckLiveAliveFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -5,7 +5,7 @@ import asyncio
 from rich.rule import Rule
 from pathlib import Path
 from urllib.parse import quote
-from typing import AsyncGenerator, Union, List, Any
+from typing import AsyncGenerator, Union, Dict, List, Any
 
 from f2.i18n.translator import _
 from f2.log.logger import logger
@@ -15,6 +15,12 @@ from f2.apps.bark.utils import ClientConfManager as BarkClientConfManager
 from f2.apps.tiktok.db import AsyncUserDB, AsyncVideoDB
 from f2.apps.tiktok.crawler import TiktokCrawler, TiktokWebSocketCrawler
 from f2.apps.tiktok.dl import TiktokDownloader
+from f2.crawlers.danmaku_archive import DanmakuArchive
+from f2.crawlers.danmaku_supervisor import (
+    DanmakuRelayServer,
+    DanmakuRoom,
+    DanmakuSupervisor,
+)
 from f2.apps.tiktok.model import (
     UserProfile,
     UserPost,
@@ -40,6 +46,7 @@ from f2.apps.tiktok.filter import (
     CheckLiveAliveFilter,
 )
 from f2.apps.tiktok.utils import (
+    ClientConfManager,
     SecUserIdFetcher,
     AwemeIdFetcher,
     create_or_rename_user_folder,
@@ -1110,6 +1117,24 @@ class TiktokHandler:
         logger.info(_("结束直播间在线状态检查"))
         return check
 
+    async def _is_live_room_ended(self, room_id: str) -> bool:
+        """
+        检查直播间是否已关播 (Check whether the live room has gone offline)
+
+        Args:
+            room_id: str: 直播间ID
+
+        Return:
+            ended: bool: 已关播时为 True，状态未知时为 False
+        """
+
+        async with TiktokCrawler(self.kwargs) as crawler:
+            response = await crawler.fetch_check_live_alive(
+                CheckLiveAlive(room_ids=room_id)
+            )
+        alive = CheckLiveAliveFilter(response).is_alive or []
+        return bool(alive) and alive[0] is False
+
     async def fetch_live_im(self, room_id: str):
         """
         用于获取直播间信息。
@@ -1137,6 +1162,36 @@ class TiktokHandler:
 
         return live_im
 
+    @staticmethod
+    def default_wss_callbacks() -> Dict[str, Any]:
+        """
+        默认的弹幕回调函数，包含所有已实现的消息类型
+
+        Return:
+            callbacks: Dict[str, Any]: 消息类型与回调函数的映射
+        """
+
+        return {
+            "WebcastChatMessage": TiktokWebSocketCrawler.WebcastChatMessage,
+            "WebcastMemberMessage": TiktokWebSocketCrawler.WebcastMemberMessage,
+            "WebcastRoomUserSeqMessage": TiktokWebSocketCrawler.WebcastRoomUserSeqMessage,
+            "WebcastGiftMessage": TiktokWebSocketCrawler.WebcastGiftMessage,
+            "WebcastSocialMessage": TiktokWebSocketCrawler.WebcastSocialMessage,
+            "WebcastLikeMessage": TiktokWebSocketCrawler.WebcastLikeMessage,
+            "WebcastLinkMicFanTicketMethod": TiktokWebSocketCrawler.WebcastLinkMicFanTicketMethod,
+            "WebcastLinkMicMethod": TiktokWebSocketCrawler.WebcastLinkMicMethod,
+            "UserFanTicket": TiktokWebSocketCrawler.UserFanTicket,
+            "WebcastLinkMessage": TiktokWebSocketCrawler.WebcastLinkMessage,
+            "WebcastLinkMicBattle": TiktokWebSocketCrawler.WebcastLinkMicBattle,
+            "WebcastLinkLayerMessage": TiktokWebSocketCrawler.WebcastLinkLayerMessage,
+            "WebcastRoomMessage": TiktokWebSocketCrawler.WebcastRoomMessage,
+            "WebcastOecLiveShoppingMessage": TiktokWebSocketCrawler.WebcastOecLiveShoppingMessage,
+            # TODO: 以下消息类型暂未实现
+            # WebcastOecLiveManagerMessage
+            # WebcastInRoomBannerMessage
+            # WebcastAnchorToolModificationMessage
+        }
+
     async def fetch_live_danmaku(
         self,
         room_id: str,
@@ -1144,6 +1199,7 @@ class TiktokHandler:
         cursor: str,
         wrss: str,
         wss_callbacks: dict = None,
+        archive: DanmakuArchive = None,
     ):
         """
         通过WebSocket连接获取直播间弹幕，再通过回调函数处理弹幕数据。
@@ -1153,6 +1209,7 @@ class TiktokHandler:
             user_unique_id: str: 用户ID
             internal_ext: str: 内部扩展参数
             cursor: str: 弹幕cursor
+            archive: DanmakuArchive: 弹幕归档，默认不保存
 
         Return:
             self.websocket: TiktokWebSocketCrawler: WebSocket连接对象
@@ -1160,28 +1217,11 @@ class TiktokHandler:
 
         if not wss_callbacks:
             logger.warning(_("没有设置回调函数，默认使用所有回调函数"))
-            wss_callbacks = {
-                "WebcastChatMessage": TiktokWebSocketCrawler.WebcastChatMessage,
-                "WebcastMemberMessage": TiktokWebSocketCrawler.WebcastMemberMessage,
-                "WebcastRoomUserSeqMessage": TiktokWebSocketCrawler.WebcastRoomUserSeqMessage,
-                "WebcastGiftMessage": TiktokWebSocketCrawler.WebcastGiftMessage,
-                "WebcastSocialMessage": TiktokWebSocketCrawler.WebcastSocialMessage,
-                "WebcastLikeMessage": TiktokWebSocketCrawler.WebcastLikeMessage,
-                "WebcastLinkMicFanTicketMethod": TiktokWebSocketCrawler.WebcastLinkMicFanTicketMethod,
-                "WebcastLinkMicMethod": TiktokWebSocketCrawler.WebcastLinkMicMethod,
-                "UserFanTicket": TiktokWebSocketCrawler.UserFanTicket,
-                "WebcastLinkMessage": TiktokWebSocketCrawler.WebcastLinkMessage,
-                "WebcastLinkMicBattle": TiktokWebSocketCrawler.WebcastLinkMicBattle,
-                "WebcastLinkLayerMessage": TiktokWebSocketCrawler.WebcastLinkLayerMessage,
-                "WebcastRoomMessage": TiktokWebSocketCrawler.WebcastRoomMessage,
-                "WebcastOecLiveShoppingMessage": TiktokWebSocketCrawler.WebcastOecLiveShoppingMessage,
-                # TODO: 以下消息类型暂未实现
-                # WebcastOecLiveManagerMessage
-                # WebcastInRoomBannerMessage
-                # WebcastAnchorToolModificationMessage
-            }
-
-        async with TiktokWebSocketCrawler(self.kwargs, callbacks=wss_callbacks) as wss:
+            wss_callbacks = self.default_wss_callbacks()
+
+        async with TiktokWebSocketCrawler(
+            self.kwargs, callbacks=wss_callbacks, archive=archive
+        ) as wss:
 
             params = LiveWebcast(
                 room_id=room_id,
@@ -1192,13 +1232,73 @@ class TiktokHandler:
 
             result = await wss.fetch_live_danmaku(params)
 
-            if result == "closed":
+            if result in ("closed", "ended"):
                 logger.info(_("直播间：{0} 已结束直播").format(room_id))
             elif result == "error":
                 logger.error(_("直播间：{0} 弹幕连接异常").format(room_id))
 
             return
 
+    async def fetch_live_danmaku_rooms(
+        self,
+        rooms: List[Dict[str, str]],
+        wss_callbacks: dict = None,
+        archive: DanmakuArchive = None,
+    ) -> Dict[str, dict]:
+        """
+        在同一进程中同时获取多个直播间的弹幕，所有直播间共用一个本地转发服务器，
+        客户端连接 ws://host:port/<room_id> 接收对应直播间的消息，连接 ws://host:port/ 接收全部消息。
+        断开后自动重连并从最近的 cursor 与 internal_ext 续传。
+
+        Args:
+            rooms: List[Dict[str, str]]: 直播间列表，每项包含 room_id、internal_ext、cursor、wrss
+            wss_callbacks: dict: 回调函数，默认使用所有回调函数
+            archive: DanmakuArchive: 弹幕归档，默认不保存
+
+        Return:
+            stats: Dict[str, dict]: 每个直播间的统计数据
+        """
+
+        if not wss_callbacks:
+            logger.warning(_("没有设置回调函数，默认使用所有回调函数"))
+            wss_callbacks = self.default_wss_callbacks()
+
+        async def connect(room: DanmakuRoom, relay: DanmakuRelayServer) -> str:
+            async with TiktokWebSocketCrawler(
+                self.kwargs,
+                callbacks=wss_callbacks,
+                relay=relay,
+                channel=room.room_id,
+                archive=archive,
+            ) as wss:
+                room.attach(wss)
+                try:
+                    params = LiveWebcast(
+                        room_id=room.room_id,
+                        internal_ext=quote(room.internal_ext, safe=""),
+                        cursor=room.cursor,
+                        wrss=room.extra.get("wrss", ""),
+                    )
+                    result = await wss.fetch_live_danmaku(params)
+                finally:
+                    room.detach(wss)
+
+            # 连接断开后确认是否已关播，避免对已结束的直播间无限重连
+            # (Check whether the stream is over before the supervisor reconnects)
+            if result != "ended" and await self._is_live_room_ended(room.room_id):
+                return "ended"
+            return result
+
+        wss_conf = ClientConfManager.wss()
+        supervisor = DanmakuSupervisor(
+            connect, wss_conf.get("domain"), wss_conf.get("port")
+        )
+        for room in rooms:
+            supervisor.add_room(**room)
+
+        logger.info(_("开始监控 {0} 个直播间的弹幕").format(len(supervisor.rooms)))
+        return await supervisor.run()
+
 
 async def main(kwargs):
     mode = kwargs.get("mode")
@@ -1,15 +1,11 @@
 # path: f2/apps/tiktok/models.py
 
-import traceback
-
 from typing import Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from urllib.parse import quote, unquote
 
-from f2.apps.tiktok.utils import TokenManager, ClientConfManager
+from f2.apps.tiktok.utils import ClientConfManager, msToken_provider
 from f2.utils.utils import get_timestamp
-from f2.i18n.translator import _
-from f2.log.logger import logger
 
 
 # Model
@@ -56,13 +52,7 @@ class BaseRequestModel(BaseModel):
     tz_name: str = quote(
         ClientConfManager.base_request_model().get("tz_name", "Asia/Hong_Kong"), safe=""
     )
-    try:
-        msToken: str = TokenManager.gen_real_msToken()
-    except Exception:
-        logger.warning(_("msToken 生成失败，使用虚假 msToken"))
-        logger.debug(traceback.format_exc())
-        # 发生异常时，重新生成msToken，不生成虚假msToken
-        msToken: str = TokenManager.gen_real_msToken()
+    msToken: str = Field(default_factory=msToken_provider.current)
 
 
 class BaseWebCastModel(BaseModel):
@@ -191,11 +181,7 @@ class LiveImFetch(BaseWebCastModel):
     room_id: str
     history_comment_count: int = 6
     history_comment_cursor: str = "7386962392254958354"
-    try:
-        msToken: str = TokenManager.gen_real_msToken()
-    except Exception as e:
-        # 发生异常时，重新生成msToken，不生成虚假msToken
-        msToken: str = TokenManager.gen_real_msToken()
+    msToken: str = Field(default_factory=msToken_provider.current)
     _signature: str
 
 
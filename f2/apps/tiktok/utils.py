@@ -14,6 +14,9 @@ from f2.i18n.translator import _
 from f2.log.logger import logger, trace_logger
 from f2.utils.xbogus import XBogus as XB
 from f2.utils.conf_manager import ConfigManager
+from f2.utils._sign import BatchSignMixin
+from f2.utils.token_pool import TokenPool
+from f2.utils.token_provider import AsyncTokenProvider
 from f2.utils.utils import (
     gen_random_str,
     get_timestamp,
@@ -435,7 +438,20 @@ class TokenManager(BaseCrawler):
             )
 
 
-class XBogusManager:
+# 后台预生成并轮询分发的 msToken 令牌池 (msToken pool refilled in the background)
+msToken_pool = TokenPool("tiktok_msToken", TokenManager.gen_real_msToken)
+
+# 惰性获取并按有效期轮换的 msToken (msToken fetched lazily and rotated by TTL)
+msToken_provider = AsyncTokenProvider(
+    "msToken",
+    msToken_pool.get,
+    ttl=300,
+    fallback=TokenManager.gen_false_msToken,
+    on_failure=msToken_pool.report_failure,
+)
+
+
+class XBogusManager(BatchSignMixin):
     @classmethod
     def str_2_endpoint(
         cls,
@@ -1114,14 +1130,8 @@ class DeviceIdManager(BaseCrawler):
     _DEVICE_ID_URL = "https://www.tiktok.com/"
     _DEVICE_ID_FULL_URL = "https://www.tiktok.com/explore"
 
-    try:
-        _MSTOKEN = TokenManager.gen_real_msToken()
-    except Exception as e:
-        _MSTOKEN = TokenManager.gen_real_msToken()
-
     _DEVICE_ID_HEADERS = {
         "User-Agent": ClientConfManager.user_agent(),
-        "Cookie": f"msToken={_MSTOKEN}",
     }
     proxies = ClientConfManager.proxies()
 
@@ -1158,7 +1168,8 @@ class DeviceIdManager(BaseCrawler):
                     if not full_cookie
                     else instance._DEVICE_ID_FULL_URL
                 ),
-                headers=instance._DEVICE_ID_HEADERS,
+                headers=instance._DEVICE_ID_HEADERS
+                | {"Cookie": f"msToken={await msToken_provider.get()}"},
                 follow_redirects=True,
             )
             response.raise_for_status()
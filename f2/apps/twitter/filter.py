@@ -267,9 +267,7 @@ class TweetDetailFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -371,9 +369,7 @@ class UserProfileFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -638,9 +634,7 @@ class PostTweetFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -931,9 +925,7 @@ class BookmarkTweetFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
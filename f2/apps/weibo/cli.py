@@ -20,7 +20,6 @@ from f2.utils.utils import (
 )
 from f2.utils.conf_manager import ConfigManager
 from f2.i18n.translator import TranslationManager, _
-from f2.apps.weibo.utils import ClientConfManager
 
 
 def handler_help(
@@ -319,6 +318,9 @@ def weibo(
     # cli参数为配置文件的热修改，可以随时修改每一个参数。
     ##################
 
+    # 应用工具模块较重，仅在执行命令时导入 (The app utils module is heavy, import it on run)
+    from f2.apps.weibo.utils import ClientConfManager
+
     # 读取低频主配置文件
     main_manager = ConfigManager(f2.APP_CONFIG_FILE_PATH)
     main_conf_path = get_resource_path(f2.APP_CONFIG_FILE_PATH)
@@ -97,9 +97,7 @@ class UserInfoFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -153,9 +151,7 @@ class UserDetailFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -301,9 +297,7 @@ class WeiboDetailFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
 
@@ -462,9 +456,7 @@ class UserWeiboFilter(JSONModel):
 
     def _to_dict(self) -> dict:
         return {
-            prop_name: getattr(self, prop_name)
-            for prop_name in dir(self)
-            if not prop_name.startswith("__") and not prop_name.startswith("_")
+            prop_name: getattr(self, prop_name) for prop_name in self._property_names
         }
 
     def _to_list(self) -> list:
@@ -1,20 +1,24 @@
 # path: f2/cli/cli_command.py
 
 import f2
+import sys
 import click
 import typing
 import asyncio
 import importlib
+import threading
 import traceback
+import subprocess
 
 from f2 import helps
 from f2.apps import __apps__ as apps_module
-from f2.cli.cli_console import RichConsoleManager
 from f2.utils._signal import SignalManager
-from f2.utils.utils import check_f2_version, check_python_version
 from f2.i18n.translator import _
 from f2.log.logger import logger, trace_logger
 
+# 启动耗时分析时展示的模块数量 (Number of modules shown by --profile-startup)
+PROFILE_STARTUP_TOP = 25
+
 
 # 处理帮助信息
 def handle_help(
@@ -67,11 +71,85 @@ def handle_last_version(
     if not value or ctx.resilient_parsing:
         return
 
+    from f2.utils.utils import check_f2_version
+
     asyncio.run(check_f2_version())
 
     ctx.exit()
 
 
+# 启动耗时分析
+def handle_profile_startup(
+    ctx: click.Context,
+    param: typing.Union[click.Option, click.Parameter],
+    value: typing.Any,
+) -> None:
+    if not value or ctx.resilient_parsing:
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    modules = ["f2.cli.cli_commands"] + [
+        f"f2.apps.{app_name}.cli" for app_name in APP_MAPPINGS
+    ]
+    imports = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", imports],
+        capture_output=True,
+        text=True,
+    )
+
+    # 每行格式：import time: self [us] | cumulative | imported package
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|", 2)
+        timings.append((int(cumulative_us), int(self_us), module.rstrip()))
+
+    table = Table(title=_("启动导入耗时"))
+    table.add_column(_("模块"))
+    table.add_column(_("累计 (ms)"), justify="right")
+    table.add_column(_("自身 (ms)"), justify="right")
+    for cumulative_us, self_us, module in sorted(timings, reverse=True)[
+        :PROFILE_STARTUP_TOP
+    ]:
+        table.add_row(module, f"{cumulative_us / 1000:.1f}", f"{self_us / 1000:.1f}")
+
+    console = Console()
+    console.print(table)
+    total_us = sum(
+        cumulative_us
+        for cumulative_us, _self_us, module in timings
+        if module.strip() in modules
+    )
+    console.print(_("导入全部 CLI 模块共耗时：{0:.1f} ms").format(total_us / 1000))
+    ctx.exit()
+
+
+def check_version_in_background() -> None:
+    """
+    使用一天内缓存的结果检查版本，缓存过期时在后台线程中刷新，不阻塞命令执行
+    (Check the version against a result cached within a day, refreshing a stale
+    cache in a background thread so that the command is never blocked)
+    """
+    from f2.utils.utils import (
+        read_version_cache,
+        refresh_version_cache,
+        check_f2_version,
+    )
+
+    if read_version_cache() is not None:
+        asyncio.run(check_f2_version(use_cache=True))
+    else:
+        threading.Thread(
+            target=run_async_in_thread,
+            args=(refresh_version_cache(),),
+            daemon=True,
+        ).start()
+
+
 def run_async_in_thread(coro):
     """在单独的线程中运行异步任务"""
     loop = asyncio.new_event_loop()
@@ -101,7 +179,7 @@ class DynamicGroup(click.Group):
 
     类方法:
     - get_command: 重写 click.Group 的 `get_command` 方法，根据传入的命令名称 `cmd_name` 查找并导入对应应用的 CLI 模块。
-        执行异步检查任务并返回相关命令。如果发生错误，返回 None。
+        使用缓存检查版本（缓存过期时在后台刷新）并返回相关命令。如果发生错误，返回 None。
 
     异常处理:
     - 如果找不到命令对应的应用或在导入过程中发生错误，则会记录错误信息并返回 None。
@@ -131,8 +209,8 @@ class DynamicGroup(click.Group):
             ctx.fail(_("没有找到 {0} 应用").format(cmd_name))
         try:
             if app_name:
-                # 使用线程池执行异步任务
-                asyncio.run(check_f2_version())
+                # 版本检查每天最多联网一次，且不阻塞命令执行
+                check_version_in_background()
                 # 动态导入app的cli模块
                 module = importlib.import_module(f"f2.apps.{app_name}.cli")
                 logger.info(_("应用：{0}").format(app_name))
@@ -177,7 +255,17 @@ class DynamicGroup(click.Group):
     callback=handle_last_version,
     help=_("检查F2版本"),
 )
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=handle_profile_startup,
+    help=_("分析启动时各模块的导入耗时"),
+)
 def main(**kwargs):
+    from f2.utils.utils import check_python_version
+
     # 注册关闭信号
     SignalManager().register_shutdown_signal()
     # 检查Python版本是否符合要求
@@ -195,14 +283,27 @@ def set_cli_config(ctx: click.Context, **kwargs):
         **kwargs: 关键字参数，代表CLI的各种设置选项
     """
 
+    from f2.cli.cli_console import RichConsoleManager
+
     with RichConsoleManager().progress:
         asyncio.run(run_app(kwargs))
 
 
 async def run_app(kwargs):
+    from f2.crawlers.client_pool import AsyncClientPool
+    from f2.db.base_db import BaseDB
+    from f2.utils.token_pool import TokenPool
+
     app_name = kwargs["app_name"]
     app_module = importlib.import_module(f"f2.apps.{app_name}.handler")
-    await app_module.main(kwargs)
+    try:
+        await app_module.main(kwargs)
+    finally:
+        # 运行结束后统一关闭共享的 HTTP 客户端、数据库连接与令牌池
+        # (Close the shared HTTP clients, database connections and token pools once per run)
+        await TokenPool.close_all()
+        await AsyncClientPool.aclose_all()
+        await BaseDB.close_all()
 
 
 if __name__ == "__main__":
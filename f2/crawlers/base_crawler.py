@@ -2,17 +2,20 @@
 
 import time
 import httpx
-import json
+import struct
 import asyncio
+import tempfile
 import traceback
 import websockets
+import contextvars
 import websockets_proxy
 
 from httpx import Response
+from typing import Iterable, Optional, Tuple, Union
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 
-from f2.i18n.translator import _
-from f2.log.logger import logger, trace_logger
+from f2.i18n.translator import _, N_
+from f2.log.logger import LazyValue, lazy_logger, logger, trace_logger
 from f2.exceptions.conf_exceptions import InvalidEncodingError
 from f2.exceptions.api_exceptions import (
     APIConnectionError,
@@ -24,7 +27,9 @@ from f2.exceptions.api_exceptions import (
     APIRateLimitError,
     APIRetryExhaustedError,
 )
-from f2.utils.utils import timestamp_2_str
+from f2.utils.utils import get_cache_dir, timestamp_2_str
+from f2.utils.json_backend import JSONDecodeErrors, is_blank, loads, loads_fields
+from f2.crawlers.client_pool import AsyncClientPool, HTTP2_AVAILABLE
 
 
 class BaseCrawler:
@@ -45,11 +50,14 @@ class BaseCrawler:
     - _max_retries (int): 请求重试次数。
     - _timeout (int): 请求超时时间。
     - timeout (httpx.Timeout): 超时设置。
+    - _http2 (bool): 是否启用 HTTP/2（需要安装 h2）。
+    - _use_pool (bool): 是否从进程级连接池借用传输层。
     - _aclient (httpx.AsyncClient): 异步 HTTP 客户端。
+    - _transport (httpx.AsyncHTTPTransport): 从 AsyncClientPool 借用的共享传输层。
     - _client (httpx.Client): 同步 HTTP 客户端。
 
     类方法:
-    - aclient (property): 获取异步客户端（如果未初始化则创建）。
+    - aclient (property): 获取异步客户端（默认挂载从 AsyncClientPool 借用的共享传输层）。
     - client (property): 获取同步客户端（如果未初始化则创建）。
     - _create_mount: 根据是否异步模式创建 HTTP 传输配置。
     - _fetch_response: 获取接口的响应数据（原始响应）。
@@ -106,9 +114,19 @@ class BaseCrawler:
         self._timeout = kwargs.get("timeout", 10)
         self.timeout = httpx.Timeout(self._timeout)
 
+        # HTTP/2 支持，服务端不支持时会自动协商为 HTTP/1.1
+        # (HTTP/2 support, falls back to HTTP/1.1 via ALPN when unsupported)
+        self._http2 = bool(kwargs.get("http2", True)) and HTTP2_AVAILABLE
+
+        # 复用进程级连接池 / Reuse the process-wide client pool
+        self._use_pool = kwargs.get("client_pool", True)
+
         # 异步客户端 / Asynchronous client
         self._aclient = None
 
+        # 从连接池借用的传输层 / Transport borrowed from the connection pool
+        self._transport = None
+
         # 同步客户端 / Synchronous client
         self._client = None
 
@@ -131,6 +149,7 @@ class BaseCrawler:
                 "all://": transport_class(
                     verify=False,
                     limits=self.limits,
+                    http2=self._http2,
                     proxy=httpx.Proxy(url=self.http_proxy),
                     local_address="0.0.0.0",
                     retries=self._max_retries,
@@ -141,21 +160,46 @@ class BaseCrawler:
                 "all://": transport_class(
                     verify=False,
                     limits=self.limits,
+                    http2=self._http2,
                     retries=self._max_retries,
                 ),
             }
 
+    def _new_aclient(
+        self, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> httpx.AsyncClient:
+        try:
+            return httpx.AsyncClient(
+                headers=self.crawler_headers,
+                mounts=(
+                    {"all://": transport}
+                    if transport
+                    else self._create_mount(async_mode=True)
+                ),
+                timeout=self.timeout,
+            )
+        except UnicodeEncodeError:
+            raise InvalidEncodingError
+
     @property
     def aclient(self):
-        if self._aclient is None:
-            try:
-                self._aclient = httpx.AsyncClient(
-                    headers=self.crawler_headers,
-                    mounts=self._create_mount(async_mode=True),
-                    timeout=self.timeout,
+        if self._use_pool:
+            # 请求头与 Cookie 只属于本爬虫的客户端，池中只共享传输层
+            # (Headers and cookies stay on this crawler's client, only the transport is pooled)
+            if (
+                self._aclient is None
+                or self._aclient.is_closed
+                or not AsyncClientPool.is_pooled(self._transport)
+            ):
+                key = AsyncClientPool.make_key(
+                    self.http_proxy, self.limits, self._max_retries, self._http2
                 )
-            except UnicodeEncodeError:
-                raise InvalidEncodingError
+                self._transport = AsyncClientPool.acquire(
+                    key, lambda: self._create_mount(async_mode=True)["all://"]
+                )
+                self._aclient = self._new_aclient(self._transport)
+        elif self._aclient is None or self._aclient.is_closed:
+            self._aclient = self._new_aclient()
         return self._aclient
 
     @property
@@ -187,29 +231,35 @@ class BaseCrawler:
             trace_logger.error(traceback.format_exc())
             return Response()
 
-    async def _fetch_get_json(self, endpoint: str) -> dict:
+    async def _fetch_get_json(
+        self, endpoint: str, fields: Optional[Iterable[str]] = None
+    ) -> dict:
         """
         获取 JSON 数据 (Get JSON data)
 
         Args:
             endpoint (str): 接口地址 (Endpoint URL)
+            fields (Iterable[str]): 只解码的字段路径 (Only decode these field paths)
 
         Returns:
             dict: 解析后的JSON数据 (Parsed JSON data)
         """
         try:
             response = await self.get_fetch_data(endpoint)
-            return self.parse_json(response)
+            return self.parse_json(response, fields)
         except Exception as exc:
             trace_logger.error(traceback.format_exc())
             return {}
 
-    async def _fetch_post_json(self, endpoint: str, **kwargs) -> dict:
+    async def _fetch_post_json(
+        self, endpoint: str, fields: Optional[Iterable[str]] = None, **kwargs
+    ) -> dict:
         """
         获取 JSON 数据 (Post JSON data)
 
         Args:
             endpoint (str): 接口地址 (Endpoint URL)
+            fields (Iterable[str]): 只解码的字段路径 (Only decode these field paths)
             **kwargs: 透传参数，支持 post_fetch_data 的所有参数
 
         Returns:
@@ -217,17 +267,25 @@ class BaseCrawler:
         """
         try:
             response = await self.post_fetch_data(endpoint, **kwargs)
-            return self.parse_json(response)
+            return self.parse_json(response, fields)
         except Exception as e:
             trace_logger.error(traceback.format_exc())
             return {}
 
-    def parse_json(self, response: Response) -> dict:
+    def parse_json(
+        self, response: Response, fields: Optional[Iterable[str]] = None
+    ) -> dict:
         """
         解析JSON响应对象 (Parse JSON response object)
 
+        直接从响应字节解码，使用 f2.utils.json_backend 中可用的最快实现。
+        指定 fields 时只解码这些字段构成的子树，如 ("status_code", "aweme_list")。
+        (Decodes straight from the response bytes with the fastest available backend.
+        With fields given, only the sub-tree made of those fields is decoded.)
+
         Args:
             response (Response): 原始响应对象 (Raw response object)
+            fields (Iterable[str]): 只解码的字段路径 (Only decode these field paths)
 
         Returns:
             dict: 解析后的JSON数据 (Parsed JSON data)
@@ -238,15 +296,17 @@ class BaseCrawler:
             and response.status_code == 200
         ):
             try:
-                return response.json()
-            except json.JSONDecodeError as e:
-                logger.error(
-                    _("解析 {0} 接口 JSON 失败：{1}").format(str(response.url), e)
-                )
+                if fields:
+                    return loads_fields(response.content, fields)
+                return loads(response.content)
             except UnicodeDecodeError as e:
                 logger.error(
                     _("接口 {0} JSON 解码错误：{1}").format(str(response.url), e)
                 )
+            except JSONDecodeErrors as e:
+                logger.error(
+                    _("解析 {0} 接口 JSON 失败：{1}").format(str(response.url), e)
+                )
         else:
             if isinstance(response, Response):
                 logger.error(
@@ -272,7 +332,7 @@ class BaseCrawler:
                 response = await self.aclient.get(
                     url, headers=self.crawler_headers, follow_redirects=True
                 )
-                if not response.text.strip() or not response.content:
+                if is_blank(response.content):
                     error_message = _(
                         "第 {0} 次请求响应内容为空, 状态码: {1}, URL:{2}"
                     ).format(attempt + 1, response.status_code, str(response.url))
@@ -394,7 +454,7 @@ class BaseCrawler:
                     headers=self.crawler_headers,
                     follow_redirects=True,
                 )
-                if not response.text.strip() or not response.content:
+                if is_blank(response.content):
                     error_message = _(
                         "第 {0} 次请求响应内容为空, 状态码: {1}, URL:{2}"
                     ).format(attempt + 1, response.status_code, str(response.url))
@@ -523,8 +583,12 @@ class BaseCrawler:
         # 如果没有初始化客户端，则不关闭 (If the client is not initialized, do not close)
         if self._client:
             self.client.close()
-        if self._aclient:
-            await self.aclient.aclose()
+        # 共享传输层由 AsyncClientPool 统一关闭，关闭客户端会连带关闭其传输层
+        # (Pooled transports are closed by AsyncClientPool; closing the client would close them)
+        if self._aclient and not self._use_pool:
+            await self._aclient.aclose()
+        self._aclient = None
+        self._transport = None
 
     async def __aenter__(self):
         return self
@@ -533,22 +597,164 @@ class BaseCrawler:
         await self.close()
 
 
+# WebSocket 消息队列的默认容量 (Default capacity of the WebSocket message queue)
+WSS_QUEUE_SIZE = 1000
+# 默认的消息处理协程数量，单个协程按到达顺序处理帧 (Default number of message workers;
+# a single worker handles frames in arrival order)
+WSS_WORKERS = 1
+# 队列已满时的处理策略 (Policies applied when the queue is full)
+WSS_OVERFLOW_POLICIES = ("drop_oldest", "block", "spill")
+# 每帧日志的最短输出间隔（秒） (Minimum seconds between per-frame log records)
+WSS_LOG_INTERVAL = 5
+
+# 处理协程当前帧的到达序号，直接调用 on_message 时为 None
+# (Arrival number of the frame a worker is handling; None outside the workers)
+_FRAME_SEQ: contextvars.ContextVar = contextvars.ContextVar(
+    "wss_frame_seq", default=None
+)
+
+
+class WebSocketQueueStats:
+    """
+    WebSocket 消息队列计数器 (WebSocket Message Queue Counters)
+
+    类属性:
+    - received (int): 接收的帧数量。
+    - processed (int): 已处理的帧数量。
+    - dropped (int): 因队列已满被丢弃的帧数量。
+    - spilled (int): 因队列已满写入磁盘的帧数量。
+    - failed (int): 处理出错的帧数量。
+    - messages (int): 从帧中解析出的消息数量，由子类统计。
+    - max_depth (int): 队列（含磁盘）的最大积压。
+    - last_lag (float): 最近一帧从接收到开始处理的等待时间（秒）。
+    - max_lag (float): 最大等待时间（秒）。
+
+    类方法:
+    - record_depth: 记录当前积压。
+    - record_lag: 记录等待时间。
+    - as_dict: 以字典形式返回全部计数。
+    """
+
+    __slots__ = (
+        "received",
+        "processed",
+        "dropped",
+        "spilled",
+        "failed",
+        "messages",
+        "max_depth",
+        "last_lag",
+        "max_lag",
+    )
+
+    def __init__(self):
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+        self.messages = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def record_depth(self, depth: int) -> None:
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_lag(self, lag: float) -> None:
+        self.last_lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FrameSpill:
+    """
+    磁盘溢出缓冲区 (On-disk Overflow Buffer)
+
+    队列已满时按先进先出顺序将帧追加到缓存目录下的临时文件，队列有空位后再依次读回。
+    临时文件在关闭时自动删除。
+
+    类方法:
+    - push: 追加一帧。
+    - pop: 取出最早的一帧，没有时返回 None。
+    - close: 关闭并删除临时文件。
+    """
+
+    _HEADER = struct.Struct(">dBI")
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(dir=get_cache_dir("wss_spill"))
+        self._read_pos = 0
+        self._write_pos = 0
+        self.count = 0
+
+    def push(self, enqueued_at: float, message: Union[bytes, str]) -> None:
+        is_text = isinstance(message, str)
+        data = message.encode("utf-8") if is_text else message
+        self._file.seek(self._write_pos)
+        self._file.write(self._HEADER.pack(enqueued_at, is_text, len(data)) + data)
+        self._write_pos = self._file.tell()
+        self.count += 1
+
+    def pop(self) -> Optional[Tuple[float, Union[bytes, str]]]:
+        if not self.count:
+            return None
+        self._file.seek(self._read_pos)
+        enqueued_at, is_text, length = self._HEADER.unpack(
+            self._file.read(self._HEADER.size)
+        )
+        data = self._file.read(length)
+        self._read_pos = self._file.tell()
+        self.count -= 1
+        if not self.count:
+            # 全部读回后复用文件空间 (Reuse the file once everything is read back)
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_pos = self._write_pos = 0
+        return enqueued_at, data.decode("utf-8") if is_text else data
+
+    def close(self) -> None:
+        self._file.close()
+        self.count = 0
+
+
 class WebSocketCrawler:
     """
     WebSocket 爬虫客户端 (WebSocket Crawler Client)
 
     该类提供了一个 WebSocket 客户端，可以通过 WebSocket 协议连接到服务器，接收和发送消息。它支持代理、超时控制、连接和消息的处理等功能。
 
+    接收循环只负责把帧放入有界队列，解析、回调与转发由处理协程完成，处理较慢时不会阻塞 `recv()`。
+    队列已满时按 overflow 策略处理：drop_oldest 丢弃最早的帧，block 暂停接收，
+    spill 将帧写入磁盘并在队列有空位后按顺序读回。
+
+    默认只有一个处理协程，ACK、回调与转发的顺序与帧的到达顺序一致。workers 大于 1 时帧会并发处理，
+    顺序不再保证，只适合回调较慢且不关心顺序的场景。
+
     类属性:
     - websocket (websockets.WebSocketClientProtocol): WebSocket 客户端实例。
     - wss_headers (dict): 自定义 WebSocket 请求头信息。
     - proxy (websockets_proxy.Proxy): 代理设置，用于 WebSocket 连接。
     - callbacks (dict): 存储 WebSocket 回调函数的字典。
     - timeout (int): WebSocket 接收消息的超时时间。
+    - queue_size (int): 消息队列容量。
+    - workers (int): 消息处理协程数量。
+    - overflow (str): 队列已满时的策略，drop_oldest、block 或 spill。
+    - stats (WebSocketQueueStats): 队列深度、等待时间与丢弃数量等计数。
+    - live_ended (bool): 是否收到直播结束的通知，为 True 时 receive_messages 返回 "ended"。
+    - cursor (str): 已处理的最新一帧的续传 cursor。
+    - internal_ext (str): 已处理的最新一帧的内部扩展参数。
 
     类方法:
     - connect_websocket: 连接到指定的 WebSocket 服务器。
-    - receive_messages: 接收 WebSocket 消息并进行处理。
+    - receive_messages: 接收 WebSocket 消息并放入队列，由处理协程调用 on_message。
+    - end_live: 标记直播已结束并关闭连接。
+    - record_resume: 记录续传位置，只接受更新的帧。
+    - queue_depth (property): 当前积压的帧数量（含磁盘）。
     - close_websocket: 关闭 WebSocket 连接。
     - on_message: 处理接收到的消息。
     - on_error: 处理 WebSocket 错误消息。
@@ -575,6 +781,9 @@ class WebSocketCrawler:
         callbacks: dict = None,
         timeout: int = 10,
         proxy: str = None,
+        queue_size: int = WSS_QUEUE_SIZE,
+        workers: int = WSS_WORKERS,
+        overflow: str = "drop_oldest",
     ):
         """
         初始化 WebSocketCrawler 实例
@@ -583,12 +792,38 @@ class WebSocketCrawler:
             wss_headers: WebSocket 连接头信息
             callbacks: WebSocket 回调函数
             timeout: WebSocket 超时时间
+            queue_size: 消息队列容量
+            workers: 消息处理协程数量
+            overflow: 队列已满时的策略，drop_oldest、block 或 spill
         """
+        if overflow not in WSS_OVERFLOW_POLICIES:
+            raise ValueError(
+                _("未知的队列溢出策略：{0}，可选：{1}").format(
+                    overflow, ", ".join(WSS_OVERFLOW_POLICIES)
+                )
+            )
+
         self.websocket = None
         self.wss_headers = wss_headers
         self.proxy = websockets_proxy.Proxy.from_url(proxy) if proxy else None
         self.callbacks = callbacks or {}  # 存储回调函数
         self.timeout = timeout
+        self.queue_size = max(1, queue_size)
+        self.workers = max(1, workers)
+        self.overflow = overflow
+        self.stats = WebSocketQueueStats()
+        self.live_ended = False
+        self.cursor = ""
+        self.internal_ext = ""
+        # 已取出的帧数与续传位置对应的帧序号 (Frames taken and the resume frame's number)
+        self._taken = 0
+        self._resume_seq = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._spill: Optional[FrameSpill] = None
+        self._spill_ready: Optional[asyncio.Event] = None
+        # 已从磁盘读出、等待放回队列的帧 (Frame read back from disk, waiting for a slot)
+        self._spill_holding = False
+        self._worker_tasks = []
 
     async def connect_websocket(
         self,
@@ -651,6 +886,47 @@ class WebSocketCrawler:
             _("[ReceiveMessages] [⏱ 消息等待超时：{0} 秒]").format(self.timeout)
         )
 
+        self._start_workers()
+        try:
+            result = await self._receive_loop()
+        finally:
+            await self._stop_workers()
+
+        # 处理消息时收到了关播通知 (A stream-end notice arrived while processing)
+        return "ended" if self.live_ended else result
+
+    async def end_live(self) -> None:
+        """
+        标记直播已结束并关闭连接，接收循环随之退出
+        (Mark the stream as ended and close the connection so the receive loop exits)
+        """
+        if self.live_ended:
+            return
+        self.live_ended = True
+        logger.info(_("[EndLive] [🔚 收到直播结束通知] | [关闭 WebSocket 连接]"))
+        await self.close_websocket()
+
+    def record_resume(self, cursor: str, internal_ext: str) -> None:
+        """
+        记录续传位置。多个处理协程并发时只接受比已记录的帧更晚到达的帧，
+        重连时不会回退到已处理过的旧 cursor 而重复收到弹幕
+        (Record the resume position; with concurrent workers only a frame that
+        arrived later than the recorded one may replace it, so a reconnect never
+        resumes behind frames already handled)
+
+        Args:
+            cursor (str): 帧中的 cursor，为空时保留原值 (Frame cursor, kept when empty)
+            internal_ext (str): 帧中的内部扩展参数 (Frame internal_ext)
+        """
+        seq = _FRAME_SEQ.get()
+        if seq is not None:
+            if seq < self._resume_seq:
+                return
+            self._resume_seq = seq
+        self.cursor = cursor or self.cursor
+        self.internal_ext = internal_ext or self.internal_ext
+
+    async def _receive_loop(self):
         timeout_count = 0
 
         while True:
@@ -659,13 +935,16 @@ class WebSocketCrawler:
                     self.websocket.recv(), timeout=self.timeout
                 )
                 # 为wss连接设置10秒超时机制
-                timestamp = timestamp_2_str(time.time(), "%Y-%m-%d %H:%M:%S")
-                logger.info(
-                    _("[ReceiveMessages] | [⏳ 接收消息 {0}]").format(timestamp)
+                # 每帧都会经过这里，按间隔限流并在输出时才格式化时间
+                # (Runs for every frame: rate-limited, timestamp formatted only when emitted)
+                lazy_logger.info(
+                    N_("[ReceiveMessages] | [⏳ 接收消息 {0}]"),
+                    LazyValue(timestamp_2_str, time.time(), "%Y-%m-%d %H:%M:%S"),
+                    interval=WSS_LOG_INTERVAL,
                 )
 
                 timeout_count = 0  # 重置超时计数
-                await self.on_message(message)
+                await self._enqueue_message(message)
 
             except asyncio.TimeoutError:
                 timeout_count += 1
@@ -709,6 +988,132 @@ class WebSocketCrawler:
                 )
                 return "error"
 
+    @property
+    def queue_depth(self) -> int:
+        depth = self._queue.qsize() if self._queue is not None else 0
+        if self._spill is not None:
+            depth += self._spill.count + self._spill_holding
+        return depth
+
+    def _start_workers(self) -> None:
+        """
+        创建消息队列并启动处理协程 (Create the queue and start the workers)
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [
+            asyncio.create_task(self._message_worker()) for _i in range(self.workers)
+        ]
+        if self.overflow == "spill":
+            self._spill = FrameSpill()
+            self._spill_ready = asyncio.Event()
+            self._worker_tasks.append(asyncio.create_task(self._spill_drainer()))
+
+    async def _stop_workers(self) -> None:
+        """
+        等待积压的帧处理完毕后停止处理协程
+        (Give queued frames a chance to finish, then stop the workers)
+        """
+        # 也等待正在处理的帧，避免其续传位置丢失 (Also wait for frames in progress)
+        if self._queue is not None:
+            drained = asyncio.ensure_future(self._drain())
+            try:
+                await asyncio.wait({drained}, timeout=self.timeout)
+            finally:
+                drained.cancel()
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+        logger.debug(
+            _("[ReceiveMessages] [📊 消息队列统计] | [{0}]").format(
+                self.stats.as_dict()
+            )
+        )
+
+    async def _drain(self) -> None:
+        await self._queue.join()
+        while self.queue_depth:
+            await self._queue.join()
+            await asyncio.sleep(0)
+
+    async def _enqueue_message(self, message: Union[bytes, str]) -> None:
+        """
+        将接收到的帧放入队列，队列已满时按 overflow 策略处理
+        (Queue a received frame, applying the overflow policy when full)
+
+        Args:
+            message: WebSocket 消息
+        """
+        self.stats.received += 1
+        item = (time.monotonic(), message)
+
+        if self.overflow == "spill" and (
+            self._spill.count or self._spill_holding or self._queue.full()
+        ):
+            # 磁盘中还有帧时继续写入磁盘以保持顺序 (Keep order while frames are on disk)
+            self._spill.push(*item)
+            self.stats.spilled += 1
+            self._spill_ready.set()
+        elif self.overflow == "block":
+            await self._queue.put(item)
+        else:
+            if self._queue.full():
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.stats.dropped += 1
+                lazy_logger.warning(
+                    N_("[ReceiveMessages] [⚠️ 队列已满，丢弃最早的消息] | [丢弃：{0}]"),
+                    self.stats.dropped,
+                    interval=WSS_LOG_INTERVAL,
+                )
+            self._queue.put_nowait(item)
+
+        self.stats.record_depth(self.queue_depth)
+
+    async def _spill_drainer(self) -> None:
+        """
+        将磁盘中的帧按顺序读回队列 (Move spilled frames back into the queue in order)
+        """
+        while True:
+            item = self._spill.pop()
+            if item is None:
+                self._spill_ready.clear()
+                await self._spill_ready.wait()
+                continue
+            self._spill_holding = True
+            try:
+                await self._queue.put(item)
+            finally:
+                self._spill_holding = False
+
+    async def _message_worker(self) -> None:
+        """
+        从队列中取出帧并调用 on_message (Take frames off the queue and call on_message)
+        """
+        while True:
+            enqueued_at, message = await self._queue.get()
+            self.stats.record_lag(time.monotonic() - enqueued_at)
+            # 队列先进先出，取出顺序即到达顺序 (The queue is FIFO: take order is arrival order)
+            self._taken += 1
+            _FRAME_SEQ.set(self._taken)
+            try:
+                await self.on_message(message)
+            except Exception as exc:
+                self.stats.failed += 1
+                trace_logger.error(traceback.format_exc())
+                logger.error(
+                    _("[ReceiveMessages] [⚠️ 消息处理错误] | [错误：{0}]").format(exc)
+                )
+            finally:
+                self.stats.processed += 1
+                self._queue.task_done()
+
     async def close_websocket(self):
         """
         关闭 WebSocket 连接
@@ -0,0 +1,185 @@
+# path: f2/crawlers/client_pool.py
+
+import httpx
+import asyncio
+import weakref
+import threading
+import importlib.util
+
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional
+
+from f2.log.logger import logger
+from f2.i18n.translator import _
+
+# 是否安装了 HTTP/2 支持库 h2 (Whether the h2 library for HTTP/2 is installed)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 每个事件循环最多保留的传输层数量 (Max transports kept per event loop)
+MAX_POOLED_TRANSPORTS = 16
+
+
+class _PoolBucket:
+    """单个事件循环的传输层池 (Transport pool of one event loop)"""
+
+    def __init__(self):
+        # 按最近使用顺序排列 (Ordered by most recent use)
+        self.transports: "OrderedDict[Hashable, httpx.AsyncHTTPTransport]" = (
+            OrderedDict()
+        )
+        # 被淘汰但可能仍在使用的传输层，关闭池时一并关闭
+        # (Evicted transports that may still be in use, closed with the pool)
+        self.retired: List[httpx.AsyncHTTPTransport] = []
+
+
+class AsyncClientPool:
+    """
+    异步 HTTP 连接池 (Async HTTP Connection Pool)
+
+    该类维护一个进程级的 `httpx.AsyncHTTPTransport` 池，按 (代理, 连接限制, 重试次数, HTTP/2) 进行区分，
+    使所有爬虫实例在整个运行期间复用同一批 TCP/TLS 连接，而不是每次请求都重新握手。
+
+    池中只共享传输层：每个爬虫使用自己的 `httpx.AsyncClient` 挂载共享的传输层，
+    请求头（包括 Cookie、msToken、ttwid 等经常变化的值）和 Cookie 容器都只属于该爬虫，
+    不会出现在池键中，也不会被其他爬虫的请求带上。
+
+    由于 httpx 的连接与事件循环绑定，传输层按事件循环分组存放，事件循环关闭后对应的传输层会被丢弃。
+    每个事件循环最多保留 `MAX_POOLED_TRANSPORTS` 个传输层，超出时淘汰最久未使用的一个。
+
+    类属性:
+    - _pools (weakref.WeakKeyDictionary): 事件循环到 _PoolBucket 的映射。
+    - _unbound (_PoolBucket): 在事件循环之外创建的传输层。
+    - _lock (threading.Lock): 用于保证线程安全的锁。
+
+    类方法:
+    - make_key: 根据连接配置生成池键。
+    - acquire: 获取（或创建）与键对应的传输层。
+    - is_pooled: 判断传输层是否仍由池分发。
+    - aclose_all: 关闭当前事件循环中的全部传输层。
+
+    使用示例:
+    ```python
+        key = AsyncClientPool.make_key(proxy=None, limits=limits, retries=5)
+        transport = AsyncClientPool.acquire(key, lambda: httpx.AsyncHTTPTransport(...))
+        aclient = httpx.AsyncClient(headers=headers, mounts={"all://": transport})
+        ...
+        await AsyncClientPool.aclose_all()
+    ```
+    """
+
+    _pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    # 无事件循环时创建的传输层 (Transports created outside of an event loop)
+    _unbound: _PoolBucket = _PoolBucket()
+    _lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        proxy: Optional[str],
+        limits: httpx.Limits,
+        retries: int = 0,
+        http2: bool = False,
+    ) -> Hashable:
+        """
+        生成池键 (Build a pool key)
+
+        Args:
+            proxy (str): 代理地址 (Proxy URL)
+            limits (httpx.Limits): 连接限制 (Connection limits)
+            retries (int): 连接重试次数 (Connection retries)
+            http2 (bool): 是否启用 HTTP/2 (Whether HTTP/2 is enabled)
+
+        Returns:
+            Hashable: 池键 (Pool key)
+        """
+        return (
+            proxy,
+            (
+                limits.max_connections,
+                limits.max_keepalive_connections,
+                limits.keepalive_expiry,
+            ),
+            retries,
+            http2,
+        )
+
+    @staticmethod
+    def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    @classmethod
+    def _bucket(cls, loop: Optional[asyncio.AbstractEventLoop]) -> _PoolBucket:
+        if loop is None:
+            return cls._unbound
+
+        # 清理已关闭事件循环中的传输层 (Drop transports bound to closed event loops)
+        for stale_loop in [lp for lp in cls._pools.keys() if lp.is_closed()]:
+            cls._pools.pop(stale_loop, None)
+
+        return cls._pools.setdefault(loop, _PoolBucket())
+
+    @classmethod
+    def acquire(
+        cls, key: Hashable, factory: Callable[[], httpx.AsyncHTTPTransport]
+    ) -> httpx.AsyncHTTPTransport:
+        """
+        获取与键对应的传输层，不存在时使用 factory 创建
+        (Get the transport for the key, creating it with factory if missing)
+
+        Args:
+            key (Hashable): 池键 (Pool key)
+            factory (Callable): 传输层工厂 (Transport factory)
+
+        Returns:
+            httpx.AsyncHTTPTransport: 共享的传输层 (Shared transport)
+        """
+        with cls._lock:
+            bucket = cls._bucket(cls._current_loop())
+            transport = bucket.transports.get(key)
+            if transport is not None:
+                bucket.transports.move_to_end(key)
+                return transport
+
+            transport = factory()
+            bucket.transports[key] = transport
+            if len(bucket.transports) > MAX_POOLED_TRANSPORTS:
+                # 仍在使用的爬虫不受影响，新爬虫不会再拿到被淘汰的传输层
+                # (Crawlers still using it are unaffected, new ones get a fresh one)
+                _key, evicted = bucket.transports.popitem(last=False)
+                bucket.retired.append(evicted)
+            logger.debug(
+                _("创建共享 HTTP 传输层，当前池大小：{0}").format(
+                    len(bucket.transports)
+                )
+            )
+            return transport
+
+    @classmethod
+    def is_pooled(cls, transport: httpx.AsyncBaseTransport) -> bool:
+        """
+        判断传输层是否仍由池分发 (Check whether the pool still hands out the transport)
+        """
+        with cls._lock:
+            buckets = [cls._unbound, *cls._pools.values()]
+            return any(
+                transport is t for bucket in buckets for t in bucket.transports.values()
+            )
+
+    @classmethod
+    async def aclose_all(cls) -> None:
+        """
+        关闭当前事件循环（及未绑定事件循环）中的全部共享传输层
+        (Close all shared transports of the current and unbound event loops)
+        """
+        with cls._lock:
+            loop = cls._current_loop()
+            buckets = [cls._unbound]
+            cls._unbound = _PoolBucket()
+            if loop is not None and loop in cls._pools:
+                buckets.append(cls._pools.pop(loop))
+
+        for bucket in buckets:
+            for transport in [*bucket.transports.values(), *bucket.retired]:
+                await transport.aclose()
@@ -0,0 +1,379 @@
+# path: f2/crawlers/danmaku_archive.py
+
+import re
+import time
+import asyncio
+import sqlite3
+import importlib
+import importlib.util
+import traceback
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from f2.i18n.translator import _
+from f2.log.logger import logger, trace_logger
+from f2.utils.json_backend import dumps
+
+# 可选的归档格式 (Available archive backends)
+ARCHIVE_BACKENDS = ("sqlite", "parquet")
+# 缓冲达到该条数时立即写入 (Buffered rows that trigger a write)
+ARCHIVE_BATCH_SIZE = 5000
+# 缓冲最长保留时间（秒） (Longest time rows stay buffered, in seconds)
+ARCHIVE_FLUSH_INTERVAL = 1.0
+# 写入失败后的最大重试次数，超过后丢弃该批数据 (Retries before a failed batch is dropped)
+ARCHIVE_MAX_RETRIES = 3
+# 分区文件名中的小时格式，使用 UTC 避免夏令时重复 (Hour partition format, UTC)
+ARCHIVE_HOUR_FORMAT = "%Y%m%d%H"
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+def _partition_dir(root: Path, room_id: str) -> Path:
+    # 直播间ID只用于目录名，替换掉路径分隔符等字符 (Keep the room id path safe)
+    return root / (re.sub(r"[^\w.-]", "_", room_id) or "_")
+
+
+def _hour(ts: float) -> str:
+    return time.strftime(ARCHIVE_HOUR_FORMAT, time.gmtime(ts))
+
+
+class _SQLiteSink:
+    """
+    SQLite 分区写入，每个直播间每小时一个 WAL 模式的数据库文件
+    (SQLite partitions, one WAL database per room and hour)
+    """
+
+    suffix = ".db"
+
+    def __init__(self, root: Path, raw: bool):
+        self.root = root
+        self.raw = raw
+        self.table = "frames" if raw else "messages"
+        self._conns: Dict[Tuple[str, str], sqlite3.Connection] = {}
+
+    def _connect(self, room_id: str, hour: str) -> sqlite3.Connection:
+        conn = self._conns.get((room_id, hour))
+        if conn is not None:
+            return conn
+
+        # 进入新的小时后关闭该直播间的旧分区 (Close the room's older partitions)
+        for key in [key for key in self._conns if key[0] == room_id]:
+            self._conns.pop(key).close()
+
+        path = _partition_dir(self.root, room_id) / f"{hour}{self.suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 写入统一在一个线程中串行执行 (Writes are serialized by the archive)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if self.raw:
+            conn.execute("CREATE TABLE IF NOT EXISTS frames (ts REAL, frame BLOB)")
+        else:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages (ts REAL, method TEXT, data TEXT)"
+            )
+        self._conns[(room_id, hour)] = conn
+        return conn
+
+    def write(self, room_id: str, hour: str, rows: List[tuple]) -> None:
+        conn = self._connect(room_id, hour)
+        placeholders = "?, ?" if self.raw else "?, ?, ?"
+        with conn:
+            conn.executemany(f"INSERT INTO {self.table} VALUES ({placeholders})", rows)
+
+    def close(self) -> None:
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+
+
+class _ParquetSink:
+    """
+    Parquet 分区写入，每次写入追加一个行组，文件在换小时或关闭时完成
+    (Parquet partitions; every write appends a row group, files are finalized on
+    rotation or close)
+    """
+
+    suffix = ".parquet"
+
+    def __init__(self, root: Path, raw: bool):
+        self.pa = importlib.import_module("pyarrow")
+        self.pq = importlib.import_module("pyarrow.parquet")
+        self.root = root
+        self.raw = raw
+        if raw:
+            self.schema = self.pa.schema(
+                [("ts", self.pa.float64()), ("frame", self.pa.binary())]
+            )
+        else:
+            self.schema = self.pa.schema(
+                [
+                    ("ts", self.pa.float64()),
+                    ("method", self.pa.string()),
+                    ("data", self.pa.string()),
+                ]
+            )
+        self._writers: Dict[Tuple[str, str], Any] = {}
+
+    def _writer(self, room_id: str, hour: str):
+        writer = self._writers.get((room_id, hour))
+        if writer is not None:
+            return writer
+
+        for key in [key for key in self._writers if key[0] == room_id]:
+            self._writers.pop(key).close()
+
+        # Parquet 文件关闭后不能追加，同一小时重启时写入新的分块
+        # (Closed Parquet files cannot be appended to, so a restart starts a new chunk)
+        directory = _partition_dir(self.root, room_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        chunk = len(list(directory.glob(f"{hour}_*{self.suffix}")))
+        path = directory / f"{hour}_{chunk:03d}{self.suffix}"
+        writer = self._writers[(room_id, hour)] = self.pq.ParquetWriter(
+            path, self.schema
+        )
+        return writer
+
+    def write(self, room_id: str, hour: str, rows: List[tuple]) -> None:
+        columns = list(zip(*rows))
+        table = self.pa.Table.from_arrays(
+            [
+                self.pa.array(column, type=field.type)
+                for column, field in zip(columns, self.schema)
+            ],
+            schema=self.schema,
+        )
+        self._writer(room_id, hour).write_table(table)
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+class DanmakuArchive:
+    """
+    直播弹幕归档 (Live Danmaku Archive)
+
+    缓冲 WebSocket 爬虫解码后的消息并批量追加到磁盘，按直播间与小时（UTC）分区：
+    `<root>/<room_id>/<YYYYMMDDHH>.db`。默认使用 WAL 模式的 SQLite 与 executemany，
+    安装 pyarrow 时可选 Parquet，每批写入一个行组。raw 模式改为保存未解码的
+    PushFrame 字节，可通过 `read_frames` 读取后交给 `handle_wss_message` 回放。
+
+    追加只是把元组放入缓冲区，序列化与写盘在后台线程中分批完成，不阻塞接收循环；
+    多个直播间（如 DanmakuSupervisor）可以共用同一个实例。写入失败时未写入的行放回缓冲区
+    前端，间隔 flush_interval 后重试，连续失败超过 max_retries 次才丢弃并计入 dropped。
+
+    类属性:
+    - root (Path): 归档根目录。
+    - backend (str): 归档格式，sqlite 或 parquet。
+    - raw (bool): 是否保存原始帧。
+    - batch_size (int): 触发写入的缓冲条数。
+    - flush_interval (float): 缓冲最长保留时间（秒）。
+    - max_retries (int): 写入失败后的最大重试次数。
+    - written (int): 已写入的条数。
+    - batches (int): 已执行的写入批次。
+    - dropped (int): 重试后仍写入失败而丢弃的条数。
+
+    类方法:
+    - append: 缓冲一条解码后的消息。
+    - append_frame: 缓冲一帧原始数据。
+    - flush: 立即写入缓冲区。
+    - close: 写入剩余数据并关闭全部分区文件。
+    - read_frames: 按顺序读取 SQLite 分区中的原始帧。
+
+    使用示例:
+    ```python
+        async with DanmakuArchive("Download/danmaku", raw=True) as archive:
+            await handler.fetch_live_danmaku_rooms(rooms, archive=archive)
+    ```
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        backend: str = "sqlite",
+        raw: bool = False,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        flush_interval: float = ARCHIVE_FLUSH_INTERVAL,
+        max_retries: int = ARCHIVE_MAX_RETRIES,
+    ):
+        if backend not in ARCHIVE_BACKENDS:
+            raise ValueError(f"Unknown archive backend: {backend}")
+        if backend == "parquet" and not PYARROW_AVAILABLE:
+            raise ValueError("Archive backend parquet requires pyarrow")
+
+        self.root = Path(root)
+        self.backend = backend
+        self.raw = raw
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self._failures = 0
+        self._sink = (_ParquetSink if backend == "parquet" else _SQLiteSink)(
+            self.root, raw
+        )
+        self._buffer: List[tuple] = []
+        self._write_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timer_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def append(self, room_id: str, method: str, data: Any) -> None:
+        """
+        缓冲一条解码后的消息 (Buffer one decoded message)
+
+        Args:
+            room_id (str): 直播间ID (Room id)
+            method (str): 消息类型 (Message method)
+            data (Any): 回调返回的数据 (Callback result)
+        """
+        if not self.raw:
+            self._push((room_id, time.time(), method, data))
+
+    def append_frame(self, room_id: str, frame: bytes) -> None:
+        """
+        缓冲一帧未解码的 PushFrame (Buffer one undecoded PushFrame)
+
+        Args:
+            room_id (str): 直播间ID (Room id)
+            frame (bytes): WebSocket 帧 (WebSocket frame)
+        """
+        if self.raw:
+            self._push((room_id, time.time(), frame))
+
+    def _push(self, row: tuple) -> None:
+        if self._closed:
+            return
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self._schedule(0)
+        elif self._timer_task is None:
+            self._schedule(self.flush_interval)
+
+    def _schedule(self, delay: float) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            # 正在写入时由其结束后检查缓冲 (The running write re-checks the buffer)
+            return
+        if delay:
+            self._timer_task = asyncio.create_task(self._flush_later(delay))
+        else:
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer_task = None
+        self._schedule(0)
+
+    async def flush(self) -> None:
+        """
+        立即写入缓冲区 (Write the buffer now)
+        """
+        async with self._write_lock:
+            while self._buffer:
+                batch, self._buffer = self._buffer, []
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception as exc:
+                    trace_logger.error(traceback.format_exc())
+                    logger.error(
+                        _(
+                            "[DanmakuArchive] [❌ 弹幕归档写入失败] | [错误：{0}]"
+                        ).format(exc)
+                    )
+                    self._failures += 1
+                    if self._failures > self.max_retries:
+                        self._failures = 0
+                        self.dropped += len(batch)
+                        logger.error(
+                            _(
+                                "[DanmakuArchive] [🗑️ 多次重试失败，丢弃弹幕] | [条数：{0}]"
+                            ).format(len(batch))
+                        )
+                        continue
+
+                    # 未写入的行放回缓冲区前端，保持顺序 (Requeue in front, keep order)
+                    self._buffer[:0] = batch
+                    if self._closed:
+                        # 关闭时立即重试，直到写入或丢弃 (Retry now while closing)
+                        continue
+                    if self._timer_task is None:
+                        self._timer_task = asyncio.create_task(
+                            self._flush_later(self.flush_interval)
+                        )
+                    return
+                self._failures = 0
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        # 写入失败时 batch 只保留尚未写入的分区的行，避免重试时重复写入
+        # (On failure, batch keeps only rows of unwritten partitions, so a retry
+        # does not write them twice)
+        partitions: Dict[Tuple[str, str], List[tuple]] = {}
+        for row in batch:
+            partitions.setdefault((row[0], _hour(row[1])), []).append(row)
+
+        try:
+            for room_id, hour in list(partitions):
+                rows = partitions[(room_id, hour)]
+                if self.raw:
+                    values = [(ts, frame) for _room_id, ts, frame in rows]
+                else:
+                    values = [
+                        (ts, method, data if isinstance(data, str) else dumps(data))
+                        for _room_id, ts, method, data in rows
+                    ]
+                self._sink.write(room_id, hour, values)
+                self.written += len(rows)
+                del partitions[(room_id, hour)]
+        finally:
+            if partitions:
+                batch[:] = [row for rows in partitions.values() for row in rows]
+        self.batches += 1
+
+    async def close(self) -> None:
+        """
+        写入剩余数据并关闭全部分区文件 (Flush and close every partition)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            self._timer_task = None
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
+        await asyncio.to_thread(self._sink.close)
+        logger.info(
+            _(
+                "[DanmakuArchive] [💾 弹幕归档已关闭] | [写入：{0} 条，{1} 批，丢弃：{2} 条]"
+            ).format(self.written, self.batches, self.dropped)
+        )
+
+    @staticmethod
+    def read_frames(path: Union[str, Path]) -> Iterator[Tuple[float, bytes]]:
+        """
+        按接收顺序读取 raw 模式 SQLite 分区中的帧，用于回放
+        (Read frames from a raw SQLite partition in arrival order, for replay)
+
+        Args:
+            path (Union[str, Path]): 分区文件路径 (Partition file)
+
+        Yields:
+            Tuple[float, bytes]: (接收时间, 帧数据) (Arrival time and frame)
+        """
+        conn = sqlite3.connect(path)
+        try:
+            yield from conn.execute("SELECT ts, frame FROM frames ORDER BY rowid")
+        finally:
+            conn.close()
@@ -0,0 +1,455 @@
+# path: f2/crawlers/danmaku_supervisor.py
+
+import time
+import random
+import asyncio
+import traceback
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import unquote, urlsplit
+from websockets import WebSocketServerProtocol, broadcast, serve
+from websockets.exceptions import ConnectionClosed
+
+from f2.i18n.translator import _, N_
+from f2.log.logger import lazy_logger, logger, trace_logger
+from f2.utils.json_backend import dumps
+
+# 重连退避的初始与最大等待时间（秒） (Initial and maximum reconnect backoff in seconds)
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 60.0
+# 连接持续超过该时长（秒）且收到过数据视为正常，重置退避
+# (A connection this long that received frames resets the backoff)
+DEFAULT_STABLE_AFTER = 30.0
+# 连续失败次数上限，超过后放弃该直播间，0 表示不限
+# (Consecutive failures before a room is given up, 0 for unlimited)
+DEFAULT_MAX_RETRIES = 10
+# 统计日志的输出间隔（秒） (Seconds between stats reports)
+DEFAULT_REPORT_INTERVAL = 60.0
+# 订阅全部直播间的频道 (Channel subscribed to every room)
+ALL_ROOMS_CHANNEL = ""
+
+
+class DanmakuRelayServer:
+    """
+    本地弹幕转发服务器 (Local Danmaku Relay Server)
+
+    多个直播间共用一个本地 WebSocket 服务器，按连接路径划分频道：
+    连接 `ws://host:port/<room_id>` 只接收该直播间的消息，格式与单直播间模式相同；
+    连接 `ws://host:port/` 接收全部直播间的消息，包装为 `{"room_id": ..., "data": ...}`。
+    每条消息只序列化一次，没有订阅者时不做任何处理。
+
+    类属性:
+    - host (str): 监听地址。
+    - port (int): 监听端口。
+
+    类方法:
+    - start: 启动服务器。
+    - stop: 关闭服务器。
+    - publish: 向直播间频道与全部频道转发消息。
+    - client_count: 当前连接的客户端数量。
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._channels: Dict[str, Set[WebSocketServerProtocol]] = {}
+        self._server = None
+
+    @property
+    def client_count(self) -> int:
+        return sum(len(clients) for clients in self._channels.values())
+
+    async def start(self) -> None:
+        """
+        启动本地转发服务器 (Start the relay server)
+        """
+        self._server = await serve(self._register_client, self.host, self.port)
+        logger.info(
+            _(
+                "[DanmakuRelay] [🚀本地 WebSocket 服务器已启动] ｜ 连接地址：ws://{0}:{1}/<room_id>"
+            ).format(self.host, self.port)
+        )
+
+    async def stop(self) -> None:
+        """
+        关闭本地转发服务器 (Stop the relay server)
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        logger.info(_("[DanmakuRelay] [🔒 本地 WebSocket 服务器已关闭]"))
+
+    async def _register_client(self, websocket: WebSocketServerProtocol) -> None:
+        channel = unquote(urlsplit(websocket.path).path.strip("/"))
+        clients = self._channels.setdefault(channel, set())
+        clients.add(websocket)
+        logger.info(
+            _("[DanmakuRelay] [🔗 新的客户端连接] ｜ [频道：{0}]").format(
+                channel or _("全部直播间")
+            )
+        )
+        try:
+            # 转发服务器是单向的，客户端发来的消息按设计忽略，只读取以便及时感知断开
+            # (The relay is one-way: client messages are ignored by design and only
+            # drained so a disconnect is noticed promptly)
+            async for _message in websocket:
+                pass
+        except ConnectionClosed:
+            pass
+        finally:
+            clients.discard(websocket)
+            if not clients and self._channels.get(channel) is clients:
+                del self._channels[channel]
+
+    def publish(self, room_id: str, message: Any) -> None:
+        """
+        转发一条消息 (Relay one message)
+
+        Args:
+            room_id (str): 直播间ID，即频道名 (Room id, used as the channel)
+            message (Any): 字符串或可序列化为 JSON 的对象 (str or JSON-serializable object)
+        """
+        room_clients = self._channels.get(room_id)
+        all_clients = self._channels.get(ALL_ROOMS_CHANNEL)
+        if not room_clients and not all_clients:
+            return
+
+        text = message if isinstance(message, str) else dumps(message)
+        if room_clients:
+            broadcast(room_clients, text)
+        if all_clients:
+            data = dumps(message) if isinstance(message, str) else text
+            broadcast(
+                all_clients, '{"room_id":' + dumps(room_id) + ',"data":' + data + "}"
+            )
+
+
+class DanmakuRoom:
+    """
+    受监控的直播间 (Supervised Live Room)
+
+    保存重连时续传所需的 cursor 与 internal_ext，以及该直播间的累计统计。
+    连接函数在连接期间调用 `attach`，结束后调用 `detach` 以更新续传位置。
+
+    类属性:
+    - room_id (str): 直播间ID。
+    - cursor (str): 已处理的最新一帧的弹幕 cursor。
+    - internal_ext (str): 已处理的最新一帧的内部扩展参数。
+    - extra (dict): 平台相关的连接参数，如 user_unique_id、wrss。
+    - state (str): 当前状态，connecting、connected、waiting、ended 或 failed。
+    - connections (int): 建立连接的次数。
+    - reconnects (int): 重连次数。
+    - frames (int): 已断开的连接累计接收的帧数量。
+    - messages (int): 已断开的连接累计解析的消息数量。
+
+    类方法:
+    - attach: 记录当前连接的爬虫。
+    - detach: 断开后累计统计并更新续传位置。
+    - snapshot: 返回统计字典。
+    """
+
+    def __init__(
+        self, room_id: str, cursor: str = "", internal_ext: str = "", **extra: Any
+    ):
+        self.room_id = room_id
+        self.cursor = cursor
+        self.internal_ext = internal_ext
+        self.extra = extra
+        self.state = "connecting"
+        self.connections = 0
+        self.reconnects = 0
+        self.frames = 0
+        self.messages = 0
+        self.crawler = None
+        self.started_at = time.monotonic()
+        # 上次统计时的 (时间, 消息数)，用于计算速率 (Mark used for the message rate)
+        self._rate_mark = (self.started_at, 0)
+
+    def attach(self, crawler) -> None:
+        """
+        记录当前连接的爬虫 (Track the connected crawler)
+
+        Args:
+            crawler (WebSocketCrawler): 当前连接 (Current connection)
+        """
+        self.crawler = crawler
+        self.connections += 1
+        self.state = "connected"
+
+    def detach(self, crawler) -> None:
+        """
+        累计统计并更新续传位置 (Fold in the stats and remember the resume position)
+
+        Args:
+            crawler (WebSocketCrawler): 已断开的连接 (Closed connection)
+        """
+        self.frames += crawler.stats.received
+        self.messages += crawler.stats.messages
+        self.cursor = getattr(crawler, "cursor", None) or self.cursor
+        self.internal_ext = getattr(crawler, "internal_ext", None) or self.internal_ext
+        if self.crawler is crawler:
+            self.crawler = None
+
+    def _totals(self) -> tuple:
+        frames, messages = self.frames, self.messages
+        if self.crawler is not None:
+            frames += self.crawler.stats.received
+            messages += self.crawler.stats.messages
+        return frames, messages
+
+    def snapshot(self, advance: bool = False) -> dict:
+        """
+        返回直播间统计 (Return the room stats)
+
+        Args:
+            advance (bool): 是否推进速率统计窗口 (Start a new rate window)
+
+        Returns:
+            dict: 统计数据 (Stats)
+        """
+        now = time.monotonic()
+        frames, messages = self._totals()
+        mark_time, mark_messages = self._rate_mark
+        window = now - mark_time
+        if advance:
+            self._rate_mark = (now, messages)
+
+        return {
+            "state": self.state,
+            "connections": self.connections,
+            "reconnects": self.reconnects,
+            "frames": frames,
+            "messages": messages,
+            "messages_per_second": (
+                (messages - mark_messages) / window if window > 0 else 0.0
+            ),
+            "queue_depth": self.crawler.queue_depth if self.crawler else 0,
+            "uptime": now - self.started_at,
+        }
+
+
+RoomConnector = Callable[[DanmakuRoom, DanmakuRelayServer], Awaitable[Optional[str]]]
+
+
+class DanmakuSupervisor:
+    """
+    多直播间弹幕监控 (Multi-room Danmaku Supervisor)
+
+    在同一个事件循环中同时维持多个直播间的弹幕连接，所有直播间共用一个本地转发服务器，
+    每个直播间一个频道。连接断开后按指数退避（带随机抖动）重连，并使用最近收到的
+    cursor 与 internal_ext 续传；连接持续超过 stable_after 秒且收到过数据后退避重置，
+    连续失败超过 max_retries 次或连接函数返回 "ended" 时停止该直播间。
+
+    连接函数由各平台的 Handler 提供，负责创建带有 relay 与 channel 的 WebSocket 爬虫、
+    调用 `room.attach` / `room.detach` 并返回 `fetch_live_danmaku` 的结果；
+    收到关播通知或确认直播间已关播时返回 "ended"。
+
+    类属性:
+    - connect (Callable): 连接函数 `async (room, relay) -> str`。
+    - relay (DanmakuRelayServer): 本地转发服务器。
+    - rooms (dict): 直播间ID到 DanmakuRoom 的映射。
+    - backoff_base / backoff_max (float): 重连退避的初始与最大等待时间（秒）。
+    - stable_after (float): 视为正常连接的持续时间（秒），期间须收到数据。
+    - max_retries (int): 连续失败次数上限，0 表示不限。
+    - report_interval (float): 统计日志的输出间隔（秒）。
+
+    类方法:
+    - add_room: 添加直播间，运行中添加会立即连接。
+    - remove_room: 停止并移除直播间。
+    - run: 启动转发服务器并监控所有直播间，直到全部结束。
+    - stats: 返回每个直播间的统计。
+
+    使用示例:
+    ```python
+        supervisor = DanmakuSupervisor(connect, "localhost", 8080)
+        for room in rooms:
+            supervisor.add_room(room["room_id"], room["cursor"], room["internal_ext"])
+        stats = await supervisor.run()
+    ```
+    """
+
+    def __init__(
+        self,
+        connect: RoomConnector,
+        host: str,
+        port: int,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        stable_after: float = DEFAULT_STABLE_AFTER,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        report_interval: float = DEFAULT_REPORT_INTERVAL,
+    ):
+        self.connect = connect
+        self.relay = DanmakuRelayServer(host, port)
+        self.rooms: Dict[str, DanmakuRoom] = {}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.max_retries = max_retries
+        self.report_interval = report_interval
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running = False
+
+    def add_room(
+        self, room_id: str, cursor: str = "", internal_ext: str = "", **extra: Any
+    ) -> DanmakuRoom:
+        """
+        添加直播间 (Add a room)
+
+        Args:
+            room_id (str): 直播间ID (Room id)
+            cursor (str): 弹幕 cursor (Danmaku cursor)
+            internal_ext (str): 内部扩展参数 (Internal extension)
+            **extra: 平台相关的连接参数 (Platform specific parameters)
+
+        Returns:
+            DanmakuRoom: 直播间 (Room)
+        """
+        room_id = str(room_id)
+        if room_id in self.rooms:
+            return self.rooms[room_id]
+
+        room = self.rooms[room_id] = DanmakuRoom(room_id, cursor, internal_ext, **extra)
+        if self._running:
+            self._start_room(room)
+        return room
+
+    async def remove_room(self, room_id: str) -> None:
+        """
+        停止并移除直播间 (Stop and remove a room)
+
+        Args:
+            room_id (str): 直播间ID (Room id)
+        """
+        room_id = str(room_id)
+        task = self._tasks.pop(room_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.rooms.pop(room_id, None)
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        返回每个直播间的统计 (Per-room stats)
+
+        Returns:
+            Dict[str, dict]: 直播间ID到统计数据的映射 (Room id to stats)
+        """
+        return {room_id: room.snapshot() for room_id, room in self.rooms.items()}
+
+    def _start_room(self, room: DanmakuRoom) -> None:
+        self._tasks[room.room_id] = asyncio.create_task(self._run_room(room))
+
+    def _backoff(self, failures: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2**failures)
+        # 随机抖动，避免大量直播间同时重连 (Jitter so rooms do not reconnect in lockstep)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _run_room(self, room: DanmakuRoom) -> None:
+        failures = 0
+        while True:
+            room.state = "connecting"
+            started = time.monotonic()
+            frames_before = room.frames
+            try:
+                result = await self.connect(room, self.relay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                trace_logger.error(traceback.format_exc())
+                logger.warning(
+                    _(
+                        "[DanmakuSupervisor] [⚠️ 直播间：{0} 连接出错] | [错误：{1}]"
+                    ).format(room.room_id, exc)
+                )
+                result = "error"
+
+            if result == "ended":
+                room.state = "ended"
+                logger.info(
+                    _("[DanmakuSupervisor] [🔚 直播间：{0} 已结束直播]").format(
+                        room.room_id
+                    )
+                )
+                return
+
+            # 只有持续足够久且收到过数据的连接才重置退避，空连接超时断开仍计为失败
+            # (Only a long-lived connection that received frames resets the backoff;
+            # idle connections that time out still count as failures)
+            stable = (
+                time.monotonic() - started >= self.stable_after
+                and room.frames > frames_before
+            )
+            failures = 0 if stable else failures + 1
+            if self.max_retries and failures > self.max_retries:
+                room.state = "failed"
+                logger.warning(
+                    _(
+                        "[DanmakuSupervisor] [❌ 直播间：{0} 连续失败 {1} 次，停止重连]"
+                    ).format(room.room_id, failures)
+                )
+                return
+
+            delay = self._backoff(failures)
+            room.state = "waiting"
+            room.reconnects += 1
+            logger.info(
+                _(
+                    "[DanmakuSupervisor] [🔄 直播间：{0} 连接断开（{1}），{2:.1f} 秒后重连]"
+                ).format(room.room_id, result, delay)
+            )
+            await asyncio.sleep(delay)
+
+    async def _report_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            for room_id, room in list(self.rooms.items()):
+                stats = room.snapshot(advance=True)
+                lazy_logger.info(
+                    N_(
+                        "[DanmakuSupervisor] [📊 直播间：{0}] | [状态：{1}] [消息：{2}] "
+                        "[速率：{3:.1f} 条/秒] [积压：{4}] [重连：{5}]"
+                    ),
+                    room_id,
+                    stats["state"],
+                    stats["messages"],
+                    stats["messages_per_second"],
+                    stats["queue_depth"],
+                    stats["reconnects"],
+                )
+
+    async def run(self) -> Dict[str, dict]:
+        """
+        启动转发服务器并监控所有直播间，直到全部结束或被取消
+        (Start the relay and supervise every room until all of them stop)
+
+        Returns:
+            Dict[str, dict]: 每个直播间的最终统计 (Final per-room stats)
+        """
+        await self.relay.start()
+        self._running = True
+        for room in self.rooms.values():
+            self._start_room(room)
+        reporter = asyncio.create_task(self._report_loop())
+
+        try:
+            # 运行中可能继续添加直播间 (Rooms may still be added while running)
+            while self._tasks:
+                await asyncio.wait(
+                    list(self._tasks.values()), return_when=asyncio.FIRST_COMPLETED
+                )
+                for room_id, task in list(self._tasks.items()):
+                    if task.done():
+                        del self._tasks[room_id]
+        finally:
+            self._running = False
+            tasks = [reporter, *self._tasks.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks.clear()
+            await self.relay.stop()
+
+        return self.stats()
@@ -1,9 +1,42 @@
 # path: f2/db/base_db.py
 
+import os
+import json
 import asyncio
+import weakref
 import aiosqlite
+import threading
 
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set
+
+from f2.log.logger import logger
+from f2.i18n.translator import _
+
+
+class _ConnectionLock:
+    """
+    连接锁，持有锁的任务可以重入，其他任务的语句与提交需等待其释放
+    (Connection lock; the holding task may re-enter, other tasks wait for it)
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._owner: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        task = asyncio.current_task()
+        if self._owner is task:
+            yield
+            return
+
+        async with self._lock:
+            self._owner = task
+            try:
+                yield
+            finally:
+                self._owner = None
 
 
 class BaseDB:
@@ -13,11 +46,24 @@ class BaseDB:
     该类提供了一个异步数据库连接管理器，封装了与 SQLite 数据库的连接、查询、数据操作及版本控制等功能。
     支持高并发任务限制、自动重试机制和数据库版本迁移。
 
+    默认情况下同一数据库文件在每个事件循环内只打开一个共享连接，`async with` 退出时只提交不关闭，
+    避免每次读写都重新启动 aiosqlite 线程、执行 PRAGMA 与建表语句。运行结束时调用 `close_all` 关闭；
+    连接与事件循环绑定，事件循环关闭后对应的共享连接会被丢弃。
+
+    共享连接上的每条语句与提交都经过同一把连接锁。多语句事务 (`transaction`) 执行期间持有该锁，
+    其他使用者的语句与提交会等待事务结束，因此事务回滚时不会撤销其他任务的写入，
+    其他任务也不会提交进行到一半的事务。
+
     类属性:
     - db_name (str): 数据库名称。
     - conn (aiosqlite.Connection | None): 数据库连接实例，初始化时为 None。
     - semaphore (asyncio.Semaphore): 用于限制并发任务数的信号量。
     - max_retries (int): 最大重试次数，用于处理数据库锁定问题。
+    - batch_size (int): `bulk_insert` 每个事务写入的行数。
+    - shared (bool): 是否使用进程级共享连接，默认为 True。
+    - _shared_conns (weakref.WeakKeyDictionary): 事件循环到 {数据库路径: 共享连接} 字典的映射。
+    - _conn_locks (weakref.WeakKeyDictionary): 事件循环到 {数据库路径: 连接锁} 字典的映射。
+    - _created_tables (dict): 数据库路径到已建表的类名集合的映射。
 
     类方法:
     - __init__: 初始化数据库连接管理器，并设置数据库名称。
@@ -26,10 +72,15 @@ class BaseDB:
     - get_version: 获取数据库的当前版本号。如果没有设置版本，返回 0。
     - set_version: 设置数据库的版本号，若该版本已存在则更新。
     - execute: 执行 SQL 查询并返回查询的光标。可以接收查询参数。
+    - executemany: 使用同一条语句批量执行多组参数。
+    - transaction: 在连接锁内以保存点执行多语句事务，出错时只回滚该事务。
     - fetch_one: 执行 SQL 查询并返回一个结果。
     - fetch_all: 执行 SQL 查询并返回所有结果。
+    - get_columns: 获取数据表的列名。
+    - bulk_insert: 合并多行的列后批量写入（支持 upsert），每批一个事务。
     - commit: 提交数据库更改，保存数据。
-    - close: 关闭与数据库的连接。
+    - close: 关闭与数据库的连接（共享连接只提交不关闭）。
+    - close_all: 关闭当前事件循环中的全部共享连接。
     - migrate: 提供数据库迁移的基础接口，子类可以实现特定的迁移策略。
 
     异常处理:
@@ -58,28 +109,91 @@ class BaseDB:
     ```
     """
 
+    _shared_conns: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    _conn_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    _created_tables: Dict[str, Set[str]] = {}
+    _lock: threading.Lock = threading.Lock()
+
     def __init__(self, db_name: str, **kwargs) -> Optional[None]:
         self.db_name = db_name
         self.conn = None
         self.semaphore = asyncio.Semaphore(kwargs.get("max_tasks", 10))
         self.max_retries = kwargs.get("max_retries", 5)
+        self.batch_size = kwargs.get("batch_size", 500)
+        self._columns: Dict[str, List[str]] = {}
+        self._conn_lock: Optional[_ConnectionLock] = None
+        # 内存数据库每次连接都是独立的 (In-memory databases are never shared)
+        self.shared = kwargs.get("shared_connection", True) and db_name != ":memory:"
 
     async def connect(self) -> Optional[None]:
         """
-        连接到数据库
+        连接到数据库，共享模式下复用进程内已打开的连接，每个表类只建表一次
+        """
+        if not self.shared:
+            self.conn = await self._open_connection()
+            self._conn_lock = _ConnectionLock()
+            await self._create_table()
+            return
+
+        key = os.path.abspath(self.db_name)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            conn = self._bucket(self._shared_conns, loop).get(key)
+
+        if conn is None:
+            conn = await self._open_connection()
+            with self._lock:
+                existing = self._bucket(self._shared_conns, loop).setdefault(key, conn)
+            if existing is not conn:
+                # 并发连接时只保留先注册的连接 (Keep the first registered connection)
+                await conn.close()
+                conn = existing
+            else:
+                logger.debug(_("打开共享数据库连接：{0}").format(key))
+
+        self.conn = conn
+        with self._lock:
+            self._conn_lock = self._bucket(self._conn_locks, loop).setdefault(
+                key, _ConnectionLock()
+            )
+
+        table_key = type(self).__qualname__
+        with self._lock:
+            created = table_key in self._created_tables.setdefault(key, set())
+        if not created:
+            await self._create_table()
+            with self._lock:
+                self._created_tables[key].add(table_key)
+
+    @staticmethod
+    def _bucket(
+        mapping: weakref.WeakKeyDictionary, loop: asyncio.AbstractEventLoop
+    ) -> dict:
+        # 丢弃已关闭事件循环中的连接与锁 (Drop entries of closed event loops)
+        for stale_loop in [lp for lp in mapping.keys() if lp.is_closed()]:
+            mapping.pop(stale_loop, None)
+        return mapping.setdefault(loop, {})
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """
+        打开新的数据库连接
 
         - 启用 WAL 模式，提高并发读写性能。
         - 设置 `synchronous` 为 `NORMAL`，降低同步写操作的延迟。
         - 增加缓存大小，提高查询速度。
         - 将临时表存储在内存中，加快查询速度。
         """
-        self.conn = await aiosqlite.connect(self.db_name)
+        conn = aiosqlite.connect(self.db_name)
+        # 共享连接可能在运行结束前未被关闭，不能阻塞解释器退出
+        # (A shared connection must not block interpreter exit if left open)
+        conn.daemon = True
+        self.conn = await conn
         await self.conn.execute("PRAGMA journal_mode=WAL;")  # 启用 WAL 模式
         await self.conn.execute("PRAGMA synchronous = NORMAL;")  # 优化性，,减少同步开销
         await self.conn.execute("PRAGMA cache_size = 10000;")  # 增加缓存大小
         await self.conn.execute("PRAGMA temp_store = MEMORY;")  # 临时表存储在内存中
         # await self.conn.execute("PRAGMA locking_mode = EXCLUSIVE;")  # 限制数据库独占锁模式
-        await self._create_table()
+        return self.conn
 
     async def _create_table(self) -> Optional[None]:
         """
@@ -109,6 +223,7 @@ class BaseDB:
         执行SQL查询，并增加重试机制以处理潜在的锁定问题。
 
         - 支持异步任务的信号量控制，限制最大并发查询数。
+        - 其他任务的事务进行中时等待其结束。
         - 在发生 `OperationalError` 时自动重试，最多重试 `max_retries` 次。
 
         Args:
@@ -121,7 +236,7 @@ class BaseDB:
         for attempt in range(self.max_retries):
             try:
                 cursor = await self.conn.cursor()
-                async with self.semaphore:
+                async with self._conn_lock.hold(), self.semaphore:
                     if parameters:
                         await cursor.execute(query, parameters)
                     else:
@@ -133,6 +248,58 @@ class BaseDB:
                 else:
                     raise
 
+    async def executemany(
+        self, query: str, parameters: Iterable[Sequence[Any]]
+    ) -> aiosqlite.Cursor:
+        """
+        使用同一条语句批量执行多组参数，重试机制与 `execute` 相同。
+
+        Args:
+            query (str): SQL查询
+            parameters (Iterable[Sequence]): 多组SQL参数
+
+        Returns:
+            aiosqlite.Cursor: 查询的光标
+        """
+        parameters = list(parameters)
+        for attempt in range(self.max_retries):
+            try:
+                cursor = await self.conn.cursor()
+                async with self._conn_lock.hold(), self.semaphore:
+                    await cursor.executemany(query, parameters)
+                return cursor
+            except aiosqlite.OperationalError as e:
+                if "database is locked" in str(e) and attempt < self.max_retries - 1:
+                    await asyncio.sleep(0.1 * (attempt + 1))  # 指数级退避
+                else:
+                    raise
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        在连接锁内执行多语句事务，成功时提交，出错时回滚到保存点后重新抛出异常。
+
+        - 事务期间共享连接上其他任务的语句与提交都会等待，回滚只会撤销本事务的语句。
+        - 使用 `SAVEPOINT` / `ROLLBACK TO`，事务开始前其他任务已执行但未提交的写入不受回滚影响。
+        - 事务内不能再调用 `commit`、`close` 或嵌套 `transaction`，也不能等待其他访问该连接的任务。
+
+        使用示例:
+        ```python
+            async with db.transaction():
+                await db.executemany(query, rows)
+        ```
+        """
+        async with self._conn_lock.hold():
+            await self.execute("SAVEPOINT f2_transaction")
+            try:
+                yield
+            except BaseException:
+                await self.execute("ROLLBACK TO f2_transaction")
+                await self.execute("RELEASE f2_transaction")
+                raise
+            await self.execute("RELEASE f2_transaction")
+            await self.conn.commit()
+
     async def fetch_one(self, query: str, parameters: tuple = ()) -> tuple:
         """
         执行SQL查询并返回一个结果
@@ -161,18 +328,150 @@ class BaseDB:
         cursor = await self.execute(query, parameters)
         return await cursor.fetchall()
 
+    async def get_columns(self, table: str) -> List[str]:
+        """
+        获取数据表的列名，结果按实例缓存
+
+        Args:
+            table (str): 表名
+
+        Returns:
+            List[str]: 列名列表
+        """
+        if table not in self._columns:
+            rows = await self.fetch_all(f"PRAGMA table_info({table})")
+            self._columns[table] = [row[1] for row in rows]
+        return self._columns[table]
+
+    async def bulk_insert(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        conflict_keys: Sequence[str] = (),
+        ignore_fields: Iterable[str] = None,
+        update: bool = True,
+        batch_size: int = None,
+    ) -> int:
+        """
+        批量写入多行数据
+
+        - 各行的列取并集，缺失的值写入 NULL，表中不存在的列会被忽略。
+        - 列表与字典类型的值会序列化为 JSON 字符串。
+        - 提供 `conflict_keys` 时使用 upsert，新值为 NULL 的列保留原值；
+          否则使用 `INSERT OR REPLACE`。`update` 为 False 时只插入不存在的行。
+        - 每 `batch_size` 行在一个 `transaction` 中使用一次 `executemany` 并提交，出错时只回滚当前批次。
+
+        Args:
+            table (str): 表名
+            rows (List[dict]): 待写入的数据行
+            conflict_keys (Sequence[str]): 唯一约束列，用于 upsert
+            ignore_fields (Iterable[str]): 要忽略的字段列表
+            update (bool): 已存在的行是否更新
+            batch_size (int): 每个事务写入的行数，默认使用实例的 `batch_size`
+
+        Returns:
+            int: 写入的行数
+        """
+        if not rows:
+            return 0
+
+        ignore_fields = set(ignore_fields or [])
+        table_columns = set(await self.get_columns(table))
+
+        # 按首次出现的顺序合并各行的列 (Union columns in first-seen order)
+        columns = []
+        dropped = set()
+        for row in rows:
+            for key in row:
+                if key in ignore_fields or key in columns or key in dropped:
+                    continue
+                if key in table_columns:
+                    columns.append(key)
+                else:
+                    dropped.add(key)
+
+        if dropped:
+            logger.debug(
+                _("表 {0} 中不存在的字段已忽略：{1}").format(
+                    table, ", ".join(sorted(dropped))
+                )
+            )
+        if not columns:
+            return 0
+
+        keys = ", ".join(columns)
+        placeholders = ", ".join(["?"] * len(columns))
+        if conflict_keys and update:
+            updates = ", ".join(
+                f"{column} = COALESCE(excluded.{column}, {column})"
+                for column in columns
+                if column not in conflict_keys
+            )
+            query = (
+                f"INSERT INTO {table} ({keys}) VALUES ({placeholders}) "
+                f"ON CONFLICT({', '.join(conflict_keys)}) DO "
+                + (f"UPDATE SET {updates}" if updates else "NOTHING")
+            )
+        else:
+            verb = "INSERT OR REPLACE" if update else "INSERT OR IGNORE"
+            query = f"{verb} INTO {table} ({keys}) VALUES ({placeholders})"
+
+        def adapt(value: Any) -> Any:
+            if isinstance(value, (list, dict)):
+                return json.dumps(value, ensure_ascii=False)
+            return value
+
+        batch_size = batch_size or self.batch_size
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            async with self.transaction():
+                await self.executemany(
+                    query,
+                    (
+                        tuple(adapt(row.get(column)) for column in columns)
+                        for row in batch
+                    ),
+                )
+
+        return len(rows)
+
     async def commit(self) -> Optional[None]:
         """
-        提交更改到数据库
+        提交更改到数据库，等待进行中的事务结束后再提交
         """
-        await self.conn.commit()
+        async with self._conn_lock.hold():
+            await self.conn.commit()
 
     async def close(self) -> Optional[None]:
         """
-        关闭与数据库的连接
+        关闭与数据库的连接，共享连接只提交未保存的更改
         """
-        if self.conn:
+        if not self.conn:
+            return
+
+        if self.shared:
+            await self.commit()
+        else:
             await self.conn.close()
+        self.conn = None
+
+    @classmethod
+    async def close_all(cls) -> Optional[None]:
+        """
+        提交并关闭当前事件循环中的全部共享连接
+        (Commit and close all shared connections of the current event loop)
+        """
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            conns = list(cls._shared_conns.pop(loop, {}).values())
+            cls._conn_locks.pop(loop, None)
+            cls._created_tables.clear()
+
+        for conn in conns:
+            try:
+                await conn.commit()
+            finally:
+                await conn.close()
 
     async def migrate(self):
         """
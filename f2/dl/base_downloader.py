@@ -1,6 +1,7 @@
 # path: f2/dl/base_downloader.py
 
 import sys
+import json
 import httpx
 import asyncio
 import aiofiles
@@ -8,7 +9,7 @@ import traceback
 
 from pathlib import Path
 from rich.progress import TaskID
-from typing import Union, Optional, Any, List, Set
+from typing import Union, Optional, Any, Dict, List, Tuple
 
 from f2.log.logger import logger, trace_logger
 from f2.i18n.translator import _
@@ -18,16 +19,29 @@ from f2.utils._signal import SignalManager
 from f2.utils.utils import ensure_path
 from f2.utils._dl import (
     get_content_length,
+    parse_content_range,
     trim_filename,
     get_chunk_size,
-    get_segments_from_m3u8,
+    get_m3u8_playlist,
+    get_m3u8_poll_interval,
+    SegmentWindow,
 )
 from f2.exceptions.api_exceptions import APIRetryExhaustedError
 
-# 最大片段缓存数量，超过这个数量就会进行清理
-# (Maximum segment cache count, clear when it exceeds this count)
+# 片段去重滑动窗口的大小 (Size of the sliding window used to dedup segments)
 MAX_SEGMENT_COUNT = 1000
 
+# 分段下载的默认文件大小阈值 (Default file size threshold for segmented download)
+SEGMENTED_DOWNLOAD_THRESHOLD = 50 * 1024 * 1024
+# 每个分段的最小大小 (Minimum size of each range)
+MIN_RANGE_SIZE = 4 * 1024 * 1024
+# 每写入多少个块保存一次分段进度 (Save range progress every N chunks)
+RANGE_STATE_SAVE_INTERVAL = 16
+
+
+class _RangeNotSupported(Exception):
+    """分段请求未返回 206 响应 (A range request was not answered with 206)"""
+
 
 class BaseDownloader(BaseCrawler):
     """
@@ -45,9 +59,18 @@ class BaseDownloader(BaseCrawler):
     类方法:
     - _ensure_path: 确保目标路径存在，如果不存在则创建。
     - _download_chunks: 处理文件的分块下载，支持边下载边更新进度。
-    - download_file: 下载文件，如果文件已经部分下载，则支持断点续传。
+    - _get_content_length: 使用下载器自身的客户端探测文件大小，并按URL缓存。
+    - _resolve_content_length: 从范围请求的响应头中解析文件大小，避免额外探测。
+    - _load_ranges: 读取分段下载进度，丢弃失效或损坏的进度文件。
+    - _save_ranges: 原子地保存分段下载进度。
+    - _download_range: 下载单个字节范围并写入临时文件的对应位置。
+    - _download_segmented: 多连接分段下载大文件，支持按分段续传，服务器不支持范围请求时改为单连接下载。
+    - _download_stream: 单连接下载或续传文件到临时文件。
+    - _finalize_download: 校验临时文件大小并重命名为目标文件。
+    - download_file: 下载文件，如果文件已经部分下载，则支持断点续传；开启 segmented_download 后大文件会分段并发下载。
     - save_file: 保存静态文件到指定路径。
-    - download_m3u8_stream: 下载 m3u8 流视频，支持多个片段的下载与合并。
+    - _fetch_m3u8_segment: 下载单个 TS 片段。
+    - download_m3u8_stream: 下载 m3u8 流视频，并发预取片段并按序合并。
     - initiate_download: 初始化文件下载任务，根据文件是否存在跳过或开始下载。
     - initiate_static_download: 初始化静态文件下载任务。
     - initiate_m3u8_download: 初始化 m3u8 流视频下载任务。
@@ -81,6 +104,23 @@ class BaseDownloader(BaseCrawler):
 
         self.progress = RichConsoleManager().progress
         self.download_tasks = []
+        # 本次运行中已知的文件大小 / File sizes known during this run
+        self._content_lengths = {}
+        # 大文件分段下载（默认关闭）/ Segmented download for large files (opt-in)
+        self._segmented = bool(kwargs.get("segmented_download", False))
+        # 启用分段下载的文件大小阈值 / File size threshold for segmented download
+        self._segment_threshold = kwargs.get(
+            "segment_threshold", SEGMENTED_DOWNLOAD_THRESHOLD
+        )
+        # 每个文件的分段连接数 / Connections per segmented file
+        self._segment_connections = max(1, kwargs.get("segment_connections", 4))
+        # 每个主机的最大并发连接数 / Maximum concurrent connections per host
+        self._max_host_connections = max(1, kwargs.get("max_host_connections", 8))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # 直播流并发下载片段的工作协程数 / Concurrent workers for live stream segments
+        self._m3u8_workers = max(1, kwargs.get("m3u8_workers", 4))
+        # 直播流最多预取的片段数 / Maximum number of prefetched live stream segments
+        self._m3u8_prefetch = max(self._m3u8_workers, kwargs.get("m3u8_prefetch", 16))
 
     @staticmethod
     def _ensure_path(path: Union[str, Path]) -> Path:
@@ -88,7 +128,7 @@ class BaseDownloader(BaseCrawler):
 
     async def _download_chunks(
         self,
-        request: httpx.Request,
+        request: Union[httpx.Request, httpx.Response],
         file: Any,
         content_length: int,
         task_id: TaskID,
@@ -97,14 +137,17 @@ class BaseDownloader(BaseCrawler):
         为给定的任务ID下载块 (Download chunks for a given task ID)
 
         Args:
-            request (httpx.Request): HTTP请求对象 (HTTP request object)
+            request (Union[httpx.Request, httpx.Response]): HTTP请求对象，或已发送的流式响应
+                (HTTP request object, or an already sent streaming response)
             file: 文件对象 (File object)
             content_length (int): 内容长度 (Content length)
             task_id (TaskID): 任务ID (Task ID)
         """
 
+        response = request if isinstance(request, httpx.Response) else None
         try:
-            response = await self.aclient.send(request, stream=True)
+            if response is None:
+                response = await self.aclient.send(request, stream=True)
             async for chunk in response.aiter_bytes(get_chunk_size(content_length)):
                 if SignalManager.is_shutdown_signaled():
                     break
@@ -136,6 +179,489 @@ class BaseDownloader(BaseCrawler):
         except Exception as e:
             trace_logger.error(traceback.format_exc())
             logger.error(_("文件区块下载失败：{0} Exception：{1}").format(request, e))
+        finally:
+            if response is not None:
+                await response.aclose()
+
+    async def _get_content_length(self, url: str) -> int:
+        """
+        通过下载器自身的客户端获取文件大小，并按URL缓存
+        (Get the file size through the downloader's own client, cached per URL)
+
+        Args:
+            url (str): 文件链接 (File URL)
+
+        Returns:
+            int: 文件大小，获取失败返回0 (File size, 0 on failure)
+        """
+        if url not in self._content_lengths:
+            content_length = await get_content_length(
+                url, self.headers, self.proxies, aclient=self.aclient
+            )
+            if not content_length:
+                return 0
+            self._content_lengths[url] = content_length
+        return self._content_lengths[url]
+
+    async def _resolve_content_length(
+        self, url: str, response: httpx.Response, start_byte: int
+    ) -> Tuple[int, bool]:
+        """
+        从范围请求的响应头中解析文件总大小，无法解析时才单独探测
+        (Resolve the total size from a ranged GET response, probing only as a fallback)
+
+        Args:
+            url (str): 文件链接 (File URL)
+            response (httpx.Response): 范围请求的响应 (Response of the ranged GET)
+            start_byte (int): 请求的起始字节 (Requested start byte)
+
+        Returns:
+            Tuple[int, bool]: (文件总大小, 是否从 start_byte 续传)
+                (Total size, whether the body resumes at start_byte)
+        """
+        content_length = 0
+        resumed = False
+
+        if response.status_code in (206, 416):
+            content_length = parse_content_range(response.headers.get("Content-Range"))
+            resumed = True
+            if not content_length and response.status_code == 206:
+                partial_length = int(response.headers.get("Content-Length", 0))
+                content_length = start_byte + partial_length if partial_length else 0
+        elif response.status_code == 200:
+            # 服务器忽略了Range请求，返回完整内容 (Server ignored the Range header)
+            content_length = int(response.headers.get("Content-Length", 0))
+        else:
+            response.raise_for_status()
+
+        if content_length:
+            self._content_lengths[url] = content_length
+        else:
+            content_length = await self._get_content_length(url)
+
+        return content_length, resumed
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """
+        获取主机对应的并发连接信号量 (Get the connection semaphore of a host)
+        """
+        host = httpx.URL(url).host
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self._max_host_connections)
+        return self._host_semaphores[host]
+
+    @staticmethod
+    def _ranges_path(tmp_path: Path) -> Path:
+        """分段下载进度文件路径 (Path of the range progress file)"""
+        return tmp_path.with_suffix(".ranges")
+
+    def _load_ranges(self, tmp_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        读取分段下载进度，进度文件失效或损坏时将其删除
+        (Load the range progress, removing it when stale or corrupt)
+
+        Args:
+            tmp_path (Path): 临时文件路径 (Temp file path)
+
+        Returns:
+            Optional[Dict[str, Any]]: 分段进度，无可用进度时返回None
+                (Range progress, None when there is nothing to resume)
+        """
+        ranges_path = self._ranges_path(tmp_path)
+        if not ranges_path.exists():
+            return None
+
+        # 临时文件已丢失时进度文件失效 (The progress file is stale once the temp file is gone)
+        if not tmp_path.exists():
+            ranges_path.unlink(missing_ok=True)
+            return None
+
+        try:
+            state = json.loads(ranges_path.read_text(encoding="utf-8"))
+            content_length = int(state["content_length"])
+            ranges = [
+                [int(value) for value in byte_range] for byte_range in state["ranges"]
+            ]
+            if content_length <= 0 or any(
+                len(byte_range) != 3 for byte_range in ranges
+            ):
+                raise ValueError(state)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 预分配的临时文件大小已与完整文件一致，必须一并删除以免被误判为已完成
+            # (The preallocated temp file already has the full size, so drop it too)
+            logger.warning(
+                _("分段进度文件已损坏，重新下载：{0}（{1}）").format(ranges_path, e)
+            )
+            ranges_path.unlink(missing_ok=True)
+            tmp_path.unlink(missing_ok=True)
+            return None
+
+        return {"content_length": content_length, "ranges": ranges}
+
+    def _save_ranges(
+        self, tmp_path: Path, content_length: int, ranges: List[List[int]]
+    ) -> None:
+        """
+        原子地保存分段下载进度 (Atomically save the range progress)
+
+        先写入临时文件再替换，避免中途崩溃留下截断的进度文件
+        (Write to a temp file and replace, so a crash never leaves a truncated file)
+        """
+        ranges_path = self._ranges_path(tmp_path)
+        state_tmp = ranges_path.with_suffix(".ranges.tmp")
+        state_tmp.write_text(
+            json.dumps({"content_length": content_length, "ranges": ranges}),
+            encoding="utf-8",
+        )
+        state_tmp.replace(ranges_path)
+
+    def _can_segment(
+        self, response: httpx.Response, content_length: int, start_byte: int
+    ) -> bool:
+        """
+        判断是否使用分段下载：需开启该模式、文件足够大且服务器支持范围请求
+        (Whether to use segmented download: opt-in, large enough and ranges supported)
+        """
+        return (
+            self._segmented
+            and start_byte == 0
+            and response.status_code == 206
+            and content_length >= max(self._segment_threshold, MIN_RANGE_SIZE)
+        )
+
+    def _plan_ranges(self, content_length: int) -> List[List[int]]:
+        """
+        将文件切分为若干字节范围 (Split the file into byte ranges)
+
+        Returns:
+            List[List[int]]: [起始字节, 结束字节, 已下载字节] 列表
+                (List of [start, end, downloaded])
+        """
+        count = max(1, min(self._segment_connections, content_length // MIN_RANGE_SIZE))
+        size = -(-content_length // count)
+        return [
+            [start, min(start + size, content_length) - 1, 0]
+            for start in range(0, content_length, size)
+        ]
+
+    async def _download_range(
+        self,
+        task_id: TaskID,
+        link: str,
+        tmp_path: Path,
+        byte_range: List[int],
+        content_length: int,
+        save_state: Any,
+    ) -> bool:
+        """
+        下载单个字节范围，并写入临时文件的对应位置
+        (Download one byte range and write it at its offset in the temp file)
+
+        Args:
+            task_id (TaskID): 任务ID (Task ID)
+            link (str): 文件链接 (File URL)
+            tmp_path (Path): 临时文件路径 (Temp file path)
+            byte_range (List[int]): [起始字节, 结束字节, 已下载字节]
+            content_length (int): 文件总大小 (Total file size)
+            save_state (Callable): 保存分段进度的回调 (Callback saving range progress)
+
+        Returns:
+            bool: 该范围是否下载完成 (Whether the range is complete)
+
+        Raises:
+            _RangeNotSupported: 服务器未以 206 响应范围请求
+                (The server did not answer the range request with 206)
+        """
+        start, end, _done = byte_range
+        retry_attempts = 3  # 最大重试次数
+
+        for attempt in range(retry_attempts):
+            if byte_range[2] > end - start:
+                return True
+            if SignalManager.is_shutdown_signaled():
+                return False
+
+            offset = start + byte_range[2]
+            headers = {"Range": f"bytes={offset}-{end}"} | self.headers
+            try:
+                async with self._host_semaphore(link):
+                    request = self.aclient.build_request("GET", link, headers=headers)
+                    response = await self.aclient.send(
+                        request, stream=True, follow_redirects=True
+                    )
+                    try:
+                        if response.status_code != 206:
+                            response.raise_for_status()
+                            raise _RangeNotSupported(response.status_code)
+
+                        async with aiofiles.open(tmp_path, "r+b") as file:
+                            await file.seek(offset)
+                            chunks = 0
+                            async for chunk in response.aiter_bytes(
+                                get_chunk_size(end - start + 1)
+                            ):
+                                if SignalManager.is_shutdown_signaled():
+                                    break
+                                # 避免服务器返回超出范围的数据 (Never write past the range end)
+                                chunk = chunk[: end - start + 1 - byte_range[2]]
+                                await file.write(chunk)
+                                byte_range[2] += len(chunk)
+                                await self.progress.update(
+                                    task_id, advance=len(chunk), total=content_length
+                                )
+                                chunks += 1
+                                if chunks % RANGE_STATE_SAVE_INTERVAL == 0:
+                                    save_state()
+                                if byte_range[2] > end - start:
+                                    break
+                    finally:
+                        await response.aclose()
+
+            except httpx.HTTPError as e:
+                logger.warning(
+                    _("分段 {0}-{1} 下载失败，重试 {2}/{3}：{4}").format(
+                        start, end, attempt + 1, retry_attempts, e
+                    )
+                )
+            finally:
+                save_state()
+
+        return byte_range[2] > end - start
+
+    async def _download_segmented(
+        self,
+        task_id: TaskID,
+        link: str,
+        tmp_path: Path,
+        content_length: int = 0,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        使用多个连接分段下载文件到预分配的临时文件，支持按分段续传。
+        服务器中途不再以 206 响应范围请求时，改为单连接重新下载。
+        (Download a file over several connections into a preallocated temp file,
+        resuming per range. Falls back to a single stream once the server stops
+        answering range requests with 206.)
+
+        Args:
+            task_id (TaskID): 任务ID (Task ID)
+            link (str): 文件链接 (File URL)
+            tmp_path (Path): 临时文件路径 (Temp file path)
+            content_length (int): 文件总大小 (Total file size)
+            state (Optional[Dict[str, Any]]): 续传时由 _load_ranges 读取的分段进度
+                (Range progress loaded by _load_ranges when resuming)
+
+        Returns:
+            int: 下载完成时返回文件大小，否则返回0 (File size when complete, otherwise 0)
+        """
+        ranges_path = self._ranges_path(tmp_path)
+
+        if state:
+            content_length = state["content_length"]
+            ranges = state["ranges"]
+            logger.debug(
+                _("找到了未完成的分段下载 {0}，共 {1} 个分段").format(
+                    tmp_path, len(ranges)
+                )
+            )
+        else:
+            ranges = self._plan_ranges(content_length)
+            # 预分配临时文件 (Preallocate the temp file)
+            async with aiofiles.open(tmp_path, "wb") as file:
+                await file.truncate(content_length)
+
+        def save_state() -> None:
+            self._save_ranges(tmp_path, content_length, ranges)
+
+        save_state()
+        await self.progress.update(
+            task_id,
+            completed=sum(byte_range[2] for byte_range in ranges),
+            total=content_length,
+        )
+
+        tasks = [
+            asyncio.create_task(
+                self._download_range(
+                    task_id, link, tmp_path, byte_range, content_length, save_state
+                )
+            )
+            for byte_range in ranges
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except _RangeNotSupported as e:
+            # 停止其余分段后再删除进度文件，避免被其保存回调重新写入
+            # (Stop the other ranges first so their save callbacks cannot recreate it)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.warning(
+                _("服务器不支持范围请求，状态码：{0}，改为单连接下载").format(e)
+            )
+            ranges_path.unlink(missing_ok=True)
+            tmp_path.unlink(missing_ok=True)
+            await self.progress.update(task_id, completed=0)
+            content_length, _segmented = await self._download_stream(
+                task_id, link, tmp_path, 0, allow_segments=False
+            )
+            return content_length
+
+        if not all(results):
+            logger.warning(
+                _("分段下载未完成，已保留临时文件以便续传：{0}").format(tmp_path)
+            )
+            return 0
+
+        ranges_path.unlink(missing_ok=True)
+        return content_length
+
+    async def _download_stream(
+        self,
+        task_id: TaskID,
+        link: str,
+        tmp_path: Path,
+        start_byte: int,
+        allow_segments: bool = True,
+    ) -> Tuple[int, bool]:
+        """
+        使用单个连接下载或续传文件到临时文件 (Download or resume a file over one connection)
+
+        Args:
+            task_id (TaskID): 任务ID (Task ID)
+            link (str): 文件链接 (File URL)
+            tmp_path (Path): 临时文件路径 (Temp file path)
+            start_byte (int): 续传的起始字节 (Byte to resume from)
+            allow_segments (bool): 是否允许改用分段下载
+                (Whether switching to segmented download is allowed)
+
+        Returns:
+            Tuple[int, bool]: (文件总大小, 是否改用分段下载)，文件大小为0表示链接不可用
+                (Total size, whether to switch to segmented download; 0 means unusable)
+        """
+        # 构建range请求头，文件大小直接从响应头中获取，无需额外探测
+        # (Build range request header, the size comes from the response headers)
+        range_headers = {"Range": f"bytes={start_byte}-"}
+        range_headers.update(self.headers)
+
+        content_length = 0
+        retry_attempts = 3  # 最大重试次数
+        for attempt in range(retry_attempts):
+            response = None
+            try:
+                range_request = self.aclient.build_request(
+                    "GET", link, headers=range_headers
+                )
+                response = await self.aclient.send(
+                    range_request, stream=True, follow_redirects=True
+                )
+                content_length, resumed = await self._resolve_content_length(
+                    link, response, start_byte
+                )
+                logger.debug(
+                    _("{0} 在服务器上的总内容长度为：{1} 字节").format(
+                        link, content_length
+                    )
+                )
+
+                # 如果文件内容大小为0, 则尝试下一个链接 (If the file content size is 0, try the next link)
+                if content_length == 0:
+                    break
+
+                if response.status_code == 416:
+                    # 本地文件已不小于服务器文件 (Local file is not smaller than remote file)
+                    break
+
+                if allow_segments and self._can_segment(
+                    response, content_length, start_byte
+                ):
+                    return content_length, True
+
+                async with aiofiles.open(
+                    tmp_path, "ab" if resumed and start_byte else "wb"
+                ) as file:
+                    await self._download_chunks(response, file, content_length, task_id)
+                break  # 成功下载，跳出重试循环
+
+            except httpx.RemoteProtocolError as e:
+                logger.warning(
+                    _("协议错误，重试 {0}/{1}：{2}").format(
+                        attempt + 1, retry_attempts, e
+                    )
+                )
+                if attempt == retry_attempts - 1:
+                    # 重试次数用尽，抛出异常 (Retry attempts exhausted, raise exception)
+                    raise APIRetryExhaustedError(_("重试次数已用尽"))
+            finally:
+                if response is not None:
+                    await response.aclose()
+
+        return content_length, False
+
+    async def _finalize_download(
+        self,
+        task_id: TaskID,
+        tmp_path: Path,
+        full_path: Path,
+        content_length: int,
+    ) -> bool:
+        """
+        校验临时文件大小并重命名为目标文件 (Verify the temp file and rename it)
+
+        Args:
+            task_id (TaskID): 任务ID (Task ID)
+            tmp_path (Path): 临时文件路径 (Temp file path)
+            full_path (Path): 目标文件路径 (Target file path)
+            content_length (int): 预期文件大小，为0表示下载未完成
+                (Expected size, 0 means the download is incomplete)
+
+        Returns:
+            bool: 是否下载成功 (Whether the download succeeded)
+        """
+        # 检查文件大小是否匹配 (Check if the file size matches)
+        actual_size = tmp_path.stat().st_size if tmp_path.exists() else 0
+        if not content_length or actual_size != content_length:
+            if content_length:
+                logger.warning(
+                    _("文件大小不匹配 - 预期: {0} 字节, 实际: {1} 字节").format(
+                        content_length, actual_size
+                    )
+                )
+            await self.progress.update(
+                task_id,
+                description=_("[yellow][  警告  ]：[/yellow]"),
+                filename=trim_filename(full_path.name, 45),
+                state="warning",
+            )
+            return False  # 保留.tmp后缀，尝试下一个链接
+
+        # 尝试重命名文件
+        try:
+            tmp_path.rename(full_path)
+        except (FileExistsError, PermissionError) as e:
+            logger.error(_("文件重命名失败：{0}").format(e))
+            tmp_path.replace(full_path)
+        except Exception as e:
+            trace_logger.error(traceback.format_exc())
+            logger.error(_("意外错误：{0}").format(e))
+            tmp_path.unlink(missing_ok=True)
+            await self.progress.update(
+                task_id,
+                description=_("[red][  失败  ]：[/red]"),
+                filename=trim_filename(full_path.name, 45),
+                state="error",
+            )
+            return False
+
+        logger.info(_("[green][  完成  ]：{0}[/green]").format(Path(full_path).name))
+        await self.progress.update(
+            task_id,
+            description=_("[green][  完成  ]：[/green]"),
+            filename=trim_filename(full_path.name, 45),
+            state="completed",
+            visible=False,
+        )
+        return True
 
     async def download_file(
         self,
@@ -169,21 +695,17 @@ class BaseDownloader(BaseCrawler):
             # 遍历所有链接 (Iterate over all links)
             for link in urls:
                 try:
-                    # 获取文件内容大小 (Get the size of the file content)
-                    content_length = await get_content_length(
-                        link, self.headers, self.proxies
-                    )
-                    logger.debug(
-                        _("{0} 在服务器上的总内容长度为：{1} 字节").format(
-                            link, content_length
-                        )
-                    )
-
-                    # 如果文件内容大小为0, 则尝试下一个链接 (If the file content size is 0, try the next link)
-                    if content_length == 0:
-                        logger.warning(
-                            _("链接 {0} 响应大小为 0 字节，尝试下一个链接").format(link)
+                    # 存在有效的分段进度时，按分段继续下载
+                    # (Resume range by range when valid range progress exists)
+                    state = self._load_ranges(tmp_path)
+                    if state:
+                        content_length = await self._download_segmented(
+                            task_id, link, tmp_path, state=state
                         )
+                        if await self._finalize_download(
+                            task_id, tmp_path, full_path, content_length
+                        ):
+                            break
                         continue
 
                     start_byte = 0 if not tmp_path.exists() else tmp_path.stat().st_size
@@ -193,87 +715,30 @@ class BaseDownloader(BaseCrawler):
                         )
                     )
 
-                    if start_byte == content_length:
+                    if start_byte and start_byte == self._content_lengths.get(link):
                         tmp_path.rename(full_path)
                         logger.info(_("文件已完整下载，无需重复下载"))
                         return
 
-                    # 构建range请求头 (Build range request header)
-                    range_headers = (
-                        {"Range": f"bytes={start_byte}-"} if start_byte else {}
-                    )
-                    range_headers.update(self.headers)
-
-                    range_request = self.aclient.build_request(
-                        "GET", link, headers=range_headers
+                    content_length, segmented = await self._download_stream(
+                        task_id, link, tmp_path, start_byte
                     )
 
-                    retry_attempts = 3  # 最大重试次数
-                    for attempt in range(retry_attempts):
-                        try:
-                            async with aiofiles.open(
-                                tmp_path, "ab" if start_byte else "wb"
-                            ) as file:
-                                await self._download_chunks(
-                                    range_request, file, content_length, task_id
-                                )
-                            break  # 成功下载，跳出重试循环
-
-                        except httpx.RemoteProtocolError as e:
-                            logger.warning(
-                                _("协议错误，重试 {0}/{1}：{2}").format(
-                                    attempt + 1, retry_attempts, e
-                                )
-                            )
-                            if attempt == retry_attempts - 1:
-                                # 重试次数用尽，抛出异常 (Retry attempts exhausted, raise exception)
-                                raise APIRetryExhaustedError(_("重试次数已用尽"))
-
-                    # 检查文件大小是否匹配 (Check if the file size matches)
-                    actual_size = tmp_path.stat().st_size
-                    if actual_size != content_length:
+                    if content_length == 0:
                         logger.warning(
-                            _("文件大小不匹配 - 预期: {0} 字节, 实际: {1} 字节").format(
-                                content_length, actual_size
-                            )
-                        )
-                        await self.progress.update(
-                            task_id,
-                            description=_("[yellow][  警告  ]：[/yellow]"),
-                            filename=trim_filename(full_path.name, 45),
-                            state="warning",
+                            _("链接 {0} 响应大小为 0 字节，尝试下一个链接").format(link)
                         )
-                        continue  # 保留.tmp后缀，尝试下一个链接
+                        continue
 
-                    # 尝试重命名文件
-                    try:
-                        tmp_path.rename(full_path)
-                    except (FileExistsError, PermissionError) as e:
-                        logger.error(_("文件重命名失败：{0}").format(e))
-                        tmp_path.replace(full_path)
-                    except Exception as e:
-                        trace_logger.error(traceback.format_exc())
-                        logger.error(_("意外错误：{0}").format(e))
-                        tmp_path.unlink(missing_ok=True)
-                        await self.progress.update(
-                            task_id,
-                            description=_("[red][  失败  ]：[/red]"),
-                            filename=trim_filename(full_path.name, 45),
-                            state="error",
+                    if segmented:
+                        content_length = await self._download_segmented(
+                            task_id, link, tmp_path, content_length
                         )
-                        continue
 
-                    logger.info(
-                        _("[green][  完成  ]：{0}[/green]").format(Path(full_path).name)
-                    )
-                    await self.progress.update(
-                        task_id,
-                        description=_("[green][  完成  ]：[/green]"),
-                        filename=trim_filename(full_path.name, 45),
-                        state="completed",
-                        visible=False,
-                    )
-                    break  # 下载成功，跳出链接循环
+                    if await self._finalize_download(
+                        task_id, tmp_path, full_path, content_length
+                    ):
+                        break  # 下载成功，跳出链接循环
 
                 except Exception as e:
                     logger.error(_("下载失败：{0}").format(e))
@@ -339,6 +804,36 @@ class BaseDownloader(BaseCrawler):
         )
         logger.debug(_("文件已保存到：{0}").format(full_path))
 
+    async def _fetch_m3u8_segment(self, ts_url: str) -> Optional[bytes]:
+        """
+        下载单个TS片段 (Download a single TS segment)
+
+        Args:
+            ts_url (str): TS片段的URL (TS segment URL)
+
+        Returns:
+            Optional[bytes]: 片段内容，失败时返回None (Segment content, None on failure)
+        """
+        try:
+            response = await self.aclient.get(
+                ts_url, headers=self.headers, follow_redirects=True
+            )
+            response.raise_for_status()
+            return response.content
+
+        except httpx.ReadTimeout:
+            logger.warning(_("下载超时：跳过该 TS 文件片段"))
+
+        except httpx.RemoteProtocolError as e:
+            logger.error(
+                _(
+                    "服务器返回的块大小未严格遵守 HTTP 规范，跳过该片段。错误信息：{0}"
+                ).format(e)
+            )
+
+        except httpx.HTTPError as e:
+            logger.warning(_("TS 文件片段下载失败，跳过该片段：{0}").format(e))
+
     async def download_m3u8_stream(
         self,
         task_id: TaskID,
@@ -358,154 +853,166 @@ class BaseDownloader(BaseCrawler):
 
             直播流的大小不确定，因此无法准确计算下载进度，只能根据下载的块大小来更新进度条。
 
+            下载流程为 生产者/消费者 管道：播放列表轮询器将新片段放入有界队列，
+            多个工作协程并发下载片段，写入协程按媒体序号顺序追加到文件。
+            (The download is a producer/consumer pipeline: the playlist poller enqueues
+            new segments into a bounded queue, several workers fetch them concurrently
+            and the writer appends them to the file in media sequence order.)
+
             可能会出现 httpx.RemoteProtocolError 错误，这是由于服务器返回的块大小未严格遵守 HTTP 规范。
             非代码问题，而是服务器问题，跳过该片段处理。
             Issues: https://github.com/encode/httpx/issues/1927
         """
         async with self.semaphore:
             full_path = self._ensure_path(full_path)
-            # 设置默认下载总量 (Set default total download)
-            total_downloaded = 10240000
-            # 默认块大小 (Default chunk size)
-            default_chunks = 409600
-            # 记录已经下载的片段序号
-            # (Record the segment number that has been downloaded)
-            downloaded_segments: Set = set()
-
-            while not SignalManager.is_shutdown_signaled():
+            # 确保目标路径存在 (Ensure target path exists)
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # 待下载片段队列，其长度由 pending 信号量限制
+            # (Queue of segments waiting to be fetched, bounded by `pending`)
+            queue: asyncio.Queue = asyncio.Queue()
+            # 限制已入队但未写入的片段数量，避免内存无限增长
+            # (Bound the number of enqueued but unwritten segments)
+            pending = asyncio.Semaphore(self._m3u8_prefetch)
+            # 已下载的片段，按入队顺序编号 (Fetched segments keyed by enqueue order)
+            results: Dict[int, Optional[bytes]] = {}
+            ready = asyncio.Condition()
+            # 轮询器状态 (Poller state)
+            poller_state = {"finished": False, "enqueued": 0}
+
+            async def poll_playlist() -> None:
+                # 按媒体序号去重的滑动窗口 (Sliding window dedup keyed on media sequence)
+                window = SegmentWindow(MAX_SEGMENT_COUNT)
                 try:
-                    segments = await get_segments_from_m3u8(url)
+                    while not SignalManager.is_shutdown_signaled():
+                        # 通过共享客户端异步拉取播放列表，不阻塞事件循环
+                        # (Fetch the playlist asynchronously on the shared client)
+                        playlist = await get_m3u8_playlist(
+                            url, self.aclient, self.headers
+                        )
+                        if not playlist or not playlist.segments:
+                            logger.debug(_("m3u8片段为空，直播流已结束"))
+                            return
+
+                        new_segment_count = 0
+                        for index, segment in enumerate(playlist.segments):
+                            key = (
+                                playlist.media_sequence + index
+                                if playlist.media_sequence is not None
+                                else segment.absolute_uri
+                            )
+                            if not window.add(key):
+                                continue
 
-                    if not segments:
-                        logger.debug(_("m3u8片段为空，直播流已结束"))
-                        logger.info(
-                            _("[green][  完成  ]：{0}[/green]").format(
-                                Path(full_path).name
+                            await pending.acquire()
+                            await queue.put(
+                                (poller_state["enqueued"], segment.absolute_uri)
                             )
+                            poller_state["enqueued"] += 1
+                            new_segment_count += 1
+
+                        if playlist.is_endlist:
+                            logger.debug(_("m3u8播放列表已结束 (#EXT-X-ENDLIST)"))
+                            return
+
+                        # 按 #EXT-X-TARGETDURATION 的节奏刷新播放列表
+                        # (Reload the playlist at the #EXT-X-TARGETDURATION cadence)
+                        await asyncio.sleep(
+                            get_m3u8_poll_interval(playlist, new_segment_count > 0)
                         )
+                finally:
+                    for _worker in range(self._m3u8_workers):
+                        await queue.put(None)
+                    async with ready:
+                        poller_state["finished"] = True
+                        ready.notify_all()
+
+            async def fetch_segments() -> None:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    order, ts_url = item
+                    content = (
+                        None
+                        if SignalManager.is_shutdown_signaled()
+                        else await self._fetch_m3u8_segment(ts_url)
+                    )
+                    async with ready:
+                        results[order] = content
+                        ready.notify_all()
+
+            async def write_segments() -> None:
+                # 设置默认下载总量 (Set default total download)
+                total_downloaded = 10240000
+                next_order = 0
+
+                async with aiofiles.open(full_path, "ab") as file:
+                    while True:
+                        async with ready:
+                            await ready.wait_for(
+                                lambda: next_order in results
+                                or (
+                                    poller_state["finished"]
+                                    and next_order >= poller_state["enqueued"]
+                                )
+                            )
+                            if next_order not in results:
+                                return
+                            content = results.pop(next_order)
+
+                        next_order += 1
+                        pending.release()
+
+                        if not content:
+                            continue
+
+                        # 直播流分段写入，每次写入后更新进度条
+                        # (Live stream is written per segment, update progress bar after each write)
+                        await file.write(content)
+                        total_downloaded += len(content)
                         await self.progress.update(
                             task_id,
-                            description=_("[green][  完成  ]：[/green]"),
-                            filename=trim_filename(full_path.name, 45),
-                            state="completed",
-                            visible=False,
+                            advance=len(content),
+                            total=total_downloaded,
                         )
-                        return
 
-                    # 确保目标路径存在 (Ensure target path exists)
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    async with aiofiles.open(full_path, "ab") as file:
-                        for segment in segments:
-                            if SignalManager.is_shutdown_signaled():
-                                break
-
-                            # 检查是否已经下载过该片段 (Check if the segment has been downloaded)
-                            if segment.absolute_uri not in downloaded_segments:
-                                ts_url = segment.absolute_uri
-                                ts_content_length = await get_content_length(
-                                    ts_url,
-                                    self.headers,
-                                    self.proxies,
-                                )
-                                if ts_content_length == 0:
-                                    ts_content_length = default_chunks
-                                    logger.debug(
-                                        _(
-                                            "无法读取该TS文件字节长度，将使用默认400kb块大小处理数据"
-                                        )
-                                    )
-
-                                try:
-                                    ts_request = self.aclient.build_request(
-                                        "GET", ts_url, headers=self.headers
-                                    )
-                                    ts_response = await self.aclient.send(
-                                        ts_request, stream=True
-                                    )
-
-                                    async for chunk in ts_response.aiter_bytes(
-                                        get_chunk_size(ts_content_length)
-                                    ):
-                                        if SignalManager.is_shutdown_signaled():
-                                            break
-
-                                        # 直播流分块下载，每次下载后更新进度条
-                                        # (Live stream block download, update progress bar after each download)
-                                        await file.write(chunk)
-                                        total_downloaded += len(chunk)
-                                        await self.progress.update(
-                                            task_id,
-                                            advance=len(chunk),
-                                            total=total_downloaded,
-                                        )
-
-                                    # 记录已经下载的片段序号
-                                    # (Record the segment number that has been downloaded)
-                                    downloaded_segments.add(segment.absolute_uri)
-
-                                except httpx.ReadTimeout:
-                                    logger.warning(_("下载超时：跳过该 TS 文件片段"))
-                                    continue
-
-                                except httpx.RemoteProtocolError as e:
-                                    logger.error(
-                                        _(
-                                            "服务器返回的块大小未严格遵守 HTTP 规范，跳过该片段。错误信息：{0}"
-                                        ).format(e)
-                                    )
-                                    continue
-
-                                finally:
-                                    await ts_response.aclose()
-                            else:
-                                logger.debug(
-                                    _("跳过已下载的片段，URL：{0}").format(
-                                        segment.absolute_uri
-                                    )
-                                )
-
-                            # 每下载一定数量的片段后，清理一次集合
-                            # (After downloading a certain number of segments, clean up the collection)
-                            if len(downloaded_segments) > MAX_SEGMENT_COUNT:
-                                downloaded_segments = set()
-
-                    # 等待片段时长，避免过快下载
-                    # (Wait for the segment duration to avoid downloading too fast)
-                    await asyncio.sleep(segment.duration)
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        logger.debug(_("m3u8文件或ts文件未找到，当前直播已结束"))
-                    elif e.response.status_code == 504:
-                        logger.warning(_("[red]网关超时，无法下载直播流[/red]"))
-                    else:
-                        logger.debug(_("HTTP错误：{0}").format(e))
-                        logger.error(_("[red]m3u8文件下载失败，但文件已保存[/red]"))
-
-                    logger.info(
-                        _("[green][  完成  ]：{0}[/green]").format(Path(full_path).name)
-                    )
-                    await self.progress.update(
-                        task_id,
-                        description=_("[red][  完成  ]：[/red]"),
-                        filename=trim_filename(full_path.name, 45),
-                        state="completed",
-                        visible=False,
-                    )
-                    logger.debug(_("直播流文件已保存到：{0}").format(full_path))
-                    return
+            tasks = [
+                asyncio.create_task(poll_playlist()),
+                asyncio.create_task(write_segments()),
+                *(
+                    asyncio.create_task(fetch_segments())
+                    for _worker in range(self._m3u8_workers)
+                ),
+            ]
+
+            try:
+                await asyncio.gather(*tasks)
+
+            except Exception as e:
+                for task in tasks:
+                    task.cancel()
+                trace_logger.error(traceback.format_exc())
+                logger.error(_("m3u8文件解析失败：{0}").format(e))
+                await self.progress.update(
+                    task_id,
+                    description=_("[red][  失败  ]：[/red]"),
+                    filename=trim_filename(full_path.name, 45),
+                    state="completed",
+                )
+                return
 
-                except Exception as e:
-                    trace_logger.error(traceback.format_exc())
-                    logger.error(_("m3u8文件解析失败：{0}").format(e))
-                    await self.progress.update(
-                        task_id,
-                        description=_("[red][  失败  ]：[/red]"),
-                        filename=trim_filename(full_path.name, 45),
-                        state="completed",
-                    )
-                    return
+            logger.info(
+                _("[green][  完成  ]：{0}[/green]").format(Path(full_path).name)
+            )
+            await self.progress.update(
+                task_id,
+                description=_("[green][  完成  ]：[/green]"),
+                filename=trim_filename(full_path.name, 45),
+                state="completed",
+                visible=False,
+            )
+            logger.debug(_("直播流文件已保存到：{0}").format(full_path))
 
     async def initiate_download(
         self,
@@ -665,10 +1172,7 @@ class BaseDownloader(BaseCrawler):
 
     async def close(self) -> None:
         """关闭下载器 (Close the downloader)"""
-        if self.client:
-            self.client.close()
-        if self.aclient:
-            await self.aclient.aclose()
+        await super().close()
 
     async def __aenter__(self) -> "BaseDownloader":
         """进入上下文管理器 (Enter the context manager)"""
@@ -79,3 +79,11 @@ class TranslationManager:
 
 
 _ = TranslationManager.get_instance().gettext
+
+
+def N_(message: str) -> str:
+    """
+    标记需要翻译的字符串但暂不翻译，供 pybabel 提取，翻译推迟到真正使用时
+    (Mark a string for extraction without translating it yet)
+    """
+    return message
@@ -5,9 +5,11 @@ import logging
 import datetime
 
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 from rich.logging import RichHandler
 from logging.handlers import TimedRotatingFileHandler
 
+from f2.i18n.translator import _
 from f2.utils._singleton import Singleton
 
 
@@ -179,8 +181,165 @@ def log_setup(
     return logger
 
 
+class LazyValue:
+    """
+    惰性参数 (Lazy Argument)
+
+    包装一次函数调用，日志被真正输出时才求值，例如
+    `LazyValue(timestamp_2_str, time.time())`。
+    """
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args))
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.func(*self.args), format_spec)
+
+
+class LazyMessage:
+    """
+    惰性日志消息 (Lazy Log Message)
+
+    保存未翻译的模板与参数，logging 在输出记录时调用 `str()` 才进行翻译与格式化，
+    结果会被缓存，多个 handler 共享同一次格式化。
+    """
+
+    __slots__ = ("template", "args", "suppressed", "_text")
+
+    def __init__(self, template: str, args: tuple, suppressed: int = 0):
+        self.template = template
+        self.args = args
+        self.suppressed = suppressed
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            text = _(self.template).format(*self.args)
+            if self.suppressed:
+                text += _(" [已省略 {0} 条同类日志]").format(self.suppressed)
+            self._text = text
+        return self._text
+
+
+class LazyLogger:
+    """
+    惰性日志门面 (Lazy Logging Facade)
+
+    包装 `logging.Logger`，级别未启用时直接返回，不会翻译模板，也不会将参数（如 protobuf 消息）转换为字符串；
+    级别启用时也只在 handler 真正输出记录时才格式化。
+    模板使用 `N_()` 标记，以便 pybabel 提取，翻译推迟到输出时进行。
+
+    对于每条消息都会触发的日志，可以使用 every 只记录每 N 次中的一次，或使用 interval 限制同类日志的最短间隔（秒），
+    被省略的次数会附加在下一条输出的日志中。同类日志默认以模板区分，也可以通过 key 指定。
+
+    类属性:
+    - logger (logging.Logger): 被包装的日志记录器。
+
+    类方法:
+    - log: 按级别记录日志，支持 every、interval 与 key。
+    - debug / info / warning / error: 对应级别的快捷方法。
+
+    使用示例:
+    ```python
+        lazy_logger.debug(N_("[WssPackage] [📦Wss包] | [{0}]"), wss_package)
+        lazy_logger.info(N_("[ReceiveMessages] | [⏳ 接收消息 {0}]"), now, interval=5)
+        lazy_logger.warning(N_("未找到回调：{0}"), method, key=method, every=100)
+    ```
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        # key -> [调用次数, 上次输出时间, 已省略次数] (key -> [calls, last emit, suppressed])
+        self._limits: Dict[str, list] = {}
+
+    def _admit(self, key: str, every: int, interval: float) -> Optional[int]:
+        """
+        判断本次是否输出，输出时返回此前省略的次数，否则返回 None
+        (Decide whether to emit; returns the suppressed count, or None to skip)
+        """
+        state = self._limits.get(key)
+        if state is None:
+            state = self._limits[key] = [0, float("-inf"), 0]
+
+        state[0] += 1
+        if every > 1 and (state[0] - 1) % every:
+            state[2] += 1
+            return None
+
+        if interval > 0:
+            now = time.monotonic()
+            if now - state[1] < interval:
+                state[2] += 1
+                return None
+            state[1] = now
+
+        suppressed, state[2] = state[2], 0
+        return suppressed
+
+    def log(
+        self,
+        level: int,
+        template: str,
+        *args: Any,
+        every: int = 1,
+        interval: float = 0.0,
+        key: Optional[str] = None,
+        _stacklevel: int = 1,
+    ) -> None:
+        """
+        记录日志 (Log a message)
+
+        Args:
+            level (int): 日志级别 (Log level)
+            template (str): 使用 N_() 标记的模板 (Template marked with N_())
+            *args: 模板参数 (Template arguments)
+            every (int): 每 every 次记录一次 (Emit one out of every calls)
+            interval (float): 同类日志的最短间隔（秒） (Minimum seconds between records)
+            key (str): 同类日志的标识，默认为模板 (Rate-limit key, the template by default)
+            _stacklevel (int): 调用者距离本方法的层数，快捷方法传入 2，
+                使记录的文件名与行号指向真正的调用者
+                (Frames between the caller and this method; the level helpers pass 2
+                so the record points at the real caller)
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+
+        suppressed = 0
+        if every > 1 or interval > 0:
+            suppressed = self._admit(key or template, every, interval)
+            if suppressed is None:
+                return
+
+        self.logger.log(
+            level,
+            LazyMessage(template, args, suppressed),
+            stacklevel=_stacklevel + 1,
+        )
+
+    def debug(self, template: str, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.DEBUG, template, *args, _stacklevel=2, **kwargs)
+
+    def info(self, template: str, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.INFO, template, *args, _stacklevel=2, **kwargs)
+
+    def warning(self, template: str, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.WARNING, template, *args, _stacklevel=2, **kwargs)
+
+    def error(self, template: str, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.ERROR, template, *args, _stacklevel=2, **kwargs)
+
+
 # 主日志记录器（包含所有日志级别）
 logger = log_setup(log_to_console=True, log_name="f2")
 
 # 错误堆栈日志记录器（不输出到控制台，单独记录错误日志）
 trace_logger = log_setup(log_to_console=False, log_name="f2-trace")
+
+# 热路径使用的惰性日志门面（包装主日志记录器）
+lazy_logger = LazyLogger(logger)
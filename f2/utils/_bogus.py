@@ -0,0 +1,115 @@
+# path: f2/utils/_bogus.py
+
+"""
+X-Bogus 与 A-Bogus 共用的字节级加密原语
+(Byte-level primitives shared by X-Bogus and A-Bogus)
+
+- rc4_encrypt: 密钥调度结果按密钥缓存，只在密文生成阶段逐字节运算。
+- b64encode: 使用标准 base64 编码后通过 `bytes.translate` 映射到自定义字符表。
+- pack_codes: 将可能超过 255 的字符码按 24 位分组折叠为字节，与 JS 字符串语义保持一致。
+"""
+
+import base64
+
+from functools import lru_cache
+from typing import Sequence
+
+_STANDARD_B64_ALPHABET = (
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+)
+
+
+@lru_cache(maxsize=32)
+def rc4_schedule(key: bytes) -> bytes:
+    """
+    RC4 密钥调度，结果按密钥缓存 (RC4 key scheduling, cached per key)
+
+    Args:
+        key (bytes): 加密密钥 (Encryption key)
+
+    Returns:
+        bytes: 初始 S 盒 (Initial S box)
+    """
+    S = bytearray(range(256))
+    j = 0
+    key_length = len(key)
+    for i in range(256):
+        j = (j + S[i] + key[i % key_length]) & 255
+        S[i], S[j] = S[j], S[i]
+    return bytes(S)
+
+
+def rc4_encrypt(key: bytes, data: bytes) -> bytes:
+    """
+    使用 RC4 算法加密/解密数据 (Encrypt or decrypt data with RC4)
+
+    Args:
+        key (bytes): 加密密钥 (Encryption key)
+        data (bytes): 明文或密文 (Plaintext or ciphertext)
+
+    Returns:
+        bytes: 处理后的数据 (Processed data)
+    """
+    S = bytearray(rc4_schedule(bytes(key)))
+    out = bytearray(data)
+    i = j = 0
+    for index in range(len(out)):
+        i = (i + 1) & 255
+        si = S[i]
+        j = (j + si) & 255
+        sj = S[j]
+        S[i] = sj
+        S[j] = si
+        out[index] ^= S[(si + sj) & 255]
+    return bytes(out)
+
+
+@lru_cache(maxsize=32)
+def _translation_table(alphabet: str) -> bytes:
+    return bytes.maketrans(_STANDARD_B64_ALPHABET, alphabet[:64].encode("ascii"))
+
+
+def b64encode(data: bytes, alphabet: str) -> str:
+    """
+    使用自定义字符表进行 base64 编码，填充字符为 `=`
+    (Base64-encode with a custom alphabet, padded with `=`)
+
+    Args:
+        data (bytes): 输入数据 (Input data)
+        alphabet (str): 自定义字符表，只使用前 64 个字符 (Custom alphabet, first 64 chars)
+
+    Returns:
+        str: 编码后的字符串 (Encoded string)
+    """
+    return (
+        base64.b64encode(data).translate(_translation_table(alphabet)).decode("ascii")
+    )
+
+
+def pack_codes(codes: Sequence[int]) -> bytes:
+    """
+    将字符码按 24 位分组折叠为字节。字符码都小于 256 时等价于 `bytes(codes)`，
+    否则高位会像 JS 中 `charCodeAt` 的移位运算一样并入前一个字节。
+    (Fold character codes into bytes in 24-bit groups, matching the JS shifts when a
+    code exceeds 255.)
+
+    Args:
+        codes (Sequence[int]): 字符码 (Character codes)
+
+    Returns:
+        bytes: 折叠后的字节 (Packed bytes)
+    """
+    if max(codes, default=0) < 256:
+        return bytes(codes)
+
+    out = bytearray()
+    length = len(codes)
+    for i in range(0, length, 3):
+        group = codes[i : i + 3]
+        n = group[0] << 16
+        if len(group) > 1:
+            n |= group[1] << 8
+        if len(group) > 2:
+            n |= group[2]
+        out.extend(((n >> 16) & 255, (n >> 8) & 255, n & 255)[: len(group)])
+    return bytes(out)
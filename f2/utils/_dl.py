@@ -5,16 +5,25 @@ import httpx
 import traceback
 
 from pathlib import Path
-from typing import Union
-from urllib.error import HTTPError
+from typing import Hashable, Union
+from collections import deque
 
 from f2.utils.utils import ensure_path
 from f2.log.logger import logger, trace_logger
 from f2.i18n.translator import _
 
+# m3u8 最大嵌套层数 (Maximum nesting depth of m3u8 playlists)
+M3U8_MAX_NESTING = 5
+# 缺少 #EXT-X-TARGETDURATION 时的默认刷新间隔，单位为秒
+# (Default reload interval in seconds when #EXT-X-TARGETDURATION is missing)
+M3U8_DEFAULT_TARGET_DURATION = 2
+
 
 async def get_content_length(
-    url: str, headers: dict = None, proxies: dict = None
+    url: str,
+    headers: dict = None,
+    proxies: dict = None,
+    aclient: httpx.AsyncClient = None,
 ) -> int:
     """
     获取给定URL的Content-Length (Retrieve the Content-Length for a given URL)
@@ -23,11 +32,16 @@ async def get_content_length(
         url (str): 目标URL (Target URL)
         headers (dict): 请求头 (Request headers)
         proxies (dict): 代理 (Proxies)
+        aclient (httpx.AsyncClient): 复用的异步客户端，为空时创建临时客户端
+            (Async client to reuse, a temporary one is created when omitted)
 
     Returns:
         int: Content-Length的值，如果获取失败则返回0 (Value of Content-Length, or 0 if retrieval fails)
     """
 
+    if aclient is not None:
+        return await _probe_content_length(aclient, url, headers, proxies)
+
     if proxies is ... or proxies is None:
         proxies = {"all://": None}
 
@@ -40,77 +54,149 @@ async def get_content_length(
         transport=httpx.AsyncHTTPTransport(retries=5, proxy=proxy_url),
         verify=False,
     ) as aclient:
-        try:
-            response = await aclient.head(url, headers=headers, follow_redirects=True)
-            # 当head请求被禁止时，释放status异常被捕获 (When head requests are forbidden, release status exceptions are caught)
+        return await _probe_content_length(aclient, url, headers, proxies)
+
+
+async def _probe_content_length(
+    aclient: httpx.AsyncClient, url: str, headers: dict, proxies: dict
+) -> int:
+    """
+    使用指定客户端探测Content-Length (Probe the Content-Length with the given client)
+    """
+
+    try:
+        response = await aclient.head(url, headers=headers, follow_redirects=True)
+        # 当head请求被禁止时，释放status异常被捕获 (When head requests are forbidden, release status exceptions are caught)
+        response.raise_for_status()
+
+        if (
+            response.headers.get("Content-Length") != None
+            and int(response.headers.get("Content-Length")) == 0
+        ):
+            # 如果head请求无法获取Content-Length, 则使用GET请求再次尝试获取
+            # 使用stream=True来避免下载整个内容 (Using stream=True to avoid downloading the entire content)
+            request = aclient.build_request("GET", url, headers=headers)
+            response = await aclient.send(request, stream=True, follow_redirects=True)
+            await response.aclose()
             response.raise_for_status()
 
-            if (
-                response.headers.get("Content-Length") != None
-                and int(response.headers.get("Content-Length")) == 0
-            ):
-                # 如果head请求无法获取Content-Length, 则使用GET请求再次尝试获取
-                response = await aclient.get(
-                    url, headers=headers, follow_redirects=True
-                )
+    except httpx.ConnectTimeout:
+        # 连接超时错误处理 (Handling connection timeout errors)
+        trace_logger.error(traceback.format_exc())
+        logger.error(_("连接超时错误：{0}".format(url)))
+        logger.debug("===================================")
+        logger.debug(f"headers：{headers}，proxies：{proxies}")
+        logger.debug("===================================")
+        return 0
+    # 对HTTP状态错误进行处理 (Handling HTTP status errors)
+    except httpx.HTTPStatusError as exc:
+        # HEAD或请求不被允许 (HEAD or request not allowed)
+        if exc.response.status_code in [405, 403, 401, 302]:
+            try:
+                # 使用GET请求尝试再次获取Content-Length
+                # (Trying to retrieve Content-Length using GET request)
+                request = aclient.build_request("GET", url, headers=headers)
+                # 使用stream=True来避免下载整个内容
+                # (Using stream=True to avoid downloading the entire content)
+                response = await aclient.send(request, stream=True)
+                await response.aclose()
                 response.raise_for_status()
-
-        except httpx.ConnectTimeout:
-            # 连接超时错误处理 (Handling connection timeout errors)
-            trace_logger.error(traceback.format_exc())
-            logger.error(_("连接超时错误：{0}".format(url)))
-            logger.debug("===================================")
-            logger.debug(f"headers：{headers}，proxies：{proxies}")
-            logger.debug("===================================")
-            return 0
-        # 对HTTP状态错误进行处理 (Handling HTTP status errors)
-        except httpx.HTTPStatusError as exc:
-            # HEAD或请求不被允许 (HEAD or request not allowed)
-            if exc.response.status_code in [405, 403, 401, 302]:
-                try:
-                    # 使用GET请求尝试再次获取Content-Length
-                    # (Trying to retrieve Content-Length using GET request)
-                    request = aclient.build_request("GET", url, headers=headers)
-                    # 使用stream=True来避免下载整个内容
-                    # (Using stream=True to avoid downloading the entire content)
-                    response = await aclient.send(request, stream=True)
-                    response.raise_for_status()
-                except Exception as e:
-                    trace_logger.error(traceback.format_exc())
-                    logger.error(
-                        _("HTTP状态错误，尝试GET请求失败，错误详情：{0}".format(e))
-                    )
-                    return 0
-            else:
+            except Exception as e:
+                trace_logger.error(traceback.format_exc())
                 logger.error(
-                    _(
-                        "HTTP状态错误：{0}，状态码：{1}".format(
-                            url, exc.response.status_code
-                        )
-                    )
+                    _("HTTP状态错误，尝试GET请求失败，错误详情：{0}".format(e))
                 )
                 return 0
-        except httpx.ReadTimeout:
-            # 读取超时错误处理 (Handling read timeout errors)
-            trace_logger.error(traceback.format_exc())
-            logger.error(_("返回超时错误：{0}".format(url)))
-            return 0
-        except Exception as e:
-            # 处理未知错误 (Handling unknown errors)
-            trace_logger.error(traceback.format_exc())
+        else:
             logger.error(
                 _(
-                    "f2 请求 Content-Length 时发生未知错误：{0}，错误详情：{1}".format(
-                        url, e
+                    "HTTP状态错误：{0}，状态码：{1}".format(
+                        url, exc.response.status_code
                     )
                 )
             )
             return 0
+    except httpx.ReadTimeout:
+        # 读取超时错误处理 (Handling read timeout errors)
+        trace_logger.error(traceback.format_exc())
+        logger.error(_("返回超时错误：{0}".format(url)))
+        return 0
+    except Exception as e:
+        # 处理未知错误 (Handling unknown errors)
+        trace_logger.error(traceback.format_exc())
+        logger.error(
+            _(
+                "f2 请求 Content-Length 时发生未知错误：{0}，错误详情：{1}".format(
+                    url, e
+                )
+            )
+        )
+        return 0
+
+    # 返回Content-Length值 (Returning the Content-Length value)
+    return int(response.headers.get("Content-Length", 0))
+
+    # raise ValueError("响应中没有找到Content-Length") # Content-Length header not found in the response
+
+
+def parse_content_range(content_range: str) -> int:
+    """
+    从Content-Range响应头中解析文件总大小 (Parse the total size from a Content-Range header)
+
+    Args:
+        content_range (str): 形如 "bytes 0-99/1000" 或 "bytes */1000" 的响应头
+            (Header value such as "bytes 0-99/1000" or "bytes */1000")
+
+    Returns:
+        int: 文件总大小，无法解析时返回0 (Total size, or 0 if it cannot be parsed)
+    """
+
+    if not content_range or "/" not in content_range:
+        return 0
+
+    total = content_range.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else 0
+
+
+class SegmentWindow:
+    """
+    片段去重滑动窗口 (Sliding window for segment dedup)
+
+    只记住最近 size 个片段键（通常为媒体序号），既能过滤播放列表刷新时重复出现的片段，
+    又不会像一次性清空的集合那样在清空后重复下载窗口内的片段。
+    (Remembers only the latest `size` keys, usually media sequence numbers.)
+
+    使用示例:
+    ```python
+        window = SegmentWindow(1000)
+        window.add(7)  # True
+        window.add(7)  # False
+    ```
+    """
+
+    def __init__(self, size: int = 1000):
+        self._size = size
+        self._order = deque()
+        self._seen = set()
+
+    def add(self, key: Hashable) -> bool:
+        """
+        记录片段键，首次出现时返回 True (Record a key, True if it is new)
+        """
+        if key in self._seen:
+            return False
 
-        # 返回Content-Length值 (Returning the Content-Length value)
-        return int(response.headers.get("Content-Length", 0))
+        self._seen.add(key)
+        self._order.append(key)
+        if len(self._order) > self._size:
+            self._seen.discard(self._order.popleft())
+        return True
 
-        # raise ValueError("响应中没有找到Content-Length") # Content-Length header not found in the response
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._seen
+
+    def __len__(self) -> int:
+        return len(self._order)
 
 
 def trim_filename(filename: Union[str, Path], max_length: int = 50) -> str:
@@ -161,53 +247,123 @@ def get_chunk_size(file_size: int) -> int:
         return 1 * 1024 * 1024  # 使用1MB的块大小 (Use a chunk size of 1MB)
 
 
-async def get_segments_from_m3u8(url: str) -> Union[list, str, None]:
+async def get_m3u8_playlist(
+    url: str,
+    aclient: httpx.AsyncClient = None,
+    headers: dict = None,
+    max_depth: int = M3U8_MAX_NESTING,
+) -> Union[m3u8.M3U8, None]:
+    """
+    异步获取并解析m3u8播放列表，逐层展开嵌套（多码率）的播放列表
+    (Asynchronously fetch and parse an m3u8 playlist, unwrapping variant playlists)
+
+    Args:
+        url (str): m3u8文件的URL (m3u8 file URL)
+        aclient (httpx.AsyncClient): 复用的异步客户端，为空时创建临时客户端
+            (Async client to reuse, a temporary one is created when omitted)
+        headers (dict): 请求头 (Request headers)
+        max_depth (int): 最大嵌套层数 (Maximum nesting depth)
+
+    Returns:
+        m3u8.M3U8: 包含segments的媒体播放列表，获取失败返回None
+            (Media playlist with segments, or None on failure)
+    """
+
+    if aclient is None:
+        async with httpx.AsyncClient(timeout=10.0, verify=False) as aclient:
+            return await get_m3u8_playlist(url, aclient, headers, max_depth)
+
+    for _depth in range(max_depth):
+        try:
+            response = await aclient.get(url, headers=headers, follow_redirects=True)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(_("无法加载m3u8文件：{0}，错误详情：{1}").format(url, e))
+            return
+        except Exception as e:
+            logger.error(_("加载m3u8文件时发生错误：{0}").format(e))
+            return
+
+        playlist = m3u8.loads(response.text, uri=str(response.url))
+
+        # 如果没有segments说明m3u8可能存在嵌套, 需要尝试获取嵌套的m3u8文件
+        # (If there are no segments, the m3u8 may be nested and
+        # you need to try to get the nested m3u8 file)
+        if playlist.segments or not playlist.playlists:
+            return playlist
+
+        logger.debug(_("未找到m3u8文件的segments, 尝试获取嵌套的m3u8文件"))
+        url = playlist.playlists[0].absolute_uri
+
+    logger.error(_("m3u8文件嵌套层数超过 {0} 层：{1}").format(max_depth, url))
+
+
+def get_m3u8_poll_interval(
+    playlist: Union[m3u8.M3U8, None], changed: bool = True
+) -> float:
+    """
+    根据 #EXT-X-TARGETDURATION 计算播放列表的刷新间隔
+    (Compute the playlist reload interval from #EXT-X-TARGETDURATION)
+
+    Args:
+        playlist (m3u8.M3U8): 媒体播放列表 (Media playlist)
+        changed (bool): 上次刷新是否有新片段 (Whether the last reload had new segments)
+
+    Returns:
+        float: 刷新间隔，单位为秒 (Reload interval in seconds)
+
+    Note:
+        参照 RFC 8216 第 6.3.4 节，播放列表未变化时以目标时长的一半重试
+        (Per RFC 8216 section 6.3.4, retry at half the target duration when unchanged)
+    """
+
+    target_duration = 0
+    if playlist is not None:
+        target_duration = playlist.target_duration or (
+            playlist.segments[-1].duration if playlist.segments else 0
+        )
+    target_duration = target_duration or M3U8_DEFAULT_TARGET_DURATION
+
+    return float(target_duration) if changed else target_duration / 2
+
+
+async def get_segments_from_m3u8(
+    url: str, aclient: httpx.AsyncClient = None, headers: dict = None
+) -> Union[list, str, None]:
     """
     从给定的m3u8文件中获取segments
 
     Args:
         url (str): m3u8文件的URL
+        aclient (httpx.AsyncClient): 复用的异步客户端
+        headers (dict): 请求头
 
     Returns:
         m3u8文件中的segments列表
     """
-    # 应该先测试m3u8文件是否存在，以避免出现错误
-    # (You should test if the m3u8 file exists first to avoid errors)
-    try:
-        m3u8_obj = m3u8.load(url)
-    except HTTPError as e:
-        logger.error(_("无法加载m3u8文件：{0}，错误详情：{1}".format(url, e)))
-        return
-    except Exception as e:
-        logger.error(_("加载m3u8文件时发生错误：{0}".format(e)))
+    playlist = await get_m3u8_playlist(url, aclient, headers)
+    if playlist is None:
         return
 
-    # 如果没有segments说明m3u8可能存在嵌套, 需要尝试获取嵌套的m3u8文件
-    # (If there are no segments, the m3u8 may be nested and
-    # you need to try to get the nested m3u8 file)
-    segments = m3u8_obj.segments
+    segments = playlist.segments
     if not segments:
-        logger.debug(_("未找到m3u8文件的segments, 尝试获取嵌套的m3u8文件"))
-        # 尝试获取嵌套的m3u8文件 (Try to get the nested m3u8 file)
-        nested_m3u8_url = m3u8_obj.playlists[0].absolute_uri
-        segments = await get_segments_from_m3u8(nested_m3u8_url)
-        # 再次检查segments是否存在 (Check again if segments exist)
-        if not segments:
-            logger.error(
-                _("未找到嵌套m3u8文件的segments, 可能直播结束或该直播非m3u8格式")
-            )
+        logger.error(_("未找到嵌套m3u8文件的segments, 可能直播结束或该直播非m3u8格式"))
     return segments
 
 
-async def get_segments_duration(url: str) -> Union[list, int, float, None]:
+async def get_segments_duration(
+    url: str, aclient: httpx.AsyncClient = None, headers: dict = None
+) -> Union[list, int, float, None]:
     """
     从给定的m3u8文件中获取segments的duration
 
     Args:
         url (str): m3u8文件的URL
+        aclient (httpx.AsyncClient): 复用的异步客户端
+        headers (dict): 请求头
 
     Returns:
         segments的duration列表
     """
-    segments = await get_segments_from_m3u8(url)
-    return [segment.duration for segment in segments]
+    segments = await get_segments_from_m3u8(url, aclient, headers)
+    return [segment.duration for segment in segments or []]
@@ -0,0 +1,110 @@
+# path: f2/utils/_sign.py
+
+import asyncio
+import functools
+
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional
+
+# 每个执行器任务签名的端点数量 (Endpoints signed per executor task)
+SIGN_CHUNK_SIZE = 64
+
+
+class BatchSignMixin:
+    """
+    批量签名混入类 (Batch Signing Mixin)
+
+    为提供 `model_2_endpoint` 的签名管理器增加批量签名接口。签名是纯 CPU 运算，
+    `sign_many_async` 将参数分块交给线程池或进程池执行，避免大量签名阻塞事件循环。
+
+    类方法:
+    - sign_many: 按顺序为多组参数生成端点。
+    - sign_many_async: 在执行器中批量签名，结果顺序与输入一致。
+    - _sign_kwargs: 子类可覆盖，为每次签名提供额外参数。
+
+    使用示例:
+    ```python
+        endpoints = await ABogusManager.sign_many_async(
+            user_agent, dyendpoint.USER_POST, [params1, params2], executor=pool
+        )
+    ```
+    """
+
+    @classmethod
+    def _sign_kwargs(cls, user_agent: str) -> Dict[str, Any]:
+        return {}
+
+    @classmethod
+    def sign_many(
+        cls,
+        user_agent: str,
+        base_endpoint: str,
+        params_list: List[dict],
+        **kwargs,
+    ) -> List[str]:
+        """
+        按顺序为多组参数生成端点 (Sign multiple parameter sets in order)
+
+        Args:
+            user_agent (str): 用户代理 (User-Agent)
+            base_endpoint (str): 基础端点 (Base endpoint)
+            params_list (List[dict]): 参数字典列表 (List of parameter dicts)
+            kwargs: 传递给 model_2_endpoint 的其他参数 (Extra model_2_endpoint arguments)
+
+        Returns:
+            List[str]: 端点列表 (List of endpoints)
+        """
+        return [
+            cls.model_2_endpoint(user_agent, base_endpoint, params, **kwargs)
+            for params in params_list
+        ]
+
+    @classmethod
+    async def sign_many_async(
+        cls,
+        user_agent: str,
+        base_endpoint: str,
+        params_list: List[dict],
+        executor: Optional[Executor] = None,
+        chunk_size: int = SIGN_CHUNK_SIZE,
+        **kwargs,
+    ) -> List[str]:
+        """
+        在执行器中批量签名，默认使用事件循环的线程池；传入进程池时可利用多核
+        (Sign in an executor, the loop's default thread pool unless one is given;
+        a process pool spreads the work across cores)
+
+        Args:
+            user_agent (str): 用户代理 (User-Agent)
+            base_endpoint (str): 基础端点 (Base endpoint)
+            params_list (List[dict]): 参数字典列表 (List of parameter dicts)
+            executor (Executor): 线程池或进程池 (Thread or process pool)
+            chunk_size (int): 每个任务签名的数量 (Endpoints per task)
+            kwargs: 传递给 model_2_endpoint 的其他参数 (Extra model_2_endpoint arguments)
+
+        Returns:
+            List[str]: 端点列表，顺序与输入一致 (Endpoints in input order)
+        """
+        if not params_list:
+            return []
+
+        kwargs = cls._sign_kwargs(user_agent) | kwargs
+        loop = asyncio.get_running_loop()
+        chunk_size = max(1, chunk_size)
+
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    functools.partial(
+                        cls.sign_many,
+                        user_agent,
+                        base_endpoint,
+                        params_list[start : start + chunk_size],
+                        **kwargs,
+                    ),
+                )
+                for start in range(0, len(params_list), chunk_size)
+            )
+        )
+        return [endpoint for chunk in chunks for endpoint in chunk]
@@ -21,10 +21,78 @@ Change Log  :
 
 import time
 import random
+import hashlib
 
 from gmssl import sm3, func
 from typing import Union, Callable, List, Dict
 
+from f2.utils._bogus import b64encode, pack_codes, rc4_encrypt
+
+
+def _openssl_sm3(data: bytes) -> bytes:
+    """使用 OpenSSL 计算 SM3 摘要 (SM3 digest via OpenSSL)"""
+    return hashlib.new("sm3", data).digest()
+
+
+def _gmssl_sm3(data: bytes) -> bytes:
+    """使用 gmssl 纯 Python 实现计算 SM3 摘要 (SM3 digest via pure-Python gmssl)"""
+    return bytes.fromhex(sm3.sm3_hash(func.bytes_to_list(data)))
+
+
+# 可用的 SM3 实现，按优先级排列 (Available SM3 backends in order of preference)
+SM3_BACKENDS: Dict[str, Callable[[bytes], bytes]] = {
+    "openssl": _openssl_sm3,
+    "gmssl": _gmssl_sm3,
+}
+
+
+def _openssl_sm3_available() -> bool:
+    try:
+        hashlib.new("sm3")
+    except ValueError:
+        return False
+    return True
+
+
+# 默认实现，OpenSSL 不支持 SM3 时回退到 gmssl (Default backend, gmssl as fallback)
+SM3_BACKEND_DEFAULT = "openssl" if _openssl_sm3_available() else "gmssl"
+SM3_BACKEND = SM3_BACKEND_DEFAULT
+_sm3_digest = SM3_BACKENDS[SM3_BACKEND]
+
+
+def set_sm3_backend(name: str) -> None:
+    """
+    切换 SM3 实现 (Switch the SM3 backend).
+
+    Args:
+        name (str): 实现名称，"openssl" 或 "gmssl" (Backend name, "openssl" or "gmssl").
+
+    Raises:
+        ValueError: 实现不存在或当前环境不可用 (Unknown or unavailable backend).
+    """
+    global SM3_BACKEND, _sm3_digest
+
+    if name not in SM3_BACKENDS:
+        raise ValueError(f"Unknown SM3 backend: {name}")
+    if name == "openssl" and not _openssl_sm3_available():
+        raise ValueError("OpenSSL in this environment does not provide SM3")
+
+    SM3_BACKEND = name
+    _sm3_digest = SM3_BACKENDS[name]
+
+
+def sm3_digest(data: bytes) -> bytes:
+    """
+    使用当前 SM3 实现计算摘要 (Compute the SM3 digest with the current backend).
+
+    Args:
+        data (bytes): 输入数据 (Input data).
+
+    Returns:
+        bytes: 32 字节摘要 (32-byte digest).
+    """
+    return _sm3_digest(data)
+
 
 class StringProcessor:
     """
@@ -180,6 +248,7 @@ class CryptoUtility:
     类属性:
         salt (str): 加密盐值 (Encryption salt).
         base64_alphabet (List[str]): 自定义 Base64 字符表 (Custom Base64 alphabet).
+        big_array (Tuple[int]): transform_bytes 的初始状态 (Initial state of transform_bytes).
 
     类方法:
         sm3_to_array(input_data: Union[str, List[int]]) -> List[int]:
@@ -197,12 +266,18 @@ class CryptoUtility:
         transform_bytes(bytes_list: List[int]) -> str:
             对输入的字节列表进行加密/解密操作，返回处理后的字符串。
 
+        transform_codes(codes: List[int]) -> List[int]:
+            transform_bytes 的字符码版本。
+
         base64_encode(input_string: str, selected_alphabet: int = 0) -> str:
             使用自定义字符表对输入字符串进行 Base64 编码。
 
         abogus_encode(abogus_bytes_str: str, selected_alphabet: int) -> str:
             对输入的字节字符串进行自定义 Base64 编码，并添加位移和填充。
 
+        encode_codes(codes: List[int], selected_alphabet: int) -> str:
+            abogus_encode 的字符码版本。
+
         rc4_encrypt(key: bytes, plaintext: str) -> bytes:
             使用 RC4 算法加密数据。
 
@@ -240,6 +315,25 @@ class CryptoUtility:
     ```
     """
 
+    # 初始状态只读，transform_bytes 在副本上运算 (Read-only initial state)
+    # fmt: off
+    big_array = (
+        121, 243,  55, 234, 103,  36,  47, 228,  30, 231, 106,   6, 115,  95,  78, 101, 250, 207, 198,  50,
+        139, 227, 220, 105,  97, 143,  34,  28, 194, 215,  18, 100, 159, 160,  43,   8, 169, 217, 180, 120,
+        247,  45,  90,  11,  27, 197,  46,   3,  84,  72,   5,  68,  62,  56, 221,  75, 144,  79,  73, 161,
+        178,  81,  64, 187, 134, 117, 186, 118,  16, 241, 130,  71,  89, 147, 122, 129,  65,  40,  88, 150,
+        110, 219, 199, 255, 181, 254,  48,   4, 195, 248, 208,  32, 116, 167,  69, 201,  17, 124, 125, 104,
+         96,  83,  80, 127, 236, 108, 154, 126, 204,  15,  20, 135, 112, 158,  13,   1, 188, 164, 210, 237,
+        222,  98, 212,  77, 253,  42, 170, 202,  26,  22,  29, 182, 251,  10, 173, 152,  58, 138,  54, 141,
+        185,  33, 157,  31, 252, 132, 233, 235, 102, 196, 191, 223, 240, 148,  39, 123,  92,  82, 128, 109,
+         57,  24,  38, 113, 209, 245,   2, 119, 153, 229, 189, 214, 230, 174, 232,  63,  52, 205,  86, 140,
+         66, 175, 111, 171, 246, 133, 238, 193,  99,  60,  74,  91, 225,  51,  76,  37, 145, 211, 166, 151,
+        213, 206,   0, 200, 244, 176, 218,  44, 184, 172,  49, 216,  93, 168,  53,  21, 183,  41,  67,  85,
+        224, 155, 226, 242,  87, 177, 146,  70, 190,  12, 162,  19, 137, 114,  25, 165, 163, 192,  23,  59,
+          9,  94, 179, 107,  35,   7, 142, 131, 239, 203, 149, 136,  61, 249,  14, 156
+    )
+    # fmt: on
+
     def __init__(self, salt: str, custom_base64_alphabet: List[str]):
         """
         初始化 CryptoUtility 类
@@ -252,24 +346,6 @@ class CryptoUtility:
         self.salt = salt
         self.base64_alphabet = custom_base64_alphabet
 
-        # fmt: off
-        self.big_array = [
-            121, 243,  55, 234, 103,  36,  47, 228,  30, 231, 106,   6, 115,  95,  78, 101, 250, 207, 198,  50,
-            139, 227, 220, 105,  97, 143,  34,  28, 194, 215,  18, 100, 159, 160,  43,   8, 169, 217, 180, 120,
-            247,  45,  90,  11,  27, 197,  46,   3,  84,  72,   5,  68,  62,  56, 221,  75, 144,  79,  73, 161,
-            178,  81,  64, 187, 134, 117, 186, 118,  16, 241, 130,  71,  89, 147, 122, 129,  65,  40,  88, 150,
-            110, 219, 199, 255, 181, 254,  48,   4, 195, 248, 208,  32, 116, 167,  69, 201,  17, 124, 125, 104,
-             96,  83,  80, 127, 236, 108, 154, 126, 204,  15,  20, 135, 112, 158,  13,   1, 188, 164, 210, 237,
-            222,  98, 212,  77, 253,  42, 170, 202,  26,  22,  29, 182, 251,  10, 173, 152,  58, 138,  54, 141,
-            185,  33, 157,  31, 252, 132, 233, 235, 102, 196, 191, 223, 240, 148,  39, 123,  92,  82, 128, 109,
-             57,  24,  38, 113, 209, 245,   2, 119, 153, 229, 189, 214, 230, 174, 232,  63,  52, 205,  86, 140,
-             66, 175, 111, 171, 246, 133, 238, 193,  99,  60,  74,  91, 225,  51,  76,  37, 145, 211, 166, 151,
-            213, 206,   0, 200, 244, 176, 218,  44, 184, 172,  49, 216,  93, 168,  53,  21, 183,  41,  67,  85,
-            224, 155, 226, 242,  87, 177, 146,  70, 190,  12, 162,  19, 137, 114,  25, 165, 163, 192,  23,  59,
-              9,  94, 179, 107,  35,   7, 142, 131, 239, 203, 149, 136,  61, 249,  14, 156
-        ]
-        # fmt: on
-
     @staticmethod
     def sm3_to_array(input_data: Union[str, List[int]]) -> List[int]:
         """
@@ -287,11 +363,8 @@ class CryptoUtility:
         else:
             input_data_bytes = bytes(input_data)  # 将 List[int] 转换为字节数组
 
-        # 将字节数组转换为适合 sm3.sm3_hash 函数处理的列表格式
-        hex_result = sm3.sm3_hash(func.bytes_to_list(input_data_bytes))
-
-        # 将十六进制字符串结果转换为十进制整数列表
-        return [int(hex_result[i : i + 2], 16) for i in range(0, len(hex_result), 2)]
+        # 优先使用 OpenSSL 的 SM3，不可用时回退到 gmssl
+        return list(_sm3_digest(input_data_bytes))
 
     def add_salt(self, param: str) -> str:
         """
@@ -348,74 +421,64 @@ class CryptoUtility:
         Returns:
             str: 处理后的字符串 (Processed string).
         """
-        # 将字节列表转换为字符字符串
-        bytes_str = StringProcessor.to_char_str(bytes_list)
-        result_str = []
-        index_b = self.big_array[1]
-        initial_value = 0
+        return "".join(map(chr, self.transform_codes(bytes_list)))
+
+    def transform_codes(self, codes: List[int]) -> List[int]:
+        """
+        transform_bytes 的字符码版本，输入中可能包含大于 255 的值
+        (Character-code version of transform_bytes; codes may exceed 255).
+
+        Args:
+            codes (List[int]): 输入的字符码列表 (Input character codes).
+
+        Returns:
+            List[int]: 处理后的字符码列表 (Processed character codes).
+        """
+        # 每次都从初始状态开始，实例可以被复用与并发调用
+        # (Always start from the initial state so the instance can be reused)
+        big_array = list(self.big_array)
+        size = len(big_array)
+        result = [0] * len(codes)
+        index_b = big_array[1]
+        initial_value = value_e = 0
 
-        for index, char in enumerate(bytes_str):
+        for index, char_value in enumerate(codes):
             if index == 0:
-                initial_value = self.big_array[index_b]
+                initial_value = big_array[index_b]
                 sum_initial = index_b + initial_value
 
-                self.big_array[1] = initial_value
-                self.big_array[index_b] = index_b
+                big_array[1] = initial_value
+                big_array[index_b] = index_b
             else:
                 sum_initial = initial_value + value_e
 
-            char_value = ord(char)
-            sum_initial %= len(self.big_array)
-            value_f = self.big_array[sum_initial]
-            encrypted_char = char_value ^ value_f
-            result_str.append(chr(encrypted_char))
+            result[index] = char_value ^ big_array[sum_initial % size]
 
             # 交换数组元素
-            value_e = self.big_array[(index + 2) % len(self.big_array)]
-            sum_initial = (index_b + value_e) % len(self.big_array)
-            initial_value = self.big_array[sum_initial]
-            self.big_array[sum_initial] = self.big_array[
-                (index + 2) % len(self.big_array)
-            ]
-            self.big_array[(index + 2) % len(self.big_array)] = initial_value
-            index_b = sum_initial
+            swap_index = (index + 2) % size
+            value_e = big_array[swap_index]
+            index_b = (index_b + value_e) % size
+            initial_value = big_array[index_b]
+            big_array[index_b] = value_e
+            big_array[swap_index] = initial_value
 
-        return "".join(result_str)
+        return result
 
     def base64_encode(self, input_string: str, selected_alphabet: int = 0) -> str:
         """
         使用自定义字符表对输入字符串进行 Base64 编码 (Encode the input string using a custom Base64 alphabet).
 
         Args:
-            input_string (str): 输入字符串 (Input string).
+            input_string (str): 输入字符串，字符码均小于 256 (Input string of code points below 256).
             selected_alphabet (int): 选择的自定义 Base64 字符表索引 (Selected custom Base64 alphabet index).
 
         Returns:
             str: 编码后的字符串 (Encoded string).
         """
-
-        # 将输入字符串转换为ASCII码的二进制形式
-        binary_string = "".join(["{:08b}".format(ord(char)) for char in input_string])
-
-        # 补全二进制字符串使其长度为6的倍数
-        padding_length = (6 - len(binary_string) % 6) % 6
-        binary_string += "0" * padding_length
-
-        # 将二进制字符串分割为6位一组
-        base64_indices = [
-            int(binary_string[i : i + 6], 2) for i in range(0, len(binary_string), 6)
-        ]
-
-        # 根据自定义字符表生成输出字符串
-        output_string = "".join(
-            [self.base64_alphabet[selected_alphabet][index] for index in base64_indices]
+        return b64encode(
+            input_string.encode("latin-1"), self.base64_alphabet[selected_alphabet]
         )
 
-        # 添加等号填充，使符合 Base64 编码规范
-        output_string += "=" * (padding_length // 2)
-
-        return output_string
-
     def abogus_encode(self, abogus_bytes_str: str, selected_alphabet: int) -> str:
         """
         对输入的字节字符串进行自定义 Base64 编码，并添加位移和填充 (Encode the input byte string using a custom Base64 alphabet, and add shifts and padding).
@@ -427,31 +490,22 @@ class CryptoUtility:
         Returns:
             str: 编码后的字符串 (Encoded string).
         """
-        abogus = []
-
-        for i in range(0, len(abogus_bytes_str), 3):
-            if i + 2 < len(abogus_bytes_str):
-                n = (
-                    (ord(abogus_bytes_str[i]) << 16)
-                    | (ord(abogus_bytes_str[i + 1]) << 8)
-                    | ord(abogus_bytes_str[i + 2])
-                )
-            elif i + 1 < len(abogus_bytes_str):
-                n = (ord(abogus_bytes_str[i]) << 16) | (
-                    ord(abogus_bytes_str[i + 1]) << 8
-                )
-            else:
-                n = ord(abogus_bytes_str[i]) << 16
+        return self.encode_codes(
+            StringProcessor.to_ord_array(abogus_bytes_str), selected_alphabet
+        )
+
+    def encode_codes(self, codes: List[int], selected_alphabet: int) -> str:
+        """
+        abogus_encode 的字符码版本 (Character-code version of abogus_encode).
 
-            for j, k in zip(range(18, -1, -6), (0xFC0000, 0x03F000, 0x0FC0, 0x3F)):
-                if j == 6 and i + 1 >= len(abogus_bytes_str):
-                    break
-                if j == 0 and i + 2 >= len(abogus_bytes_str):
-                    break
-                abogus.append(self.base64_alphabet[selected_alphabet][(n & k) >> j])
+        Args:
+            codes (List[int]): 输入的字符码列表 (Input character codes).
+            selected_alphabet (int): 选择的自定义 Base64 字符表索引 (Selected custom Base64 alphabet index).
 
-        abogus.append("=" * ((4 - len(abogus) % 4) % 4))
-        return "".join(abogus)
+        Returns:
+            str: 编码后的字符串 (Encoded string).
+        """
+        return b64encode(pack_codes(codes), self.base64_alphabet[selected_alphabet])
 
     @staticmethod
     def rc4_encrypt(key: bytes, plaintext: str) -> bytes:
@@ -465,22 +519,7 @@ class CryptoUtility:
         Returns:
             bytes: 加密后的数据 (Encrypted data).
         """
-        S = list(range(256))
-        j = 0
-        for i in range(256):
-            j = (j + S[i] + key[i % len(key)]) % 256
-            S[i], S[j] = S[j], S[i]
-
-        i = j = 0
-        ciphertext = []
-        for char in plaintext:
-            i = (i + 1) % 256
-            j = (j + S[i]) % 256
-            S[i], S[j] = S[j], S[i]
-            K = S[(S[i] + S[j]) % 256]
-            ciphertext.append(ord(char) ^ K)
-
-        return bytes(ciphertext)
+        return rc4_encrypt(key, plaintext.encode("latin-1"))
 
 
 class BrowserFingerprintGenerator:
@@ -588,7 +627,10 @@ class ABogus:
     类属性:
         array1 (List[int]): 加密请求体 (Encrypted request body).
         array2 (List[int]): 加密请求头 (Encrypted request header).
-        array3 (List[int]): 加密 UA (Encrypted User-Agent).
+        array3 (List[int]): 加密 UA，初始化时计算 (Encrypted User-Agent, computed once).
+        empty_body_array (List[int]): 空请求体的哈希数组 (Hash array of an empty body).
+        fp_array (List[int]): 浏览器指纹的 ASCII 码列表 (ASCII codes of the fingerprint).
+        ab_dir (dict): 与请求无关的字段 (Request-independent fields).
         aid (int): AID 值 (AID value).
         pageId (int): 页面 ID (Page ID).
         salt (str): 加密盐值 (Encryption salt).
@@ -607,7 +649,14 @@ class ABogus:
         options 参数用于指定请求的类型，GET 请求使用 [0, 1, 8]，POST 请求使用 [0, 1, 14]。14兼容8，POST同样可以编码params，故写死。
         (The options parameter is used to specify the type of request. GET requests use [0, 1, 8], and POST requests use [0, 1, 14]. 14 is compatible with 8, and POST can also encode params, so it is hardcoded.)
 
+    说明：
+        签名器可以复用，每次生成只对 params 与 body 进行哈希。
+        (A signer can be reused; each signature only hashes the params and body.)
+
     方法:
+        hash_param(param: str) -> List[int]:
+            对请求参数加盐并进行两次 SM3 哈希 (Salt the parameter and hash it twice with SM3).
+
         encode_data(data: str, alphabet_index: int = 0) -> str:
             使用指定的字符表对数据进行 Base64 编码 (Encode the data using the specified Base64 alphabet).
 
@@ -685,29 +734,26 @@ class ABogus:
         ]
         # fmt: on
 
-    def encode_data(self, data: str, alphabet_index: int = 0) -> str:
-        """
-        使用指定的字符表对数据进行 Base64 编码 (Encode the data using the specified Base64 alphabet).
-
-        Args:
-            data (str): 输入数据 (Input data).
-            alphabet_index (int): 自定义字符表索引 (Custom alphabet index).
-
-        Returns:
-            str: 编码后的数据 (Encoded data).
-        """
-        return self.crypto_utility.abogus_encode(data, alphabet_index)
+        # 只与 UA、浏览器指纹、请求选项相关的部分只计算一次，签名时只需哈希 params 与 body
+        # (Everything that depends only on the UA, fingerprint and options is computed
+        # once, so a signature only hashes the params and body)
+        self.array3 = self.crypto_utility.params_to_array(
+            b64encode(
+                self.crypto_utility.rc4_encrypt(self.ua_key, self.user_agent),
+                self.character2,
+            ),
+            add_salt=False,
+        )
+        self.empty_body_array = self.hash_param("")
+        self.fp_array = StringProcessor.to_char_array(self.browser_fp)
+        self.ab_dir = self._build_static_dir()
 
-    def generate_abogus(self, params: str, body: str = "") -> tuple:
+    def _build_static_dir(self) -> dict:
         """
-        生成 abogus 参数 (Generate the ABogus parameter).
-
-        Args:
-            params (str): 请求参数 (Request parameters).
-            body (str): 请求体，GET接口则为空 (Request body, empty for GET interfaces).
+        构建与请求无关的 ab_dir 字段 (Build the request-independent ab_dir fields).
 
         Returns:
-            tuple: params 生成的 abogus 参数 和 ua (ABogus parameter generated by params and ua).
+            dict: 静态字段 (Static fields).
         """
         ab_dir = {
             8: 3,  # 固定
@@ -729,37 +775,6 @@ class ABogus:
             71: 0,  # 固定
         }
 
-        # 开始加密时间
-        start_encryption = int(time.time() * 1000)
-
-        # params参数加盐加密
-        array1 = self.crypto_utility.params_to_array(
-            self.crypto_utility.params_to_array(params)
-        )
-        array2 = self.crypto_utility.params_to_array(
-            self.crypto_utility.params_to_array(body)
-        )
-        array3 = self.crypto_utility.params_to_array(
-            self.crypto_utility.base64_encode(
-                StringProcessor.to_ord_str(
-                    self.crypto_utility.rc4_encrypt(self.ua_key, self.user_agent)
-                ),
-                1,
-            ),
-            add_salt=False,
-        )
-
-        # 结束加密时间
-        end_encryption = int(time.time() * 1000)
-
-        # 插入加密开始时间
-        ab_dir[20] = (start_encryption >> 24) & 255
-        ab_dir[21] = (start_encryption >> 16) & 255
-        ab_dir[22] = (start_encryption >> 8) & 255
-        ab_dir[23] = start_encryption & 255
-        ab_dir[24] = int(start_encryption / 256 / 256 / 256 / 256) >> 0
-        ab_dir[25] = int(start_encryption / 256 / 256 / 256 / 256 / 256) >> 0
-
         # 插入请求头配置
         ab_dir[26] = (self.options[0] >> 24) & 255
         ab_dir[27] = (self.options[0] >> 16) & 255
@@ -778,24 +793,7 @@ class ABogus:
         ab_dir[36] = (self.options[2] >> 8) & 255
         ab_dir[37] = self.options[2] & 255
 
-        # 插入请求体加密
-        ab_dir[38] = array1[21]
-        ab_dir[39] = array1[22]
-        # 插入body加密
-        ab_dir[40] = array2[21]
-        ab_dir[41] = array2[22]
-        # 插入ua加密
-        ab_dir[42] = array3[23]
-        ab_dir[43] = array3[24]
-
-        # 插入加密结束时间
-        ab_dir[44] = (end_encryption >> 24) & 255
-        ab_dir[45] = (end_encryption >> 16) & 255
-        ab_dir[46] = (end_encryption >> 8) & 255
-        ab_dir[47] = end_encryption & 255
         ab_dir[48] = ab_dir[8]
-        ab_dir[49] = int(end_encryption / 256 / 256 / 256 / 256) >> 0
-        ab_dir[50] = int(end_encryption / 256 / 256 / 256 / 256 / 256) >> 0
 
         # 插入固定值
         ab_dir[51] = (self.pageId >> 24) & 255
@@ -813,11 +811,90 @@ class ABogus:
         ab_dir[64] = len(self.browser_fp)
         ab_dir[65] = len(self.browser_fp)
 
+        return ab_dir
+
+    def hash_param(self, param: str) -> List[int]:
+        """
+        对请求参数加盐并进行两次 SM3 哈希 (Salt the parameter and hash it twice with SM3).
+
+        Args:
+            param (str): 请求参数或请求体 (Request parameters or body).
+
+        Returns:
+            List[int]: 哈希数组 (Hash array).
+        """
+        return self.crypto_utility.params_to_array(
+            self.crypto_utility.params_to_array(param)
+        )
+
+    def encode_data(self, data: str, alphabet_index: int = 0) -> str:
+        """
+        使用指定的字符表对数据进行 Base64 编码 (Encode the data using the specified Base64 alphabet).
+
+        Args:
+            data (str): 输入数据 (Input data).
+            alphabet_index (int): 自定义字符表索引 (Custom alphabet index).
+
+        Returns:
+            str: 编码后的数据 (Encoded data).
+        """
+        return self.crypto_utility.abogus_encode(data, alphabet_index)
+
+    def generate_abogus(self, params: str, body: str = "") -> tuple:
+        """
+        生成 abogus 参数 (Generate the ABogus parameter).
+
+        Args:
+            params (str): 请求参数 (Request parameters).
+            body (str): 请求体，GET接口则为空 (Request body, empty for GET interfaces).
+
+        Returns:
+            tuple: params 生成的 abogus 参数 和 ua (ABogus parameter generated by params and ua).
+        """
+        ab_dir = dict(self.ab_dir)
+
+        # 开始加密时间
+        start_encryption = int(time.time() * 1000)
+
+        # params参数加盐加密，UA 与空请求体的结果已在初始化时计算
+        array1 = self.hash_param(params)
+        array2 = self.hash_param(body) if body else self.empty_body_array
+        array3 = self.array3
+
+        # 结束加密时间
+        end_encryption = int(time.time() * 1000)
+
+        # 插入加密开始时间
+        ab_dir[20] = (start_encryption >> 24) & 255
+        ab_dir[21] = (start_encryption >> 16) & 255
+        ab_dir[22] = (start_encryption >> 8) & 255
+        ab_dir[23] = start_encryption & 255
+        ab_dir[24] = int(start_encryption / 256 / 256 / 256 / 256) >> 0
+        ab_dir[25] = int(start_encryption / 256 / 256 / 256 / 256 / 256) >> 0
+
+        # 插入请求体加密
+        ab_dir[38] = array1[21]
+        ab_dir[39] = array1[22]
+        # 插入body加密
+        ab_dir[40] = array2[21]
+        ab_dir[41] = array2[22]
+        # 插入ua加密
+        ab_dir[42] = array3[23]
+        ab_dir[43] = array3[24]
+
+        # 插入加密结束时间
+        ab_dir[44] = (end_encryption >> 24) & 255
+        ab_dir[45] = (end_encryption >> 16) & 255
+        ab_dir[46] = (end_encryption >> 8) & 255
+        ab_dir[47] = end_encryption & 255
+        ab_dir[49] = int(end_encryption / 256 / 256 / 256 / 256) >> 0
+        ab_dir[50] = int(end_encryption / 256 / 256 / 256 / 256 / 256) >> 0
+
         # 获取 ab_dir 中 sort_index 的值
         sorted_values = [ab_dir.get(i, 0) for i in self.sort_index]
 
-        # 将浏览器指纹转换为 ASCII 码列表
-        edge_fp_array = StringProcessor.to_char_array(self.browser_fp)
+        # 浏览器指纹的 ASCII 码列表
+        edge_fp_array = self.fp_array
 
         # 将浏览器指纹长度的低 8 位作为异或值
         ab_xor = (len(self.browser_fp) & 255) >> 8 & 255
@@ -831,12 +908,11 @@ class ABogus:
         sorted_values.extend(edge_fp_array)
         sorted_values.append(ab_xor)
 
-        abogus_bytes_str = (
+        abogus_codes = StringProcessor.to_ord_array(
             StringProcessor.generate_random_bytes()
-            + self.crypto_utility.transform_bytes(sorted_values)
-        )
+        ) + self.crypto_utility.transform_codes(sorted_values)
 
-        abogus = self.crypto_utility.abogus_encode(abogus_bytes_str, 0)
+        abogus = self.crypto_utility.encode_codes(abogus_codes, 0)
         params = "%s&a_bogus=%s" % (params, abogus)
         return (params, abogus, self.user_agent, body)
 
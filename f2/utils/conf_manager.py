@@ -4,9 +4,12 @@ import f2
 import sys
 import yaml
 import click
+import pickle
+import threading
 import traceback
 
 from pathlib import Path
+from typing import Dict, Tuple
 
 from f2.exceptions.file_exceptions import (
     FileNotFound,
@@ -16,6 +19,9 @@ from f2.utils.utils import get_resource_path
 from f2.i18n.translator import _
 from f2.log.logger import logger
 
+# 优先使用 libyaml 的 C 解析器 (Prefer the libyaml C parser when available)
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigManager:
     """
@@ -24,14 +30,22 @@ class ConfigManager:
     该类用于加载、管理和更新应用的配置文件。通过提供的路径读取配置，支持配置文件的备份、更新和保存功能。
     它还可以生成默认配置文件，处理与配置相关的错误，并使用字典格式来组织配置数据。
 
+    解析结果以 pickle 序列化的形式缓存在进程级快照中，并以文件的修改时间和大小作为版本。
+    所有实例共享同一份快照，文件未变化时不会重复解析 YAML；每个实例得到的都是独立的副本，
+    修改配置不会影响其他实例。
+
     类属性:
     - filepath (Path): 配置文件的路径。
     - config (dict): 存储的配置数据，以字典形式表示。
+    - _snapshots (dict): 文件路径到 (版本, 序列化配置) 的映射。
+    - _snapshot_lock (threading.Lock): 保护快照的锁。
 
     类方法:
     - __init__: 初始化配置管理器，加载配置文件。
     - _replace_none: 递归地将字典或列表中的 None 值替换为默认值。
     - load_config: 加载配置文件，处理文件读取和解析错误。
+    - snapshot: 获取配置文件的缓存快照，文件变化时重新解析。
+    - clear_snapshots: 清空进程级配置快照。
     - get_config: 获取指定应用名称的配置数据。
     - save_config: 将配置数据保存到文件。
     - backup_config: 在更新配置前备份当前配置文件。
@@ -55,6 +69,9 @@ class ConfigManager:
     ```
     """
 
+    _snapshots: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+    _snapshot_lock = threading.Lock()
+
     # 如果不传入应用配置路径，则返回项目配置 (If the application conf path is not passed in, the project conf is returned)
     def __init__(self, filepath: str = f2.F2_CONFIG_FILE_PATH):
         if Path(filepath).exists():
@@ -63,7 +80,8 @@ class ConfigManager:
             self.filepath = Path(get_resource_path(filepath))
         self.config = self.load_config()
 
-    def _replace_none(self, data, default=""):
+    @classmethod
+    def _replace_none(cls, data, default=""):
         """
         替换字典中的 None 值为默认值 (Replace None values in the dict with a default value)
 
@@ -76,25 +94,61 @@ class ConfigManager:
         """
         if isinstance(data, dict):
             return {
-                k: (default if v is None else self._replace_none(v, default))
+                k: (default if v is None else cls._replace_none(v, default))
                 for k, v in data.items()
             }
         elif isinstance(data, list):
             return [
-                (default if item is None else self._replace_none(item, default))
+                (default if item is None else cls._replace_none(item, default))
                 for item in data
             ]
         return data
 
+    @classmethod
+    def snapshot(cls, filepath: Path) -> dict:
+        """
+        获取配置文件的缓存快照，文件的修改时间或大小变化时重新解析
+        (Get the cached snapshot of a conf file, re-parsed when its mtime or size changes)
+
+        Args:
+            filepath: Path: 配置文件路径 (conf file path)
+
+        Returns:
+            dict: 配置数据的独立副本 (An independent copy of the conf data)
+        """
+        filepath = Path(filepath)
+        stat = filepath.stat()
+        key = str(filepath.resolve())
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with cls._snapshot_lock:
+            cached = cls._snapshots.get(key)
+        if cached is not None and cached[0] == version:
+            return pickle.loads(cached[1])
+
+        config = yaml.load(filepath.read_text(encoding="utf-8"), Loader=YAML_LOADER)
+        # 遍历配置，替换 None 值为空字符串
+        data = pickle.dumps(
+            cls._replace_none(config or {}), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        with cls._snapshot_lock:
+            cls._snapshots[key] = (version, data)
+        logger.debug(_("已解析配置文件：{0}").format(filepath))
+        return pickle.loads(data)
+
+    @classmethod
+    def clear_snapshots(cls) -> None:
+        """清空进程级配置快照 (Clear the process-wide conf snapshots)"""
+        with cls._snapshot_lock:
+            cls._snapshots.clear()
+
     def load_config(self) -> dict:
         """从文件中加载配置 (Load the conf from the file)"""
 
         if not self.filepath.exists():
             raise FileNotFound(_("配置文件不存在"), self.filepath)
         try:
-            config = yaml.safe_load(self.filepath.read_text(encoding="utf-8")) or {}
-            # 遍历配置，替换 None 值为空字符串
-            return self._replace_none(config)
+            return self.snapshot(self.filepath)
         except PermissionError:
             raise FilePermissionError(_("配置文件路径无读权限"), self.filepath)
         except yaml.YAMLError:
@@ -0,0 +1,226 @@
+# path: f2/utils/json_backend.py
+
+import os
+import json
+import importlib
+import importlib.util
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+JSONInput = Union[bytes, bytearray, str]
+
+# 可选的 JSON 实现，按优先级排列 (Optional JSON backends in order of preference)
+JSON_BACKEND_PREFERENCE = ("orjson", "msgspec", "json")
+
+
+def _json_available(name: str) -> bool:
+    return name == "json" or importlib.util.find_spec(name) is not None
+
+
+def _make_loads(name: str) -> Callable[[JSONInput], Any]:
+    if name == "orjson":
+        return importlib.import_module("orjson").loads
+    if name == "msgspec":
+        return importlib.import_module("msgspec.json").Decoder().decode
+    return json.loads
+
+
+def _make_dumps(name: str) -> Callable[[Any], str]:
+    if name == "orjson":
+        orjson_dumps = importlib.import_module("orjson").dumps
+
+        def dumps(obj: Any) -> str:
+            return orjson_dumps(obj).decode("utf-8")
+
+    elif name == "msgspec":
+        encode = importlib.import_module("msgspec.json").Encoder().encode
+
+        def dumps(obj: Any) -> str:
+            return encode(obj).decode("utf-8")
+
+    else:
+        dumps = _stdlib_dumps
+    return dumps
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _default_backend() -> str:
+    name = os.environ.get("F2_JSON_BACKEND", "")
+    if name in JSON_BACKEND_PREFERENCE and _json_available(name):
+        return name
+    return next(n for n in JSON_BACKEND_PREFERENCE if _json_available(n))
+
+
+# 默认实现，可通过环境变量 F2_JSON_BACKEND 指定 (Default backend, overridable with F2_JSON_BACKEND)
+JSON_BACKEND_DEFAULT = _default_backend()
+JSON_BACKEND = JSON_BACKEND_DEFAULT
+_loads = _make_loads(JSON_BACKEND)
+_dumps = _make_dumps(JSON_BACKEND)
+
+# msgspec 可以只扫描而不解码不需要的字段，安装时用于子树解码
+# (msgspec can skip over unneeded members without decoding them; used for sub-trees when installed)
+MSGSPEC_AVAILABLE = _json_available("msgspec")
+
+# 解码失败时可能抛出的异常，orjson.JSONDecodeError 与 UnicodeDecodeError 均为 ValueError 的子类
+# (Exceptions raised on bad input; orjson.JSONDecodeError and UnicodeDecodeError subclass ValueError)
+JSONDecodeErrors: Tuple[type, ...] = (ValueError,)
+if MSGSPEC_AVAILABLE:
+    JSONDecodeErrors += (importlib.import_module("msgspec").DecodeError,)
+
+_raw_object_decoder = None
+_raw_value_decoder = None
+
+
+def set_json_backend(name: str) -> None:
+    """
+    切换 JSON 实现 (Switch the JSON backend).
+
+    Args:
+        name (str): 实现名称，"orjson"、"msgspec" 或 "json" (Backend name).
+
+    Raises:
+        ValueError: 实现不存在或未安装 (Unknown or not installed backend).
+    """
+    global JSON_BACKEND, _loads, _dumps
+
+    if name not in JSON_BACKEND_PREFERENCE:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if not _json_available(name):
+        raise ValueError(f"JSON backend {name} is not installed")
+
+    JSON_BACKEND = name
+    _loads = _make_loads(name)
+    _dumps = _make_dumps(name)
+
+
+def loads(data: JSONInput) -> Any:
+    """
+    使用当前 JSON 实现解码 (Decode JSON with the current backend).
+
+    直接接受响应的原始字节，无需先解码为 str。
+    (Accepts the raw response bytes without decoding them to str first.)
+
+    Args:
+        data (Union[bytes, bytearray, str]): JSON 文本 (JSON document).
+
+    Returns:
+        Any: 解码后的对象 (Decoded object).
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    使用当前 JSON 实现编码为紧凑的 str，不转义非 ASCII 字符
+    (Encode to a compact str with the current backend, keeping non-ASCII as is)
+
+    快速实现不支持的对象（如超过 64 位的整数）交给标准库处理。
+    (Objects the fast backends reject, such as integers over 64 bits, go to the stdlib.)
+
+    Args:
+        obj (Any): 待编码的对象 (Object to encode).
+
+    Returns:
+        str: JSON 文本 (JSON document).
+    """
+    try:
+        return _dumps(obj)
+    except (TypeError, ValueError, OverflowError):
+        return _stdlib_dumps(obj)
+
+
+def is_blank(content: Optional[bytes]) -> bool:
+    """
+    判断响应体是否为空或只包含空白字符，直接检查字节，不构建 str
+    (Whether a body is empty or whitespace only, checked on bytes without building a str)
+
+    Args:
+        content (bytes): 响应体 (Response body).
+
+    Returns:
+        bool: 是否为空 (Whether the body is blank).
+    """
+    return not content or content.isspace()
+
+
+def _fields_tree(fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    将 "data.list" 形式的字段路径转换为嵌套字典，叶子为 None
+    (Turn dotted field paths into a nested dict with None leaves)
+    """
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.split(".")
+        for key in parents:
+            child = node.get(key, {})
+            if child is None:
+                # 已经选取了整个父级 (The whole parent is already selected)
+                break
+            node = node.setdefault(key, child)
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _select(obj: Any, tree: Dict[str, Any]) -> Any:
+    if not isinstance(obj, dict):
+        return obj
+    return {
+        key: obj[key] if sub is None else _select(obj[key], sub)
+        for key, sub in tree.items()
+        if key in obj
+    }
+
+
+def _select_raw(raw: Any, tree: Dict[str, Any]) -> Any:
+    msgspec = importlib.import_module("msgspec")
+    try:
+        members = _raw_object_decoder.decode(raw)
+    except msgspec.ValidationError:
+        # 不是对象时整体解码 (Not an object, decode it whole)
+        return _raw_value_decoder.decode(raw)
+    return {
+        key: (
+            _raw_value_decoder.decode(members[key])
+            if sub is None
+            else _select_raw(members[key], sub)
+        )
+        for key, sub in tree.items()
+        if key in members
+    }
+
+
+def loads_fields(data: JSONInput, fields: Iterable[str]) -> Any:
+    """
+    只解码指定字段构成的子树 (Decode only the sub-tree made of the given fields).
+
+    字段使用 "." 分隔的对象键路径，如 ("status_code", "data.list")。
+    安装 msgspec 时未选取的成员只被扫描而不会构建 Python 对象；
+    否则使用当前实现完整解码后再裁剪，结果相同。
+    (Fields are dotted object-key paths. With msgspec installed, unselected
+    members are skipped without building Python objects; otherwise the document
+    is decoded with the current backend and pruned, with the same result.)
+
+    Args:
+        data (Union[bytes, bytearray, str]): JSON 文本 (JSON document).
+        fields (Iterable[str]): 需要的字段路径 (Wanted field paths).
+
+    Returns:
+        Any: 只包含所选字段的对象 (Object holding only the selected fields).
+    """
+    global _raw_object_decoder, _raw_value_decoder
+
+    tree = _fields_tree(fields)
+    if not MSGSPEC_AVAILABLE:
+        return _select(loads(data), tree)
+
+    if _raw_object_decoder is None:
+        msgspec = importlib.import_module("msgspec")
+        msgspec_json = importlib.import_module("msgspec.json")
+        _raw_object_decoder = msgspec_json.Decoder(Dict[str, msgspec.Raw])
+        _raw_value_decoder = msgspec_json.Decoder()
+    return _select_raw(data, tree)
@@ -1,10 +1,189 @@
 # path: f2/utils/json_filter.py
 
+import re
 import json
 
+from functools import lru_cache
 from typing import Any, Union, List, Optional
 from jsonpath_ng import parse
 
+from f2.i18n.translator import _
+
+# 进程级 JSONPath 编译缓存的容量 (Capacity of the process-wide JSONPath cache)
+JSONPATH_CACHE_SIZE = 2048
+
+# 简单路径的片段：.field、[index]、[*] (Simple path steps: .field, [index], [*])
+_SIMPLE_STEP_PATTERN = re.compile(
+    r"\.(?P<field>[A-Za-z_][A-Za-z0-9_]*)|\[(?P<index>-?\d+)\]|\[(?P<wildcard>\*)\]"
+)
+# jsonpath_ng 的保留字不能走快速路径 (jsonpath_ng reserved words skip the fast path)
+_RESERVED_FIELDS = {"where"}
+_MISSING = object()
+
+
+class SimpleJSONPath:
+    """
+    简单 JSONPath 访问器 (Simple JSONPath Accessor)
+
+    将只包含 `.field`、`[index]`、`[*]` 的路径（如 `$.user.nickname`、
+    `$.aweme_list[*].video.duration`）编译为直接的 dict/list 访问，
+    语义与 jsonpath_ng 的 Fields、Index、Slice 保持一致，但不经过 PLY 解析器。
+
+    类方法:
+    - compile: 尝试编译表达式，不是简单路径时返回 None。
+    - find_values: 返回所有匹配的值。
+    """
+
+    __slots__ = ("expression", "steps")
+
+    def __init__(self, expression: str, steps: tuple):
+        self.expression = expression
+        self.steps = steps
+
+    @classmethod
+    def compile(cls, expression: str) -> Optional["SimpleJSONPath"]:
+        if not expression.startswith("$"):
+            return None
+
+        steps = []
+        position = 1
+        while position < len(expression):
+            match = _SIMPLE_STEP_PATTERN.match(expression, position)
+            if match is None:
+                return None
+            if match.group("field") is not None:
+                if match.group("field") in _RESERVED_FIELDS:
+                    return None
+                steps.append(("field", match.group("field")))
+            elif match.group("index") is not None:
+                steps.append(("index", int(match.group("index"))))
+            else:
+                steps.append(("wildcard", None))
+            position = match.end()
+
+        return cls(expression, tuple(steps))
+
+    def find_values(self, data: Any) -> List[Any]:
+        values = [data]
+        for kind, arg in self.steps:
+            matched = []
+            for value in values:
+                if kind == "field":
+                    try:
+                        child = value.get(arg, _MISSING)
+                    except (TypeError, AttributeError):
+                        continue
+                    if child is not _MISSING:
+                        matched.append(child)
+                elif kind == "index":
+                    if value and len(value) > arg:
+                        matched.append(value[arg])
+                else:
+                    if not value:
+                        continue
+                    if isinstance(value, (dict, int, str)):
+                        matched.append(value)
+                    else:
+                        matched.extend(value[i] for i in range(len(value)))
+            values = matched
+            if not values:
+                break
+        return values
+
+
+class CompiledJSONPath:
+    """
+    jsonpath_ng 表达式的包装，提供与 SimpleJSONPath 相同的接口
+    (Wrapper around a jsonpath_ng expression exposing the SimpleJSONPath interface)
+    """
+
+    __slots__ = ("expression", "parser")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.parser = parse(expression)
+
+    def find_values(self, data: Any) -> List[Any]:
+        return [match.value for match in self.parser.find(data)]
+
+
+@lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def compile_jsonpath(expression: str) -> Union[SimpleJSONPath, CompiledJSONPath]:
+    """
+    编译 JSONPath 表达式并在进程内缓存，简单路径跳过 jsonpath_ng
+    (Compile a JSONPath expression with a process-wide cache, bypassing
+    jsonpath_ng for simple paths)
+
+    Args:
+        expression: str: JSONPath 表达式
+
+    Returns:
+        Union[SimpleJSONPath, CompiledJSONPath]: 编译后的访问器
+    """
+    return SimpleJSONPath.compile(expression) or CompiledJSONPath(expression)
+
+
+class MemoizedProperty:
+    """
+    实例级缓存的只读属性 (Read-only property memoized per instance)
+
+    Filter 的属性都是对同一份数据的只读查询，首次访问后结果保存在实例的 `_columns` 中，
+    `_to_dict`、`_to_list` 以及属性之间的相互引用都不会重复计算。
+    """
+
+    __slots__ = ("fget", "name")
+
+    def __init__(self, fget, name: str):
+        self.fget = fget
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        columns = instance.__dict__.setdefault("_columns", {})
+        try:
+            return columns[self.name]
+        except KeyError:
+            value = columns[self.name] = self.fget(instance)
+            return value
+
+    def __set__(self, instance, value):
+        raise AttributeError(_("只读属性 {0} 不能赋值").format(self.name))
+
+
+class JSONRowView:
+    """
+    列表类 Filter 中单个条目的轻量视图 (Lightweight view over one entry of a list filter)
+
+    只保存 Filter 与条目索引，访问字段时才从缓存的整列中取值，
+    适合只需要少数几个字段的场景，无需为每个条目构建完整的字典。
+
+    类方法:
+    - _to_dict: 物化为与 `_to_list` 单行相同结构的字典。
+    """
+
+    __slots__ = ("_model", "_index")
+
+    def __init__(self, model: "JSONModel", index: int):
+        self._model = model
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self._model._property_names:
+            raise AttributeError(name)
+
+        values = getattr(self._model, name)
+        # 整页字段（如 has_more）直接返回 (Page-level fields are returned as is)
+        if not isinstance(values, list):
+            return values
+        return values[self._index] if self._index < len(values) else None
+
+    def __repr__(self) -> str:
+        return f"<{type(self._model).__name__} row {self._index}>"
+
+    def _to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self._model._property_names}
+
 
 class JSONModel:
     """
@@ -12,15 +191,24 @@ class JSONModel:
 
     该类用于处理和解析 JSON 数据。通过提供 JSONPath 表达式。
 
-    支持从 JSON 数据中提取单一属性值或列表属性值，并支持缓存 JSONPath 表达式的解析器以提高性能。
+    支持从 JSON 数据中提取单一属性值或列表属性值，JSONPath 表达式在进程内统一编译缓存，
+    简单路径直接访问 dict/list，无需经过 jsonpath_ng。
+
+    子类中定义的只读属性会被替换为 `MemoizedProperty`，每个实例只计算一次；
+    公开属性名在类创建时收集到 `_property_names`，无需在运行时调用 `dir()`。
+
+    子类可以在 `_json_fields` 中声明用到的顶层或 "." 分隔的字段路径，
+    爬虫将其作为 `fields` 传给 `_fetch_get_json` / `_fetch_post_json` 时只解码这些字段构成的子树。
 
     类属性:
     - _data (Any): 存储的 JSON 数据，可以是字典、列表或其他类型。
-    - _cache (dict): 存储已解析的 JSONPath 表达式解析器，用于避免重复解析。
+    - _property_names (tuple): 按名称排序的公开属性名。
+    - _json_fields (tuple): 接口响应需要解码的字段路径，为空时解码整个文档。
 
     类方法:
     - __init__: 初始化 JSONModel 实例并加载数据。
-    - _parse_expression: 缓存并返回 JSONPath 表达式解析器。
+    - _to_views: 返回列表数据中每个条目的 `JSONRowView`。
+    - _parse_expression: 返回进程级缓存中编译好的 JSONPath 访问器。
     - _get_attr_value: 根据 JSONPath 表达式获取单一属性值。
     - _get_list_attr_value: 获取列表属性值，支持字段缺失时补全 None。
 
@@ -43,23 +231,51 @@ class JSONModel:
     ```
     """
 
+    _property_names: tuple = ()
+    _json_fields: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        for name, attr in list(vars(cls).items()):
+            if isinstance(attr, property) and attr.fset is None:
+                setattr(cls, name, MemoizedProperty(attr.fget, name))
+
+        cls._property_names = tuple(
+            name
+            for name in dir(cls)
+            if not name.startswith("_")
+            and isinstance(getattr(cls, name), (property, MemoizedProperty))
+        )
+
     def __init__(self, data: Any):
         self._data = data
-        self._cache = {}  # 缓存解析后的 JSONPath 表达式
+        self._columns = {}
+
+    def _to_views(self, entries_path: str) -> List[JSONRowView]:
+        """
+        返回列表数据中每个条目的轻量视图。
+
+        Args:
+            entries_path: str: 条目列表的 JSONPath 表达式
+
+        Returns:
+            List[JSONRowView]: 条目视图列表
+        """
+        entries = self._get_attr_value(entries_path) or []
+        return [JSONRowView(self, index) for index in range(len(entries))]
 
     def _parse_expression(self, jsonpath_expr: str):
         """
-        缓存 JSONPath 表达式解析器，避免重复解析。
+        返回编译好的 JSONPath 访问器，所有实例共享同一缓存。
 
         Args:
             jsonpath_expr: str: JSONPath 表达式
 
         Returns:
-            jsonpath_ng.jsonpath.JsonPath: JSONPath 表达式解析器
+            Union[SimpleJSONPath, CompiledJSONPath]: JSONPath 访问器
         """
-        if jsonpath_expr not in self._cache:
-            self._cache[jsonpath_expr] = parse(jsonpath_expr)
-        return self._cache[jsonpath_expr]
+        return compile_jsonpath(jsonpath_expr)
 
     def _get_attr_value(self, jsonpath_expr: str) -> Optional[Any]:
         """
@@ -72,15 +288,11 @@ class JSONModel:
             Union[str, int, float, bool]: 属性值
         """
         expr = self._parse_expression(jsonpath_expr)
-        matches = expr.find(self._data)
+        matches = expr.find_values(self._data)
         if not matches:
             return None
         # 如果只有一个结果，直接返回值；多个结果返回列表
-        return (
-            matches[0].value
-            if len(matches) == 1
-            else [match.value for match in matches]
-        )
+        return matches[0] if len(matches) == 1 else matches
 
     def _get_list_attr_value(
         self, jsonpath_expr: str, as_json: bool = False
@@ -106,24 +318,23 @@ class JSONModel:
             child_expr_str = ""
 
         parent_expr = self._parse_expression(parent_expr_str)
-        parent_matches = parent_expr.find(self._data)
+        parent_matches = parent_expr.find_values(self._data)
 
         values = []
         if child_expr_str:
             # 存在子级路径，需要在每个父级元素中查找子属性
             child_expr = self._parse_expression(f'$.{child_expr_str.lstrip(".")}')
-            for match in parent_matches:
-                parent_value = match.value
+            for parent_value in parent_matches:
                 # 在当前父级元素中查找子属性
-                child_matches = child_expr.find(parent_value)
+                child_matches = child_expr.find_values(parent_value)
                 if child_matches:
                     # 假设每个父级元素中子属性只匹配一个值
-                    values.append(child_matches[0].value)
+                    values.append(child_matches[0])
                 else:
                     values.append(None)  # 子级路径缺失时补全 None
         else:
             # 没有子级路径，父级匹配结果即为值
-            values = [match.value for match in parent_matches]
+            values = parent_matches
 
         # 返回 JSON 字符串或列表
         return json.dumps(values, ensure_ascii=False) if as_json else values
@@ -0,0 +1,275 @@
+# path: f2/utils/token_pool.py
+
+import json
+import time
+import asyncio
+import threading
+import traceback
+
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from f2.log.logger import logger, trace_logger
+from f2.i18n.translator import _
+from f2.utils.utils import get_cache_dir
+
+# 每种令牌默认预生成的数量 (Tokens kept ready per kind by default)
+DEFAULT_POOL_SIZE = 3
+# 令牌默认有效期（秒） (Default token lifetime in seconds)
+DEFAULT_POOL_TTL = 1800
+# 后台补充令牌的检查间隔（秒） (Seconds between background refill checks)
+DEFAULT_REFRESH_INTERVAL = 30
+
+PoolFactory = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class TokenPool:
+    """
+    令牌池 (Token Pool)
+
+    为某一种令牌（msToken、ttwid、设备 ID 等）在后台预先生成 size 个值，按轮询方式分发给爬虫，
+    使长时间的爬取在多个身份之间分摊请求，并且不会因为现场生成令牌而阻塞。
+    令牌在有效期 (TTL) 到期或通过 `report_failure` 报告鉴权失败后被淘汰，后台任务随即补充。
+    令牌池在首次使用时从磁盘加载未过期的令牌，并在每次补充后写回磁盘，供下次运行复用。
+
+    类属性:
+    - _pools (dict): 名称到令牌池的映射，用于统一关闭。
+    - name (str): 令牌池名称，同时作为持久化文件名。
+    - factory (Callable): 生成单个令牌的同步或异步函数。
+    - size (int): 预生成的令牌数量。
+    - ttl (float): 令牌有效期（秒）。
+    - refresh_interval (float): 后台补充的检查间隔（秒）。
+    - persist (bool): 是否持久化到磁盘。
+
+    类方法:
+    - start: 在当前事件循环中启动后台补充任务。
+    - stop: 停止后台补充任务并保存令牌。
+    - get: 异步获取下一个令牌，池为空时在线程池或协程中现场生成，不阻塞事件循环。
+    - report_failure: 淘汰鉴权失败的令牌。
+    - load / save: 从磁盘加载或保存令牌。
+    - close_all: 停止全部令牌池。
+
+    使用示例:
+    ```python
+        ttwid_pool = TokenPool("douyin_ttwid", TokenManager.gen_ttwid, ttl=86400)
+        ttwid = await ttwid_pool.get()
+        ...
+        ttwid_pool.report_failure(ttwid)
+        await TokenPool.close_all()
+    ```
+    """
+
+    _pools: Dict[str, "TokenPool"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        factory: PoolFactory,
+        size: int = DEFAULT_POOL_SIZE,
+        ttl: float = DEFAULT_POOL_TTL,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        persist: bool = True,
+    ):
+        self.name = name
+        self.factory = factory
+        self.size = max(1, size)
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.persist = persist
+
+        # (令牌, 过期时间戳) 列表 (List of (token, expiry timestamp))
+        self._tokens: List[list] = []
+        self._index = 0
+        # 正在生成中的令牌数量 (Tokens currently being generated)
+        self._pending = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refill_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._pools[name] = self
+
+    @property
+    def path(self) -> Path:
+        return get_cache_dir("tokens") / f"{self.name}.json"
+
+    @property
+    def fresh_tokens(self) -> List[Any]:
+        with self._lock:
+            self._prune()
+            return [token for token, _expires_at in self._tokens]
+
+    def _prune(self) -> None:
+        now = time.time()
+        self._tokens = [entry for entry in self._tokens if entry[1] > now]
+
+    def load(self) -> None:
+        """
+        从磁盘加载未过期的令牌 (Load unexpired tokens from disk)
+        """
+        self._loaded = True
+        if not self.persist or not self.path.exists():
+            return
+
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+            with self._lock:
+                self._tokens.extend(
+                    [entry["value"], float(entry["expires_at"])] for entry in entries
+                )
+                self._prune()
+            logger.debug(
+                _("从磁盘加载 {0} 个 {1}").format(len(self._tokens), self.name)
+            )
+        except (ValueError, KeyError, TypeError, OSError):
+            logger.warning(_("{0} 令牌缓存文件已损坏，已忽略").format(self.name))
+            trace_logger.error(traceback.format_exc())
+
+    def save(self) -> None:
+        """
+        将未过期的令牌写入磁盘 (Write unexpired tokens to disk)
+        """
+        if not self.persist:
+            return
+
+        with self._lock:
+            self._prune()
+            entries = [
+                {"value": token, "expires_at": expires_at}
+                for token, expires_at in self._tokens
+            ]
+
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _next(self) -> Optional[Any]:
+        with self._lock:
+            self._prune()
+            if not self._tokens:
+                return None
+            token = self._tokens[self._index % len(self._tokens)][0]
+            self._index += 1
+            return token
+
+    def _add(self, token: Any) -> Any:
+        with self._lock:
+            self._tokens.append([token, time.time() + self.ttl])
+        return token
+
+    async def _generate(self) -> Any:
+        self._pending += 1
+        try:
+            if asyncio.iscoroutinefunction(self.factory):
+                token = await self.factory()
+            else:
+                loop = asyncio.get_running_loop()
+                token = await loop.run_in_executor(None, self.factory)
+        finally:
+            self._pending -= 1
+        logger.debug(_("已生成新的 {0}").format(self.name))
+        return self._add(token)
+
+    async def _refill_loop(self) -> None:
+        while True:
+            missing = self.size - len(self.fresh_tokens) - self._pending
+            if missing > 0:
+                results = await asyncio.gather(
+                    *(self._generate() for _i in range(missing)),
+                    return_exceptions=True,
+                )
+                failures = [r for r in results if isinstance(r, Exception)]
+                if failures:
+                    logger.warning(
+                        _("{0} 补充失败 {1} 次：{2}").format(
+                            self.name, len(failures), failures[0]
+                        )
+                    )
+                if len(failures) < len(results):
+                    self.save()
+
+            # 使用 asyncio.wait 而不是 wait_for，避免唤醒与取消同时发生时取消被吞掉
+            # (asyncio.wait keeps a cancellation that races with the wake-up)
+            self._wakeup.clear()
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=self._next_check_delay())
+            finally:
+                waiter.cancel()
+
+    def _next_check_delay(self) -> float:
+        with self._lock:
+            if not self._tokens:
+                return self.refresh_interval
+            soonest = min(expires_at for _token, expires_at in self._tokens)
+        return max(0.0, min(self.refresh_interval, soonest - time.time()))
+
+    def start(self) -> None:
+        """
+        在当前事件循环中启动后台补充任务 (Start the background refill task)
+        """
+        self._ensure_loaded()
+        loop = asyncio.get_running_loop()
+        task = self._refill_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._refill_task = loop.create_task(self._refill_loop())
+
+    async def stop(self) -> None:
+        """
+        停止后台补充任务并保存令牌 (Stop the refill task and save the tokens)
+        """
+        task, self._refill_task = self._refill_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._loaded:
+            self.save()
+
+    async def get(self) -> Any:
+        """
+        按轮询方式获取下一个令牌，池为空时现场生成
+        (Get the next token round-robin, generating one when the pool is empty)
+
+        Returns:
+            Any: 令牌 (Token)
+        """
+        self.start()
+        token = self._next()
+        if token is None:
+            token = await self._generate()
+            self.save()
+        return token
+
+    def report_failure(self, token: Any) -> None:
+        """
+        淘汰鉴权失败的令牌并唤醒后台补充 (Retire a rejected token and wake the refill)
+
+        Args:
+            token (Any): 失效的令牌 (Rejected token)
+        """
+        with self._lock:
+            before = len(self._tokens)
+            self._tokens = [entry for entry in self._tokens if entry[0] != token]
+            removed = before - len(self._tokens)
+
+        if removed:
+            logger.debug(_("{0} 鉴权失败，已从令牌池移除").format(self.name))
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """
+        停止全部令牌池并保存令牌 (Stop every pool and save its tokens)
+        """
+        for pool in list(cls._pools.values()):
+            await pool.stop()
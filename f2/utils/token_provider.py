@@ -0,0 +1,193 @@
+# path: f2/utils/token_provider.py
+
+import time
+import asyncio
+import weakref
+import threading
+import traceback
+
+from typing import Awaitable, Callable, Optional, Union
+
+from f2.log.logger import logger, trace_logger
+from f2.i18n.translator import _
+
+# 令牌默认有效期（秒） (Default token lifetime in seconds)
+DEFAULT_TOKEN_TTL = 1800
+# 生成失败后使用备用令牌的时长（秒） (How long a fallback token is used after a failure)
+DEFAULT_RETRY_AFTER = 60
+
+TokenFactory = Callable[[], Union[str, Awaitable[str]]]
+
+
+class AsyncTokenProvider:
+    """
+    惰性异步令牌提供器 (Lazy Async Token Provider)
+
+    令牌在首次使用时才生成，并在有效期 (TTL) 过期后自动刷新，而不是在模块导入时发起网络请求。
+    同步工厂函数在执行器中运行，不会阻塞事件循环；并发的刷新请求会合并为一次。
+    生成失败时使用 fallback 生成备用令牌，并在 retry_after 秒后重新尝试。
+
+    类属性:
+    - name (str): 令牌名称，用于日志。
+    - factory (Callable): 生成令牌的同步或异步函数。
+    - ttl (float): 令牌有效期（秒）。
+    - fallback (Callable): 生成失败时使用的备用令牌函数。
+    - retry_after (float): 备用令牌的有效期（秒）。
+    - on_failure (Callable): 令牌被报告失效时的回调，例如通知令牌池淘汰该令牌。
+
+    类方法:
+    - get: 异步获取令牌，过期时刷新。
+    - current: 同步获取令牌，供构建请求模型时使用。
+    - invalidate: 使当前令牌失效，下次获取时重新生成。
+    - report_failure: 报告当前令牌鉴权失败，调用 on_failure 后使其失效。
+    - is_fresh: 当前令牌是否仍在有效期内。
+
+    使用示例:
+    ```python
+        provider = AsyncTokenProvider(
+            "msToken", TokenManager.gen_real_msToken, fallback=TokenManager.gen_false_msToken
+        )
+        msToken = await provider.get()
+
+        class BaseRequestModel(BaseModel):
+            msToken: str = Field(default_factory=provider.current)
+    ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: TokenFactory,
+        ttl: float = DEFAULT_TOKEN_TTL,
+        fallback: Optional[Callable[[], str]] = None,
+        retry_after: float = DEFAULT_RETRY_AFTER,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ):
+        self.name = name
+        self.factory = factory
+        self.ttl = ttl
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.on_failure = on_failure
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._async_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._token is not None and time.monotonic() < self._expires_at
+
+    def _store(self, token: str, ttl: float) -> str:
+        self._token = token
+        self._expires_at = time.monotonic() + ttl
+        return token
+
+    def _on_error(self, exc: Exception) -> str:
+        """
+        记录生成失败并返回备用令牌，没有备用函数时重新抛出异常
+        (Log the failure and return a fallback token, re-raising without a fallback)
+
+        Args:
+            exc (Exception): 生成令牌时抛出的异常 (Exception raised by the factory)
+        """
+        if self.fallback is None:
+            raise exc
+        logger.warning(_("{0} 生成失败，暂时使用备用值").format(self.name))
+        trace_logger.error(
+            "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+        )
+        return self._store(self.fallback(), self.retry_after)
+
+    def _generate(self) -> str:
+        try:
+            token = self.factory()
+        except Exception as exc:
+            return self._on_error(exc)
+        logger.debug(_("{0} 已刷新").format(self.name))
+        return self._store(token, self.ttl)
+
+    def _async_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._async_locks.setdefault(loop, asyncio.Lock())
+
+    async def get(self) -> str:
+        """
+        异步获取令牌，过期时刷新 (Get the token, refreshing it once expired)
+
+        Returns:
+            str: 令牌 (Token)
+        """
+        if self.is_fresh:
+            return self._token
+
+        async with self._async_lock():
+            if self.is_fresh:
+                return self._token
+
+            if asyncio.iscoroutinefunction(self.factory):
+                try:
+                    token = await self.factory()
+                except Exception as exc:
+                    return self._on_error(exc)
+                logger.debug(_("{0} 已刷新").format(self.name))
+                return self._store(token, self.ttl)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._generate)
+
+    def current(self) -> str:
+        """
+        同步获取令牌 (Get the token synchronously)
+
+        在事件循环中调用时不会阻塞：已有令牌过期时先返回旧令牌并在后台刷新，
+        尚无令牌时返回备用令牌。没有运行中的事件循环时同步生成令牌。
+        (Never blocks inside a running loop: an expired token is returned while a
+        background refresh runs, and the fallback is used when there is no token yet.
+        Without a running loop the token is generated synchronously.)
+
+        Returns:
+            str: 令牌 (Token)
+        """
+        if self.is_fresh:
+            return self._token
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None and (self._token is not None or self.fallback):
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = loop.create_task(self.get())
+            return self._token if self._token is not None else self.fallback()
+
+        if asyncio.iscoroutinefunction(self.factory):
+            if loop is not None:
+                raise RuntimeError(
+                    _("{0} 尚未生成，请先调用 await get()").format(self.name)
+                )
+            return asyncio.run(self.get())
+
+        with self._lock:
+            if self.is_fresh:
+                return self._token
+            return self._generate()
+
+    def invalidate(self) -> None:
+        """
+        使当前令牌失效，下次获取时重新生成 (Expire the current token)
+        """
+        self._expires_at = 0.0
+
+    def report_failure(self) -> None:
+        """
+        报告当前令牌鉴权失败 (Report that the current token was rejected)
+        """
+        token = self._token
+        self.invalidate()
+        if token is not None and self.on_failure is not None:
+            self.on_failure(token)
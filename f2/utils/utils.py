@@ -1,15 +1,17 @@
 # path: f2/utils/utils.py
 
 import f2
+import os
 import re
 import sys
+import json
+import time
 import httpx
 import random
 import asyncio
 import secrets
 import datetime
 import traceback
-import browser_cookie3
 import importlib_resources
 
 from pathlib import Path
@@ -276,6 +278,24 @@ def extract_valid_urls(inputs: Union[str, List[str]]) -> Union[str, List[str], N
         return valid_urls
 
 
+def get_cache_dir(*parts: str) -> Path:
+    """
+    获取 F2 缓存目录，可通过环境变量 F2_CACHE_DIR 覆盖
+    (Get the F2 cache directory, overridable with the F2_CACHE_DIR environment variable)
+
+    Args:
+        parts: str: 子目录 (sub directories)
+
+    Returns:
+        Path: 已创建的缓存目录 (The created cache directory)
+    """
+
+    base = os.environ.get("F2_CACHE_DIR") or Path.home() / ".cache" / "f2"
+    path = Path(base).joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def get_resource_path(filepath: str) -> Path:
     """
     获取资源文件的路径 (Get the path of the resource file)
@@ -366,6 +386,9 @@ def get_cookie_from_browser(browser_choice: str, domain: str = "") -> dict:
     if not browser_choice or not domain:
         return ""
 
+    # browser_cookie3 导入较慢，仅在需要时导入 (browser_cookie3 is slow to import)
+    import browser_cookie3
+
     BROWSER_FUNCTIONS = {
         "chrome": browser_cookie3.chrome,
         "firefox": browser_cookie3.firefox,
@@ -528,10 +551,69 @@ def check_python_version(min_version: tuple = (3, 10)) -> None:
         sys.exit(1)
 
 
-async def check_f2_version():
-    """用于检查F2的版本是否最新"""
+# 版本检查结果的缓存有效期（秒） (Lifetime of the cached version check in seconds)
+VERSION_CHECK_INTERVAL = 86400
+
+
+def read_version_cache(max_age: float = VERSION_CHECK_INTERVAL) -> Optional[str]:
+    """
+    读取缓存的最新版本号，缓存不存在或已过期时返回 None
+    (Read the cached latest version, None when missing or older than max_age)
+
+    Args:
+        max_age (float): 缓存有效期（秒） (Cache lifetime in seconds)
+
+    Returns:
+        str: 最新版本号 (Latest version)
+    """
+    cache_path = get_cache_dir() / "version.json"
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        if time.time() - float(cache["checked_at"]) < max_age:
+            return cache["latest_version"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def write_version_cache(latest_version: str) -> None:
+    """
+    缓存最新版本号与检查时间 (Cache the latest version and when it was checked)
+
+    Args:
+        latest_version (str): 最新版本号 (Latest version)
+    """
+    cache_path = get_cache_dir() / "version.json"
+    cache_path.write_text(
+        json.dumps({"checked_at": time.time(), "latest_version": latest_version}),
+        encoding="utf-8",
+    )
+
+
+async def refresh_version_cache() -> Optional[str]:
+    """
+    从 PyPI 获取最新版本号并写入缓存 (Fetch the latest version from PyPI and cache it)
 
+    Returns:
+        str: 最新版本号 (Latest version)
+    """
     latest_version = await get_latest_version("f2")
+    if latest_version:
+        write_version_cache(latest_version)
+    return latest_version
+
+
+async def check_f2_version(use_cache: bool = False):
+    """
+    用于检查F2的版本是否最新 (Check whether F2 is up to date)
+
+    Args:
+        use_cache (bool): 优先使用一天内的缓存结果 (Prefer a result cached within a day)
+    """
+
+    latest_version = read_version_cache() if use_cache else None
+    if latest_version is None:
+        latest_version = await refresh_version_cache()
 
     if latest_version:
         if f2.__version__ < latest_version:
@@ -763,6 +845,9 @@ def filter_to_list(
     """
     通用的 `_to_list` 方法实现。
 
+    每个属性（列）只计算一次，再按索引拼接成行，避免对每个条目重复执行 JSONPath 查询。
+    (Each property column is computed once and then zipped into rows.)
+
     Args:
         filter_instance (Any): Filter 实例
         entries_path (str): entries 的路径
@@ -773,42 +858,51 @@ def filter_to_list(
         list: entries 列表
     """
 
-    # 生成属性名称列表，然后过滤掉排除的属性
+    # 使用类创建时收集的属性名称，然后过滤掉排除的属性
     keys = [
         prop_name
-        for prop_name in dir(filter_instance)
-        if not prop_name.startswith("__")
-        and not prop_name.startswith("_")
-        and prop_name not in exclude_fields
+        for prop_name in filter_instance._property_names
+        if prop_name not in exclude_fields
     ]
 
     entries = filter_instance._get_attr_value(entries_path) or []
-    list_dicts = []
+    if not entries:
+        return []
+
     # 使用集合避免重复记录相同的错误
     errors = set()
     extra_fields = extra_fields or {}
 
-    # 遍历每个条目并创建一个字典
-    for entry in entries:
-        d = {key: getattr(filter_instance, key, None) for key in extra_fields}
+    def record_error(key: str, exc: Exception) -> None:
+        if isinstance(exc, TypeError):
+            errors.add(_("字段 {0} 出错: {1}").format(key, str(exc)))
+        else:
+            # 捕获其他未预料的异常
+            errors.add(_("字段 {0} 出现未预料的错误: {1}").format(key, str(exc)))
+
+    # 整页只计算一次每个属性 (Compute each property once per page)
+    extra_values = {key: getattr(filter_instance, key, None) for key in extra_fields}
+    columns = {}
+    for key in keys:
+        try:
+            columns[key] = getattr(filter_instance, key)
+        except Exception as e:
+            record_error(key, e)
+
+    list_dicts = []
+    for index in range(len(entries)):
+        d = dict(extra_values)
         for key in keys:
+            if key not in columns:
+                d[key] = None
+                continue
             try:
-                attr_values = getattr(filter_instance, key)
-                # 当前entry在属性列表中的索引
-                index = entries.index(entry)
+                attr_values = columns[key]
                 # 如果属性值的长度足够则赋值，否则赋None
                 d[key] = attr_values[index] if index < len(attr_values) else None
-            except TypeError as e:
-                # 如果字段已出错，跳过重复记录
-                error_message = _("字段 {0} 出错: {1}").format(key, str(e))
-                if error_message not in errors:
-                    errors.add(error_message)
-                d[key] = None
             except Exception as e:
-                # 捕获其他未预料的异常
-                error_message = _("字段 {0} 出现未预料的错误: {1}").format(key, str(e))
-                if error_message not in errors:
-                    errors.add(error_message)
+                # 如果字段已出错，跳过重复记录
+                record_error(key, e)
                 d[key] = None
 
         list_dicts.append(d)
@@ -23,6 +23,15 @@ import time
 import base64
 import hashlib
 
+from f2.utils._bogus import b64encode, rc4_encrypt
+
+# 空字符串的 md5，再经过一轮 md5 后固定不变 (md5 of md5(""), a constant)
+_EMPTY_MD5_ARRAY = list(
+    bytes.fromhex(
+        hashlib.md5(bytes.fromhex("d41d8cd98f00b204e9800998ecf8427e")).hexdigest()
+    )
+)
+
 
 class XBogus:
     def __init__(self, user_agent: str = "") -> None:
@@ -43,6 +52,14 @@ class XBogus:
             if user_agent is not None and user_agent != ""
             else "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0"
         )
+        # 只与 UA 相关的数组只计算一次 (The UA-dependent array is computed once)
+        self.ua_array = self.md5_str_to_array(
+            self.md5(
+                base64.b64encode(
+                    self.rc4_encrypt(self.ua_key, self.user_agent.encode("ISO-8859-1"))
+                ).decode("ISO-8859-1")
+            )
+        )
 
     def md5_str_to_array(self, md5_str):
         """
@@ -52,15 +69,7 @@ class XBogus:
         if isinstance(md5_str, str) and len(md5_str) > 32:
             return [ord(char) for char in md5_str]
         else:
-            array = []
-            idx = 0
-            while idx < len(md5_str):
-                array.append(
-                    (self.Array[ord(md5_str[idx])] << 4)
-                    | self.Array[ord(md5_str[idx + 1])]
-                )
-                idx += 2
-            return array
+            return list(bytes.fromhex(md5_str))
 
     def md5_encrypt(self, url_params):
         """
@@ -113,27 +122,7 @@ class XBogus:
         使用RC4算法对数据进行加密。
         Encrypt data using the RC4 algorithm.
         """
-        S = list(range(256))
-        j = 0
-        encrypted_data = bytearray()
-
-        # 初始化 S 盒
-        # Initialize the S box
-        for i in range(256):
-            j = (j + S[i] + key[i % len(key)]) % 256
-            S[i], S[j] = S[j], S[i]
-
-        # 生成密文
-        # Generate the ciphertext
-        i = j = 0
-        for byte in data:
-            i = (i + 1) % 256
-            j = (j + S[i]) % 256
-            S[i], S[j] = S[j], S[i]
-            encrypted_byte = byte ^ S[(S[i] + S[j]) % 256]
-            encrypted_data.append(encrypted_byte)
-
-        return encrypted_data
+        return bytearray(rc4_encrypt(key, data))
 
     def calculation(self, a1, a2, a3):
         """
@@ -156,24 +145,14 @@ class XBogus:
         Get the X-Bogus value.
         """
 
-        array1 = self.md5_str_to_array(
-            self.md5(
-                base64.b64encode(
-                    self.rc4_encrypt(self.ua_key, self.user_agent.encode("ISO-8859-1"))
-                ).decode("ISO-8859-1")
-            )
-        )
-
-        array2 = self.md5_str_to_array(
-            self.md5(self.md5_str_to_array("d41d8cd98f00b204e9800998ecf8427e"))
-        )
+        array1 = self.ua_array
+        array2 = _EMPTY_MD5_ARRAY
         url_params_array = self.md5_encrypt(url_params)
 
         timer = int(time.time())
         ct = 536919696
         array3 = []
         array4 = []
-        xb_ = ""
         # fmt: off
         new_array = [
             64, 0.00390625, 1, 12,
@@ -202,23 +181,13 @@ class XBogus:
 
         merge_array = array3 + array4
 
-        garbled_code = self.encoding_conversion2(
-            2,
-            255,
-            self.rc4_encrypt(
-                "ÿ".encode("ISO-8859-1"),
-                self.encoding_conversion(*merge_array).encode("ISO-8859-1"),
-            ).decode("ISO-8859-1"),
+        garbled_code = b"\x02\xff" + rc4_encrypt(
+            b"\xff", self.encoding_conversion(*merge_array).encode("ISO-8859-1")
         )
 
-        idx = 0
-        while idx < len(garbled_code):
-            xb_ += self.calculation(
-                ord(garbled_code[idx]),
-                ord(garbled_code[idx + 1]),
-                ord(garbled_code[idx + 2]),
-            )
-            idx += 3
+        # 每 3 个字节编码为 4 个字符，与 calculation 等价
+        # (Every 3 bytes become 4 characters, equivalent to calculation)
+        xb_ = b64encode(garbled_code, self.character)
         self.params = "%s&X-Bogus=%s" % (url_params, xb_)
         self.xb = xb_
         return (self.params, self.xb, self.user_agent)
@@ -1,6 +1,31 @@
 # path: tests/test_abogus.py
 
-from f2.utils.abogus import ABogus, BrowserFingerprintGenerator
+import time
+import random
+import pytest
+
+from f2.utils import abogus as abogus_module
+from f2.utils.abogus import (
+    ABogus,
+    BrowserFingerprintGenerator,
+    CryptoUtility,
+    SM3_BACKENDS,
+    set_sm3_backend,
+)
+
+openssl_sm3 = pytest.mark.skipif(
+    not abogus_module._openssl_sm3_available(), reason="OpenSSL 未提供 SM3"
+)
+
+SM3_VECTORS = [
+    # GB/T 32905-2016 示例 (Standard test vectors)
+    (b"abc", "66c7f0f462eeedd9d1f2d46bdc10e4e24167c4875cf2f7a2297da02b8f4ba8e0"),
+    (
+        b"abcd" * 16,
+        "debe9ff92275b8a138604889c18e5a4d6fdb70e5387e5765293dcba39c0c5732",
+    ),
+    (b"", "1ab21d8355cfa17f8e61194831e81a8f22bec8c728fefb747ed035eb5082aa2b"),
+]
 
 
 def test_get_abogus():
@@ -16,3 +41,131 @@ def test_get_abogus():
     assert ab is not None
 
     assert len(ab[1]) in [164, 168, 172]
+
+
+def test_reused_signer_matches_fresh_instance(monkeypatch):
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
+    fp = BrowserFingerprintGenerator.generate_fingerprint("Edge")
+    signer = ABogus(user_agent=user_agent, fp=fp)
+
+    monkeypatch.setattr(time, "time", lambda: 1700000000.123)
+    for params, body in [
+        ("device_platform=webapp&aid=6383&count=18", ""),
+        ("device_platform=webapp&aid=6383", "aweme_type=0&item_id=7467485482314763572"),
+    ] * 2:
+        random.seed(42)
+        expected = ABogus(user_agent=user_agent, fp=fp).generate_abogus(params, body)
+        random.seed(42)
+        assert signer.generate_abogus(params, body) == expected
+
+
+@openssl_sm3
+@pytest.mark.parametrize("data, digest", SM3_VECTORS)
+def test_sm3_backends_match(data, digest):
+    for backend in SM3_BACKENDS.values():
+        assert backend(data).hex() == digest
+
+
+@openssl_sm3
+def test_abogus_identical_across_sm3_backends(monkeypatch):
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
+    fp = BrowserFingerprintGenerator.generate_fingerprint("Edge")
+    params = "device_platform=webapp&aid=6383&channel=channel_pc_web&count=18"
+    body = "aweme_type=0&item_id=7467485482314763572"
+    monkeypatch.setattr(time, "time", lambda: 1700000000.123)
+
+    results = []
+    try:
+        for backend in SM3_BACKENDS:
+            set_sm3_backend(backend)
+            random.seed(7)
+            results.append(
+                ABogus(user_agent=user_agent, fp=fp).generate_abogus(params, body)
+            )
+    finally:
+        set_sm3_backend(abogus_module.SM3_BACKEND_DEFAULT)
+
+    assert results[0] == results[1]
+
+
+def test_unknown_sm3_backend():
+    with pytest.raises(ValueError):
+        set_sm3_backend("md5")
+
+
+@pytest.mark.benchmark
+@openssl_sm3
+def test_benchmark_sm3_backends():
+    data = ("device_platform=webapp&aid=6383&channel=channel_pc_web" * 10).encode()
+    rounds = 500
+
+    timings = {}
+    for name, backend in SM3_BACKENDS.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            backend(data)
+        timings[name] = time.perf_counter() - start
+
+    print(
+        "\n"
+        + ", ".join(
+            f"{name}: {elapsed / rounds * 1e6:.1f} µs/次"
+            for name, elapsed in timings.items()
+        )
+    )
+    assert timings["openssl"] < timings["gmssl"]
+
+
+# 固定时间与随机数时，重写前的实现生成的结果 (Outputs of the previous implementation)
+GOLDEN_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
+GOLDEN_FP = "1536|747|1552|830|0|30|0|0|1536|864|1536|864|1536|747|24|24|Win32"
+GOLDEN_PARAMS = "device_platform=webapp&aid=6383&channel=channel_pc_web&aweme_id=7380308675841297704"
+GOLDEN_BODY = "aweme_type=0&item_id=7467485482314763572&play_delta=1&source=0"
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [
+        (
+            "",
+            "dXRZ/d0Vp3nsXjST56KLfY3q6Wa3YQxI0SVkMD2f7xfPqL39HMTa9exoIBGvXFEjwG/-IeYjy4hbT3ohrQ2y8qwf9WXE/25gmDSkKl12so0j53inCLf/E0iw5hsAtFH8svr4iKi8owVtSYyhldAJ5kIlO62-zo0/9RL=",
+        ),
+        (
+            GOLDEN_BODY,
+            "dXRZ/d0Vp3nsXjST56KLfY3q6WGwYQxI0SVkMD2f7OgPqL39HMTa9exoIBGvXFEjwG/-IeYjy4hbT3ohrQ2y8qwf9WXE/25gmDSkKl12so0j53inCLf/E0iw5hsAtFH8svr4iKi8owVtSYyhldAJ5kIlO62-zo0/9-Y=",
+        ),
+    ],
+)
+def test_abogus_golden_vectors(monkeypatch, body, expected):
+    monkeypatch.setattr(time, "time", lambda: 1700000000.123)
+    random.seed(2024)
+
+    ab = ABogus(user_agent=GOLDEN_UA, fp=GOLDEN_FP).generate_abogus(GOLDEN_PARAMS, body)
+
+    assert ab[1] == expected
+
+
+def test_crypto_utility_primitives():
+    crypto = ABogus().crypto_utility
+
+    # 字符码超过 255 时高位并入前一个字节 (Codes above 255 spill into the previous byte)
+    assert crypto.abogus_encode("\x01\x02\u0183", 0) == crypto.abogus_encode(
+        "\x01\x03\x83", 0
+    )
+    assert crypto.abogus_encode("ab", 0)[-1] == "="
+    assert crypto.transform_bytes([1, 2, 3]) == "".join(
+        map(chr, crypto.transform_codes([1, 2, 3]))
+    )
+    assert CryptoUtility.rc4_encrypt(b"Key", "Plaintext").hex() == "bbf316e8d940af0ad3"
+
+
+def test_benchmark_abogus_signatures_per_second():
+    signer = ABogus(user_agent=GOLDEN_UA, fp=GOLDEN_FP)
+    rounds = 200
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        signer.generate_abogus(GOLDEN_PARAMS)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nA-Bogus: {rounds / elapsed:.0f} 次/秒")
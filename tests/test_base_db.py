@@ -0,0 +1,252 @@
+# path: tests/test_base_db.py
+
+import time
+import asyncio
+import pytest
+
+from f2.db.base_db import BaseDB
+
+
+class CountingDB(BaseDB):
+    TABLE_NAME = "items"
+    created = 0
+
+    async def _create_table(self) -> None:
+        await super()._create_table()
+        CountingDB.created += 1
+        await self.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (id TEXT PRIMARY KEY, value TEXT)"
+        )
+        await self.commit()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    CountingDB.created = 0
+    yield str(tmp_path / "items.db")
+
+
+@pytest.mark.asyncio
+async def test_shared_connection_reused(db_path):
+    async with CountingDB(db_path) as db1:
+        conn = db1.conn
+        await db1.execute("INSERT INTO items VALUES (?, ?)", ("1", "a"))
+
+    async with CountingDB(db_path) as db2:
+        assert db2.conn is conn
+        assert await db2.fetch_one("SELECT value FROM items WHERE id=?", ("1",)) == (
+            "a",
+        )
+
+    # 建表只执行一次 (Tables are created once per connection)
+    assert CountingDB.created == 1
+
+    await BaseDB.close_all()
+
+    async with CountingDB(db_path) as db3:
+        assert db3.conn is not conn
+        # 退出上下文时已提交 (Changes were committed on exit)
+        assert await db3.fetch_one("SELECT value FROM items WHERE id=?", ("1",)) == (
+            "a",
+        )
+
+    await BaseDB.close_all()
+
+
+@pytest.mark.asyncio
+async def test_private_connection(db_path):
+    async with CountingDB(db_path, shared_connection=False) as db1:
+        conn = db1.conn
+
+    async with CountingDB(db_path, shared_connection=False) as db2:
+        assert db2.conn is not conn
+
+    assert CountingDB.created == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_upsert(db_path):
+    rows = [
+        {"id": "1", "value": "a"},
+        {"id": "2"},
+        {"id": "3", "value": ["x", "y"], "unknown": 1},
+    ]
+
+    async with CountingDB(db_path, batch_size=2) as db:
+        assert await db.bulk_insert("items", rows, conflict_keys=("id",)) == 3
+        assert await db.fetch_all("SELECT * FROM items ORDER BY id") == [
+            ("1", "a"),
+            ("2", None),
+            ("3", '["x", "y"]'),
+        ]
+
+        # upsert 时 NULL 不覆盖已有值 (NULL does not overwrite existing values)
+        await db.bulk_insert(
+            "items",
+            [{"id": "1"}, {"id": "2", "value": "b"}],
+            conflict_keys=("id",),
+        )
+        # 只插入不存在的行 (Insert missing rows only)
+        await db.bulk_insert(
+            "items",
+            [{"id": "3", "value": "z"}, {"id": "4", "value": "d"}],
+            conflict_keys=("id",),
+            update=False,
+        )
+        assert await db.fetch_all("SELECT * FROM items ORDER BY id") == [
+            ("1", "a"),
+            ("2", "b"),
+            ("3", '["x", "y"]'),
+            ("4", "d"),
+        ]
+
+    await BaseDB.close_all()
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_user_post_page(tmp_path):
+    from f2.apps.douyin.db import AsyncVideoDB
+    from f2.apps.douyin.filter import UserPostFilter
+
+    page = {
+        "aweme_list": [
+            {
+                "aweme_id": str(index),
+                "caption": f"caption {index}",
+                "desc": f"desc {index}",
+                "author": {"sec_uid": "MS4wLjABAAAA"},
+                "images": [{"url_list": [f"https://p3.example.com/{index}.jpeg"]}],
+                "video": {"animated_cover": None},
+            }
+            for index in range(35)
+        ]
+    }
+    rows = UserPostFilter(page)._to_list()
+
+    async with AsyncVideoDB(str(tmp_path / "videos.db")) as db:
+        assert await db.batch_insert_videos(rows, ["images", "cover"]) == 35
+        video = await db.get_video_info(rows[3]["aweme_id"])
+        assert video["desc"] == rows[3]["desc"]
+        assert video["images"] is None
+
+    await BaseDB.close_all()
+
+
+@pytest.mark.asyncio
+async def test_transaction_isolated_on_shared_connection(db_path):
+    async with CountingDB(db_path) as db1, CountingDB(db_path) as db2:
+        entered, release = asyncio.Event(), asyncio.Event()
+
+        async def failing_transaction():
+            async with db1.transaction():
+                await db1.execute("INSERT INTO items VALUES (?, ?)", ("1", "a"))
+                entered.set()
+                await release.wait()
+                raise RuntimeError("batch failed")
+
+        async def concurrent_writer():
+            await db2.execute("INSERT INTO items VALUES (?, ?)", ("2", "b"))
+            await db2.commit()
+
+        task = asyncio.create_task(failing_transaction())
+        await entered.wait()
+
+        # 其他使用者的写入与提交等待事务结束，不会提交一半的事务，也不会被回滚
+        # (Another user's write waits for the transaction instead of committing
+        # half of it or being rolled back with it)
+        writer = asyncio.create_task(concurrent_writer())
+        await asyncio.sleep(0.05)
+        assert not writer.done()
+
+        release.set()
+        with pytest.raises(RuntimeError):
+            await task
+        await writer
+        assert await db2.fetch_all("SELECT * FROM items") == [("2", "b")]
+
+    await BaseDB.close_all()
+
+
+@pytest.mark.asyncio
+async def test_update_last_aweme_ids(tmp_path):
+    from f2.apps.douyin.db import AsyncUserDB
+
+    async with AsyncUserDB(str(tmp_path / "users.db")) as db:
+        for sec_user_id in ("u1", "u2"):
+            await db.add_user_info(sec_user_id=sec_user_id, nickname=sec_user_id)
+        await db.update_last_aweme_ids({"u1": "100", "u2": "200", "missing": "1"})
+
+        assert (await db.get_user_info("u1"))["last_aweme_id"] == "100"
+        assert (await db.get_user_info("u2"))["last_aweme_id"] == "200"
+
+    await BaseDB.close_all()
+
+
+class FailingValue:
+    """绑定参数时通知事件循环，稍作等待后失败 (Signals the loop while bound, then fails)"""
+
+    def __init__(self, loop, started):
+        self.loop = loop
+        self.started = started
+
+    def __conform__(self, protocol):
+        self.loop.call_soon_threadsafe(self.started.set)
+        time.sleep(0.05)
+        raise ValueError("cannot bind")
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_failure_keeps_other_writes(db_path):
+    async with CountingDB(db_path) as db1, CountingDB(db_path) as db2:
+        # 共享连接上其他使用者尚未提交的写入 (Another user's uncommitted write)
+        await db1.execute("INSERT INTO items VALUES (?, ?)", ("0", "kept"))
+
+        started = asyncio.Event()
+
+        async def concurrent_writer():
+            # 在失败的批次执行期间写入 (Write while the failing batch runs)
+            await started.wait()
+            await db1.execute("INSERT INTO items VALUES (?, ?)", ("3", "concurrent"))
+            await db1.commit()
+
+        writer = asyncio.create_task(concurrent_writer())
+        rows = [
+            {"id": "1", "value": "a"},
+            {"id": "2", "value": FailingValue(asyncio.get_running_loop(), started)},
+        ]
+        with pytest.raises(Exception):
+            await db2.bulk_insert("items", rows, batch_size=2)
+        await writer
+
+        # 只回滚失败的批次 (Only the failed batch is rolled back)
+        assert await db1.fetch_all("SELECT * FROM items ORDER BY id") == [
+            ("0", "kept"),
+            ("3", "concurrent"),
+        ]
+
+    await BaseDB.close_all()
+
+
+def test_shared_connection_per_event_loop(db_path):
+    async def write(*values):
+        # 不调用 close_all，模拟 GUI 工作线程各自的事件循环
+        # (No close_all, like GUI workers running their own event loops)
+        async with CountingDB(db_path) as db:
+
+            async def insert(value):
+                async with db.transaction():
+                    await db.execute("INSERT INTO items VALUES (?, ?)", (value, value))
+
+            # 并发事务会争用连接锁 (Concurrent transactions contend for the lock)
+            await asyncio.gather(*(insert(value) for value in values))
+            return await db.fetch_all("SELECT id FROM items ORDER BY id")
+
+    assert asyncio.run(write("1", "2")) == [("1",), ("2",)]
+    assert asyncio.run(write("3", "4")) == [("1",), ("2",), ("3",), ("4",)]
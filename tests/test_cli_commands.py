@@ -11,10 +11,12 @@ from f2.cli.cli_commands import (
     handle_version,
     handle_debug,
     handle_last_version,
+    handle_profile_startup,
     set_cli_config,
     DynamicGroup,
 )
 from f2 import __version__ as f2_version
+from f2.utils import utils
 from f2.i18n.translator import _
 
 
@@ -153,3 +155,40 @@ def test_cli_options(args, expected_output):
         assert expected_output in result.output
     except SystemExit as e:
         pytest.fail(f"SystemExit with exit code {e.code} occurred: {e}")
+
+
+# 测试版本检查缓存
+@pytest.mark.asyncio
+async def test_check_version_uses_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("F2_CACHE_DIR", str(tmp_path))
+
+    async def fail_fetch(package_name):
+        pytest.fail("version cache should avoid network access")
+
+    assert utils.read_version_cache() is None
+    utils.write_version_cache("999.0.0")
+    assert utils.read_version_cache() == "999.0.0"
+    assert utils.read_version_cache(max_age=0) is None
+
+    monkeypatch.setattr(utils, "get_latest_version", fail_fetch)
+    await utils.check_f2_version(use_cache=True)
+    assert "999.0.0" in capsys.readouterr().out
+
+
+# 测试 --profile-startup
+def test_profile_startup():
+    runner = CliRunner()
+
+    @click.command()
+    @click.option(
+        "--profile-startup",
+        is_flag=True,
+        expose_value=False,
+        callback=handle_profile_startup,
+    )
+    def cli():
+        pass
+
+    result = runner.invoke(cli, ["--profile-startup"])
+    assert result.exit_code == 0
+    assert "f2.cli.cli_commands" in result.output
@@ -0,0 +1,112 @@
+# path: tests/test_client_pool.py
+
+import httpx
+import pytest
+
+from f2.crawlers.base_crawler import BaseCrawler
+from f2.crawlers.client_pool import AsyncClientPool, MAX_POOLED_TRANSPORTS
+
+kwargs = {
+    "proxies": {"http://": None, "https://": None},
+    "timeout": 10,
+    "max_connections": 10,
+}
+
+
+class ClosingTransport(httpx.MockTransport):
+    """记录是否被关闭的模拟传输层"""
+
+    closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def _pool_key(crawler: BaseCrawler):
+    return AsyncClientPool.make_key(
+        crawler.http_proxy, crawler.limits, crawler._max_retries, crawler._http2
+    )
+
+
+@pytest.mark.asyncio
+async def test_crawlers_share_pooled_transport():
+    async with BaseCrawler(kwargs, crawler_headers={"User-Agent": "f2"}) as c1:
+        c1.aclient
+        transport = c1._transport
+
+    # 退出上下文后共享传输层仍然可用 (Pooled transport survives crawler close)
+    assert AsyncClientPool.is_pooled(transport)
+
+    async with BaseCrawler(kwargs, crawler_headers={"User-Agent": "f2"}) as c2:
+        c2.aclient
+        assert c2._transport is transport
+
+    await AsyncClientPool.aclose_all()
+    assert not AsyncClientPool.is_pooled(transport)
+
+
+@pytest.mark.asyncio
+async def test_pool_key_ignores_headers():
+    c1 = BaseCrawler(kwargs, crawler_headers={"Cookie": "msToken=a; ttwid=1"})
+    c2 = BaseCrawler(kwargs, crawler_headers={"Cookie": "msToken=b; ttwid=2"})
+    c3 = BaseCrawler(
+        kwargs | {"max_connections": 20}, crawler_headers={"Cookie": "msToken=a"}
+    )
+
+    assert c1.aclient is not c2.aclient
+    assert c1._transport is c2._transport
+    assert c1._transport is not c3._transport
+
+    await AsyncClientPool.aclose_all()
+
+
+@pytest.mark.asyncio
+async def test_pooled_crawlers_keep_own_headers_and_cookies():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("Cookie"))
+        return httpx.Response(200, headers={"Set-Cookie": "sessionid=leaked"})
+
+    c1 = BaseCrawler(kwargs, crawler_headers={"Cookie": "ttwid=1"})
+    c2 = BaseCrawler(kwargs)
+    AsyncClientPool.acquire(_pool_key(c1), lambda: httpx.MockTransport(handler))
+
+    await c1.aclient.get("https://example.com/a")
+    await c2.aclient.get("https://example.com/b")
+    await c1.aclient.get("https://example.com/c")
+
+    assert c1._transport is c2._transport
+    # 其他爬虫收到的 Set-Cookie 不会出现在本爬虫的请求中
+    assert seen == ["ttwid=1", None, "ttwid=1"]
+
+    await AsyncClientPool.aclose_all()
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_least_recently_used():
+    transports = [ClosingTransport(None) for _ in range(MAX_POOLED_TRANSPORTS + 1)]
+    limits = [httpx.Limits(max_connections=i + 1) for i in range(len(transports))]
+
+    for limit, transport in zip(limits, transports):
+        key = AsyncClientPool.make_key(None, limit)
+        assert AsyncClientPool.acquire(key, lambda: transport) is transport
+        # 第一个传输层始终保持最近使用 (Keep the first transport recently used)
+        AsyncClientPool.acquire(AsyncClientPool.make_key(None, limits[0]), None)
+
+    assert AsyncClientPool.is_pooled(transports[0])
+    assert not AsyncClientPool.is_pooled(transports[1])
+    assert all(AsyncClientPool.is_pooled(t) for t in transports[2:])
+
+    # 被淘汰的传输层在关闭池时一并关闭 (Evicted transports are closed with the pool)
+    await AsyncClientPool.aclose_all()
+    assert all(t.closed for t in transports)
+
+
+@pytest.mark.asyncio
+async def test_pool_can_be_disabled():
+    async with BaseCrawler(kwargs | {"client_pool": False}) as crawler:
+        aclient = crawler.aclient
+        assert crawler._transport is None
+
+    assert aclient.is_closed
@@ -0,0 +1,45 @@
+# path: tests/test_conf_manager.py
+
+import os
+import yaml
+
+from f2.utils import conf_manager
+from f2.utils.conf_manager import ConfigManager
+
+
+def write_conf(path, data: dict, mtime_ns: int):
+    path.write_text(yaml.dump(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_snapshot_parses_once(tmp_path, monkeypatch):
+    conf_path = tmp_path / "app.yaml"
+    write_conf(conf_path, {"douyin": {"cookie": "a", "proxies": None}}, 10**18)
+
+    calls = []
+    real_load = yaml.load
+
+    def counting_load(*args, **kwargs):
+        calls.append(1)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(conf_manager.yaml, "load", counting_load)
+
+    first = ConfigManager(str(conf_path))
+    second = ConfigManager(str(conf_path))
+    assert len(calls) == 1
+    assert first.get_config("douyin") == {"cookie": "a", "proxies": ""}
+
+    # 每个实例得到独立副本 (Each instance gets its own copy)
+    first.get_config("douyin")["cookie"] = "changed"
+    assert second.get_config("douyin")["cookie"] == "a"
+    assert ConfigManager(str(conf_path)).get_config("douyin")["cookie"] == "a"
+
+
+def test_snapshot_detects_changes(tmp_path):
+    conf_path = tmp_path / "app.yaml"
+    write_conf(conf_path, {"douyin": {"cookie": "a"}}, 10**18)
+    assert ConfigManager(str(conf_path)).get_config("douyin")["cookie"] == "a"
+
+    write_conf(conf_path, {"douyin": {"cookie": "b"}}, 10**18 + 1)
+    assert ConfigManager(str(conf_path)).get_config("douyin")["cookie"] == "b"
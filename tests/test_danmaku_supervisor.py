@@ -0,0 +1,251 @@
+# path: tests/test_danmaku_supervisor.py
+
+import gzip
+import json
+import asyncio
+import pytest
+import websockets
+
+from websockets.exceptions import ConnectionClosedOK
+
+from f2.crawlers.base_crawler import WebSocketCrawler, WebSocketQueueStats
+from f2.crawlers.danmaku_supervisor import DanmakuRelayServer, DanmakuSupervisor
+from f2.apps.tiktok.crawler import TiktokWebSocketCrawler
+from f2.apps.tiktok.proto.tiktok_webcast_pb2 import (
+    ChatMessage,
+    ControlMessage,
+    Message,
+    PushFrame,
+    Response,
+)
+
+
+class StubCrawler:
+    """模拟一次连接，收到若干消息后断开 (One fake connection)"""
+
+    queue_depth = 0
+
+    def __init__(self, cursor: str, messages: int):
+        self.stats = WebSocketQueueStats()
+        self.stats.received = messages
+        self.stats.messages = messages
+        self.cursor = cursor
+        self.internal_ext = f"ext-{cursor}"
+
+
+class FakeWebSocket:
+    """按顺序返回帧，之后一直等待直到被关闭 (Replays frames, then idles until closed)"""
+
+    def __init__(self, frames=()):
+        self.frames = list(frames)
+        self.closed = False
+        self._closed = asyncio.Event()
+
+    async def recv(self):
+        if self.frames and not self.closed:
+            await asyncio.sleep(0)
+            return self.frames.pop(0)
+        await self._closed.wait()
+        raise ConnectionClosedOK(None, None)
+
+    async def send(self, data):
+        pass
+
+    async def close(self):
+        self.closed = True
+        self._closed.set()
+
+
+def push_frame(method: str, payload: bytes) -> bytes:
+    response = Response(messages=[Message(method=method, payload=payload)])
+    return PushFrame(
+        payload=gzip.compress(response.SerializeToString())
+    ).SerializeToString()
+
+
+def crawler_connector(frames, attempts, timeout=10):
+    """使用真实的 TiktokWebSocketCrawler 与模拟连接 (Real crawler over a fake socket)"""
+
+    async def connect(room, relay):
+        crawler = TiktokWebSocketCrawler(
+            {"show_message": False, "timeout": timeout},
+            callbacks={"WebcastChatMessage": TiktokWebSocketCrawler.WebcastChatMessage},
+            relay=relay,
+            channel=room.room_id,
+        )
+        crawler.websocket = FakeWebSocket(frames)
+        attempts.append(crawler)
+        room.attach(crawler)
+        try:
+            return await crawler.receive_messages()
+        finally:
+            room.detach(crawler)
+
+    return connect
+
+
+def make_supervisor(connect, **kwargs):
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("stable_after", 60)
+    return DanmakuSupervisor(connect, "127.0.0.1", 0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_reconnect_resumes_cursor():
+    seen = []
+
+    async def connect(room, relay):
+        seen.append((room.room_id, room.cursor, room.internal_ext))
+        crawler = StubCrawler(f"{room.room_id}-{len(seen)}", messages=3)
+        room.attach(crawler)
+        try:
+            return "ended" if room.connections == 3 else "closed"
+        finally:
+            room.detach(crawler)
+
+    supervisor = make_supervisor(connect)
+    supervisor.add_room("1", cursor="c0", internal_ext="e0", user_unique_id="u")
+    stats = await supervisor.run()
+
+    assert seen[0] == ("1", "c0", "e0")
+    assert seen[1] == ("1", "1-1", "ext-1-1")
+    assert seen[2] == ("1", "1-2", "ext-1-2")
+    assert supervisor.rooms["1"].extra == {"user_unique_id": "u"}
+    assert stats["1"]["state"] == "ended"
+    assert stats["1"]["connections"] == 3
+    assert stats["1"]["reconnects"] == 2
+    assert stats["1"]["messages"] == 9
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    calls = {"ok": 0, "bad": 0}
+
+    async def connect(room, relay):
+        calls[room.room_id] += 1
+        if room.room_id == "bad":
+            raise ConnectionError("refused")
+        return "ended"
+
+    supervisor = make_supervisor(connect, max_retries=3)
+    supervisor.add_room("ok")
+    supervisor.add_room("bad")
+    stats = await supervisor.run()
+
+    assert calls == {"ok": 1, "bad": 4}
+    assert stats["ok"]["state"] == "ended"
+    assert stats["bad"]["state"] == "failed"
+
+
+def test_backoff_is_capped_with_jitter():
+    supervisor = make_supervisor(None, backoff_base=1, backoff_max=8)
+    assert 0.5 <= supervisor._backoff(0) <= 1
+    assert 4 <= supervisor._backoff(3) <= 8
+    assert 4 <= supervisor._backoff(30) <= 8
+
+
+@pytest.mark.asyncio
+async def test_relay_channels():
+    relay = DanmakuRelayServer("127.0.0.1", 0)
+    await relay.start()
+    port = relay._server.sockets[0].getsockname()[1]
+
+    try:
+        async with (
+            websockets.connect(f"ws://127.0.0.1:{port}/1") as room_client,
+            websockets.connect(f"ws://127.0.0.1:{port}/") as all_client,
+        ):
+            while relay.client_count < 2:
+                await asyncio.sleep(0.01)
+
+            relay.publish("2", {"content": "其他直播间"})
+            relay.publish("1", {"content": "弹幕"})
+
+            assert json.loads(await room_client.recv()) == {"content": "弹幕"}
+            assert json.loads(await all_client.recv()) == {
+                "room_id": "2",
+                "data": {"content": "其他直播间"},
+            }
+            assert json.loads(await all_client.recv())["room_id"] == "1"
+    finally:
+        await relay.stop()
+
+
+@pytest.mark.asyncio
+async def test_control_message_ends_room():
+    frames = [
+        push_frame(
+            "WebcastChatMessage", ChatMessage(content="弹幕").SerializeToString()
+        ),
+        push_frame(
+            "WebcastControlMessage", ControlMessage(status=3).SerializeToString()
+        ),
+    ]
+    attempts = []
+
+    supervisor = make_supervisor(crawler_connector(frames, attempts))
+    supervisor.add_room("1")
+    stats = await asyncio.wait_for(supervisor.run(), timeout=5)
+
+    assert len(attempts) == 1
+    assert attempts[0].live_ended
+    assert stats["1"]["state"] == "ended"
+    assert stats["1"]["messages"] == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_timeouts_do_not_reset_backoff():
+    attempts = []
+
+    # 连接持续时间超过 stable_after 但没有收到任何数据 (Long-lived but silent)
+    supervisor = make_supervisor(
+        crawler_connector([], attempts, timeout=0.01), stable_after=0, max_retries=2
+    )
+    supervisor.add_room("1")
+    stats = await asyncio.wait_for(supervisor.run(), timeout=5)
+
+    assert len(attempts) == 3
+    assert stats["1"]["state"] == "failed"
+
+
+class OutOfOrderCrawler(WebSocketCrawler):
+    """帧 (cursor, 处理耗时) 并发处理，较早的帧较晚处理完 (Earlier frames finish later)"""
+
+    def __init__(self, frames):
+        super().__init__(wss_headers={}, timeout=10, workers=len(frames))
+        self.websocket = FakeWebSocket(frames)
+        self.finished = []
+
+    async def on_message(self, message):
+        cursor, delay = message
+        await asyncio.sleep(delay)
+        self.record_resume(cursor, f"ext-{cursor}")
+        self.finished.append(cursor)
+
+
+@pytest.mark.asyncio
+async def test_resume_from_newest_frame_after_out_of_order_processing():
+    seen = []
+    crawlers = []
+
+    async def connect(room, relay):
+        seen.append(room.cursor)
+        if len(seen) == 2:
+            return "ended"
+        crawler = OutOfOrderCrawler([("1", 0.05), ("2", 0.0)])
+        crawlers.append(crawler)
+        room.attach(crawler)
+        try:
+            # 模拟连接断开 (Simulate a dropped connection)
+            asyncio.get_running_loop().call_later(0.02, crawler.websocket._closed.set)
+            return await crawler.receive_messages()
+        finally:
+            room.detach(crawler)
+
+    supervisor = make_supervisor(connect)
+    supervisor.add_room("1")
+    await asyncio.wait_for(supervisor.run(), timeout=5)
+
+    assert crawlers[0].finished == ["2", "1"]
+    assert seen == ["", "2"]
+    assert supervisor.rooms["1"].internal_ext == "ext-2"
@@ -1,11 +1,14 @@
 # path: tests/test_dl.py
 
+import json
+import httpx
 import pytest
 
 from pathlib import Path
 from unittest import mock
 
 from f2.dl.base_downloader import BaseDownloader
+from f2.utils._dl import get_m3u8_playlist, get_m3u8_poll_interval
 
 kwargs = {
     "headers": {"User-Agent": "", "Referer": ""},
@@ -61,3 +64,249 @@ async def test_download_video(tmp_path: Path):
 
     # 验证文件已被删除
     assert not full_path.exists(), f"文件 {filename} 删除失败"
+
+
+def _range_transport(payload: bytes, requests: list):
+    """模拟支持 Range 请求的文件服务器"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method != "GET":
+            return httpx.Response(405)
+        start, _, end = request.headers["Range"].split("=")[1].partition("-")
+        start, end = int(start), int(end or len(payload) - 1)
+        if start >= len(payload):
+            return httpx.Response(
+                416, headers={"Content-Range": f"bytes */{len(payload)}"}
+            )
+        return httpx.Response(
+            206,
+            headers={"Content-Range": f"bytes {start}-{end}/{len(payload)}"},
+            content=payload[start : end + 1],
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_download_file_resume_without_probe(tmp_path: Path):
+    payload = bytes(range(256)) * 64
+    requests = []
+    full_path = tmp_path / "video.mp4"
+    # 模拟已下载一半的临时文件
+    full_path.with_suffix(".tmp").write_bytes(payload[:1000])
+
+    async with BaseDownloader(kwargs | {"client_pool": False}) as downloader:
+        downloader._aclient = httpx.AsyncClient(
+            transport=_range_transport(payload, requests)
+        )
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_file(task_id, "http://example.com/v", full_path)
+
+    assert full_path.read_bytes() == payload
+    # 只发送一次范围请求，没有额外的 HEAD 探测
+    assert [r.method for r in requests] == ["GET"]
+    assert requests[0].headers["Range"] == "bytes=1000-"
+
+
+VARIANT_PLAYLIST = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=1280000
+media/index.m3u8
+"""
+
+MEDIA_PLAYLIST = """#EXTM3U
+#EXT-X-TARGETDURATION:4
+#EXT-X-MEDIA-SEQUENCE:7
+#EXTINF:4.0,
+seg7.ts
+#EXTINF:4.0,
+seg8.ts
+"""
+
+
+@pytest.mark.asyncio
+async def test_get_m3u8_playlist_follows_variant():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/live/index.m3u8":
+            return httpx.Response(200, text=VARIANT_PLAYLIST)
+        if request.url.path == "/live/media/index.m3u8":
+            return httpx.Response(200, text=MEDIA_PLAYLIST)
+        return httpx.Response(404)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as aclient:
+        playlist = await get_m3u8_playlist(
+            "http://example.com/live/index.m3u8", aclient
+        )
+        missing = await get_m3u8_playlist("http://example.com/none.m3u8", aclient)
+
+    assert missing is None
+    assert playlist.media_sequence == 7
+    assert [s.absolute_uri for s in playlist.segments] == [
+        "http://example.com/live/media/seg7.ts",
+        "http://example.com/live/media/seg8.ts",
+    ]
+    assert get_m3u8_poll_interval(playlist) == 4
+    assert get_m3u8_poll_interval(playlist, changed=False) == 2
+
+
+@pytest.mark.asyncio
+async def test_download_m3u8_stream_pipeline(tmp_path: Path):
+    playlists = [
+        "#EXTM3U\n#EXT-X-TARGETDURATION:1\n#EXT-X-MEDIA-SEQUENCE:0\n"
+        "#EXTINF:1.0,\nseg0.ts\n#EXTINF:1.0,\nseg1.ts\n",
+        "#EXTM3U\n#EXT-X-TARGETDURATION:1\n#EXT-X-MEDIA-SEQUENCE:1\n"
+        "#EXTINF:1.0,\nseg1.ts\n#EXTINF:1.0,\nseg2.ts\n#EXT-X-ENDLIST\n",
+    ]
+    fetched = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(".m3u8"):
+            return httpx.Response(200, text=playlists.pop(0))
+        fetched.append(request.url.path)
+        return httpx.Response(200, content=request.url.path.encode())
+
+    full_path = tmp_path / "live.flv"
+    async with BaseDownloader(kwargs | {"client_pool": False}) as downloader:
+        downloader._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_m3u8_stream(
+            task_id, "http://example.com/live/index.m3u8", full_path
+        )
+
+    # 重复出现的片段只下载一次，并按媒体序号写入
+    assert sorted(fetched) == ["/live/seg0.ts", "/live/seg1.ts", "/live/seg2.ts"]
+    assert full_path.read_bytes() == b"/live/seg0.ts/live/seg1.ts/live/seg2.ts"
+
+
+@pytest.mark.asyncio
+async def test_download_file_segmented(tmp_path: Path):
+    payload = bytes(range(256)) * (9 * 4096)  # 9 MiB
+    requests = []
+    full_path = tmp_path / "large.mp4"
+
+    options = kwargs | {
+        "client_pool": False,
+        "segmented_download": True,
+        "segment_threshold": 1,
+        "segment_connections": 4,
+    }
+    async with BaseDownloader(options) as downloader:
+        downloader._aclient = httpx.AsyncClient(
+            transport=_range_transport(payload, requests)
+        )
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_file(task_id, "http://example.com/v", full_path)
+
+    assert full_path.read_bytes() == payload
+    assert not full_path.with_suffix(".ranges").exists()
+    # 首个请求用于获取文件大小，其后每个分段一个请求
+    assert len(requests) == 1 + 2
+
+
+@pytest.mark.asyncio
+async def test_download_file_segmented_resume(tmp_path: Path):
+    payload = bytes(range(256)) * (9 * 4096)
+    half = len(payload) // 2
+    requests = []
+    full_path = tmp_path / "large.mp4"
+    tmp_file = full_path.with_suffix(".tmp")
+    tmp_file.write_bytes(payload[:half] + b"\0" * (len(payload) - half))
+    full_path.with_suffix(".ranges").write_text(
+        json.dumps(
+            {
+                "content_length": len(payload),
+                "ranges": [[0, half - 1, half], [half, len(payload) - 1, 100]],
+            }
+        )
+    )
+    with open(tmp_file, "r+b") as f:
+        f.seek(half)
+        f.write(payload[half : half + 100])
+
+    async with BaseDownloader(kwargs | {"client_pool": False}) as downloader:
+        downloader._aclient = httpx.AsyncClient(
+            transport=_range_transport(payload, requests)
+        )
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_file(task_id, "http://example.com/v", full_path)
+
+    assert full_path.read_bytes() == payload
+    # 只续传未完成分段的剩余部分
+    assert [r.headers["Range"] for r in requests] == [
+        f"bytes={half + 100}-{len(payload) - 1}"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_download_file_stale_ranges_without_tmp(tmp_path: Path):
+    payload = bytes(range(256)) * 64
+    requests = []
+    full_path = tmp_path / "video.mp4"
+    # 进度文件还在，但临时文件已被删除
+    full_path.with_suffix(".ranges").write_text(
+        json.dumps({"content_length": len(payload), "ranges": [[0, 99, 50]]})
+    )
+
+    async with BaseDownloader(kwargs | {"client_pool": False}) as downloader:
+        downloader._aclient = httpx.AsyncClient(
+            transport=_range_transport(payload, requests)
+        )
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_file(task_id, "http://example.com/v", full_path)
+
+    assert full_path.read_bytes() == payload
+    assert not full_path.with_suffix(".ranges").exists()
+    assert [r.headers["Range"] for r in requests] == ["bytes=0-"]
+
+
+@pytest.mark.asyncio
+async def test_download_file_corrupt_ranges(tmp_path: Path):
+    payload = bytes(range(256)) * 64
+    requests = []
+    full_path = tmp_path / "video.mp4"
+    # 写入中途崩溃留下的截断进度文件，临时文件已预分配为完整大小
+    full_path.with_suffix(".tmp").write_bytes(b"\0" * len(payload))
+    full_path.with_suffix(".ranges").write_text('{"content_length": 16384, "ran')
+
+    async with BaseDownloader(kwargs | {"client_pool": False}) as downloader:
+        downloader._aclient = httpx.AsyncClient(
+            transport=_range_transport(payload, requests)
+        )
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_file(task_id, "http://example.com/v", full_path)
+
+    assert full_path.read_bytes() == payload
+    assert not full_path.with_suffix(".ranges").exists()
+    assert [r.headers["Range"] for r in requests] == ["bytes=0-"]
+
+
+@pytest.mark.asyncio
+async def test_download_file_segmented_falls_back_without_206(tmp_path: Path):
+    payload = bytes(range(256)) * (9 * 4096)
+    requests = []
+    range_transport = _range_transport(payload, [])
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        # 首个请求支持范围，其后服务器忽略 Range 返回完整内容
+        if len(requests) == 1:
+            return await range_transport.handle_async_request(request)
+        return httpx.Response(200, content=payload)
+
+    full_path = tmp_path / "large.mp4"
+    options = kwargs | {
+        "client_pool": False,
+        "segmented_download": True,
+        "segment_threshold": 1,
+        "segment_connections": 4,
+    }
+    async with BaseDownloader(options) as downloader:
+        downloader._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        task_id = await downloader.progress.add_task(description="", filename="")
+        await downloader.download_file(task_id, "http://example.com/v", full_path)
+
+    assert full_path.read_bytes() == payload
+    assert not full_path.with_suffix(".ranges").exists()
+    assert not full_path.with_suffix(".ranges.tmp").exists()
+    # 分段请求失败后改为单连接从头下载
+    assert requests[-1].headers["Range"] == "bytes=0-"
@@ -0,0 +1,156 @@
+# path: tests/test_filter_to_list.py
+
+import time
+import pytest
+
+from f2.apps.douyin.filter import UserPostFilter
+from f2.utils.json_filter import MemoizedProperty
+from f2.utils.utils import filter_to_list
+
+
+def make_aweme(index: int) -> dict:
+    """按主页作品接口的结构构造单个作品 (Build one item shaped like the user post API)"""
+    return {
+        "aweme_id": str(7300000000000000000 + index),
+        "aweme_type": 0 if index % 3 else 68,
+        "create_time": 1700000000 + index * 3600,
+        "caption": f"caption {index}",
+        "desc": f"desc #{index}\ttab",
+        "author": {
+            "uid": "123456",
+            "sec_uid": "MS4wLjABAAAA",
+            "nickname": "nick\tname",
+            "avatar_thumb": {"url_list": ["https://p3.example.com/avatar.jpeg"]},
+        },
+        "images": (
+            [
+                {
+                    "url_list": [f"https://p3.example.com/{index}_{i}.jpeg"],
+                    "video": None,
+                }
+                for i in range(4)
+            ]
+            if index % 3 == 0
+            else None
+        ),
+        "video": {
+            "duration": 15000 + index,
+            "origin_cover": {"url_list": [f"https://p3.example.com/{index}.jpeg"]},
+            "bit_rate": [
+                {
+                    "bit_rate": 1200000,
+                    "play_addr": {"url_list": [f"https://v3.example.com/{index}.mp4"]},
+                }
+            ],
+            "animated_cover": None,
+        },
+        "status": {"part_see": 0, "private_status": 0, "is_prohibited": False},
+        "music": {
+            "author_deleted": False,
+            "status": 1,
+            "title": f"music {index}",
+            "play_url": {"url_list": [f"https://m.example.com/{index}.mp3"]},
+        },
+    }
+
+
+def make_page(count: int = 35) -> dict:
+    return {
+        "status_code": 0,
+        "has_more": 1,
+        "max_cursor": 1700000000000,
+        "min_cursor": 1600000000000,
+        "aweme_list": [make_aweme(i) for i in range(count)],
+    }
+
+
+def uncached_getattr(filter_instance, key, *default):
+    """绕过属性缓存，模拟旧版每次访问都重新计算"""
+    attr = getattr(type(filter_instance), key, None)
+    if isinstance(attr, MemoizedProperty):
+        filter_instance._columns.clear()
+        return attr.fget(filter_instance)
+    return getattr(filter_instance, key, *default)
+
+
+def legacy_filter_to_list(filter_instance, entries_path, exclude_fields, extra_fields):
+    """旧版逐条目重算所有属性的实现，用于对比结果与耗时"""
+    keys = [
+        prop_name
+        for prop_name in dir(filter_instance)
+        if not prop_name.startswith("_") and prop_name not in exclude_fields
+    ]
+    entries = filter_instance._get_attr_value(entries_path) or []
+    list_dicts = []
+    for entry in entries:
+        d = {key: uncached_getattr(filter_instance, key, None) for key in extra_fields}
+        for key in keys:
+            try:
+                attr_values = uncached_getattr(filter_instance, key)
+                index = entries.index(entry)
+                d[key] = attr_values[index] if index < len(attr_values) else None
+            except Exception:
+                d[key] = None
+        list_dicts.append(d)
+    return list_dicts
+
+
+EXCLUDE_FIELDS = [
+    "status_code",
+    "has_more",
+    "max_cursor",
+    "min_cursor",
+    "has_aweme",
+    "locate_item_cursor",
+]
+EXTRA_FIELDS = ["status_code", "has_more", "max_cursor", "min_cursor"]
+
+
+def test_to_list_matches_legacy_rows():
+    page = make_page()
+    rows = UserPostFilter(page)._to_list()
+    legacy_rows = legacy_filter_to_list(
+        UserPostFilter(page), "$.aweme_list", EXCLUDE_FIELDS, EXTRA_FIELDS
+    )
+
+    assert len(rows) == 35
+    assert rows == legacy_rows
+    assert rows[3]["aweme_id"] == "7300000000000000003"
+    assert rows[3]["images"] == [f"https://p3.example.com/3_{i}.jpeg" for i in range(4)]
+
+
+def test_to_list_empty_page():
+    assert UserPostFilter({"aweme_list": []})._to_list() == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [35])
+def test_benchmark_to_list(count):
+    page = make_page(count)
+
+    start = time.perf_counter()
+    filter_to_list(UserPostFilter(page), "$.aweme_list", EXCLUDE_FIELDS, EXTRA_FIELDS)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_filter_to_list(
+        UserPostFilter(page), "$.aweme_list", EXCLUDE_FIELDS, EXTRA_FIELDS
+    )
+    legacy_elapsed = time.perf_counter() - start
+
+    print(
+        f"\n_to_list({count} 条): {elapsed * 1000:.2f} ms, "
+        f"旧实现: {legacy_elapsed * 1000:.2f} ms"
+    )
+    assert elapsed < legacy_elapsed
+
+
+def test_row_views_match_rows():
+    post = UserPostFilter(make_page())
+    rows = post._to_list()
+    views = post._to_views("$.aweme_list")
+
+    assert len(views) == len(rows)
+    for view, row in zip(views, rows):
+        assert view.aweme_id == row["aweme_id"]
+        assert view.images == row["images"]
@@ -0,0 +1,105 @@
+# path: tests/test_json_backend.py
+
+import httpx
+import pytest
+
+from f2.utils import json_backend
+from f2.utils.json_backend import (
+    JSON_BACKEND_PREFERENCE,
+    dumps,
+    is_blank,
+    loads,
+    loads_fields,
+    set_json_backend,
+)
+from f2.utils.json_filter import JSONModel
+from f2.crawlers.base_crawler import BaseCrawler
+
+DOCUMENT = (
+    '{"status_code": 0, "has_more": 1, '
+    '"aweme_list": [{"aweme_id": "1", "desc": "测试"}], '
+    '"extra": {"now": 1700000000, "logid": "abc"}, "log_pb": {"impr_id": "x"}}'
+).encode("utf-8")
+
+AVAILABLE_BACKENDS = [
+    name for name in JSON_BACKEND_PREFERENCE if json_backend._json_available(name)
+]
+
+
+@pytest.fixture
+def backend():
+    yield
+    set_json_backend(json_backend.JSON_BACKEND_DEFAULT)
+
+
+@pytest.mark.parametrize("name", AVAILABLE_BACKENDS)
+def test_backends_agree(backend, name):
+    set_json_backend(name)
+    assert loads(DOCUMENT)["aweme_list"][0]["desc"] == "测试"
+    assert loads(DOCUMENT.decode("utf-8"))["extra"]["now"] == 1700000000
+
+
+@pytest.mark.parametrize("name", AVAILABLE_BACKENDS)
+def test_dumps_is_compact_and_unescaped(backend, name):
+    set_json_backend(name)
+    assert dumps({"desc": "测试", "ids": [1, 2]}) == '{"desc":"测试","ids":[1,2]}'
+    # 超过 64 位的整数交给标准库 (Integers over 64 bits fall back to the stdlib)
+    assert dumps({"id": 2**70}) == '{"id":%d}' % 2**70
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_json_backend("simplejson")
+
+
+def test_is_blank():
+    assert is_blank(b"")
+    assert is_blank(None)
+    assert is_blank(b" \r\n\t")
+    assert not is_blank(b" {} ")
+
+
+@pytest.mark.parametrize("msgspec_available", [False, json_backend.MSGSPEC_AVAILABLE])
+def test_loads_fields(monkeypatch, msgspec_available):
+    monkeypatch.setattr(json_backend, "MSGSPEC_AVAILABLE", msgspec_available)
+
+    data = loads_fields(DOCUMENT, ("status_code", "extra.logid", "missing"))
+    assert data == {"status_code": 0, "extra": {"logid": "abc"}}
+
+    # 父级已被整体选取时忽略子路径 (A child path is ignored once its parent is selected)
+    data = loads_fields(DOCUMENT, ("extra", "extra.logid", "aweme_list.aweme_id"))
+    assert data == {
+        "extra": {"now": 1700000000, "logid": "abc"},
+        "aweme_list": [{"aweme_id": "1", "desc": "测试"}],
+    }
+
+
+def test_model_json_fields():
+    class PageFilter(JSONModel):
+        _json_fields = ("status_code", "aweme_list")
+
+        @property
+        def aweme_id(self):
+            return self._get_list_attr_value("$.aweme_list[*].aweme_id")
+
+    crawler = BaseCrawler()
+    request = httpx.Request("GET", "https://example.com/api")
+    response = httpx.Response(200, content=DOCUMENT, request=request)
+
+    model = PageFilter(crawler.parse_json(response, PageFilter._json_fields))
+    assert model.aweme_id == ["1"]
+    assert set(model._data) == {"status_code", "aweme_list"}
+    assert crawler.parse_json(response, JSONModel._json_fields) == loads(DOCUMENT)
+
+
+def test_parse_json_from_bytes():
+    crawler = BaseCrawler()
+    request = httpx.Request("GET", "https://example.com/api")
+
+    response = httpx.Response(200, content=DOCUMENT, request=request)
+    assert crawler.parse_json(response) == loads(DOCUMENT)
+    assert crawler.parse_json(response, ("has_more",)) == {"has_more": 1}
+
+    broken = httpx.Response(200, content=b'{"status_code": ', request=request)
+    assert crawler.parse_json(broken) == {}
+    assert crawler.parse_json(httpx.Response(500, request=request)) == {}
@@ -1,6 +1,16 @@
 # path: tests/test_json_filter.py
 
-from f2.utils.json_filter import JSONModel
+import pytest
+
+from jsonpath_ng import parse
+
+from f2.utils.json_filter import (
+    JSONModel,
+    JSONRowView,
+    SimpleJSONPath,
+    CompiledJSONPath,
+    compile_jsonpath,
+)
 
 # 测试数据
 data = {
@@ -238,3 +248,150 @@ class TestJSONModel:
         model = JSONModel(union_data)
         result = model._get_attr_value("$.example[0:5:2].a")
         assert result == [1, 3, 5], "应当正确处理联合索引"
+
+
+class TestCompiledJSONPath:
+
+    sample = {
+        "user": {"nickname": "f2", "avatar": {"url_list": ["a", "b"]}, "room": None},
+        "aweme_list": [
+            {"video": {"duration": 1}, "images": None},
+            {"video": {"duration": 2}, "images": [{"url_list": ["x"]}]},
+            {"video": None},
+            "text",
+        ],
+        "single": {"video": {"duration": 3}},
+        "number": 7,
+        "empty": [],
+    }
+
+    paths = [
+        "$.user.nickname",
+        "$.user.room",
+        "$.user.room.id",
+        "$.user.missing",
+        "$.user.avatar.url_list[0]",
+        "$.user.avatar.url_list[-1]",
+        "$.user.avatar.url_list[5]",
+        "$.aweme_list[*].video.duration",
+        "$.aweme_list[*].images[0].url_list[0]",
+        "$.aweme_list[*]",
+        "$.single[*].video.duration",
+        "$.number[*]",
+        "$.empty[*].a",
+    ]
+
+    def test_simple_paths_use_fast_path(self):
+        for path in self.paths:
+            assert isinstance(compile_jsonpath(path), SimpleJSONPath), path
+
+    def test_filter_expressions_fall_back(self):
+        assert isinstance(compile_jsonpath("$.example[1:4].a"), CompiledJSONPath)
+        assert isinstance(compile_jsonpath("$.data.data.[*].a"), CompiledJSONPath)
+
+    def test_fast_path_matches_jsonpath_ng(self):
+        for path in self.paths:
+            expected = [match.value for match in parse(path).find(self.sample)]
+            assert compile_jsonpath(path).find_values(self.sample) == expected, path
+
+    def test_cache_is_shared(self):
+        assert compile_jsonpath("$.user.nickname") is compile_jsonpath(
+            "$.user.nickname"
+        )
+
+
+class CountingFilter(JSONModel):
+    calls = 0
+
+    @property
+    def has_more(self):
+        return self._get_attr_value("$.has_more")
+
+    @property
+    def name(self):
+        CountingFilter.calls += 1
+        return self._get_list_attr_value("$.example[*].name")
+
+    @property
+    def upper_name(self):
+        return [n.upper() if n else n for n in self.name]
+
+
+class TestMemoizedProperty:
+
+    def setup_method(self):
+        CountingFilter.calls = 0
+        self.model = CountingFilter(
+            {"has_more": 1, "example": [{"name": "a"}, {"name": "b"}, {}]}
+        )
+
+    def test_property_names_collected_once(self):
+        assert CountingFilter._property_names == ("has_more", "name", "upper_name")
+
+    def test_property_computed_once_per_instance(self):
+        assert self.model.upper_name == ["A", "B", None]
+        assert self.model.name == ["a", "b", None]
+        assert CountingFilter.calls == 1
+
+        CountingFilter({"example": []}).name
+        assert CountingFilter.calls == 2
+
+    def test_property_is_read_only(self):
+        with pytest.raises(AttributeError):
+            self.model.name = []
+
+    def test_row_views(self):
+        views = self.model._to_views("$.example")
+
+        assert len(views) == 3
+        assert isinstance(views[0], JSONRowView)
+        assert views[1].name == "b"
+        assert views[2].upper_name is None
+        assert views[0].has_more == 1
+        assert views[0]._to_dict() == {"has_more": 1, "name": "a", "upper_name": "A"}
+        assert CountingFilter.calls == 1
+
+        with pytest.raises(AttributeError):
+            views[0].missing
+        with pytest.raises(AttributeError):
+            views[0].extra = 1
+
+
+@pytest.mark.asyncio
+async def test_post_comment_decodes_only_filter_fields():
+    import httpx
+
+    from f2.apps.douyin.crawler import DouyinCrawler
+    from f2.apps.douyin.filter import PostCommentFilter
+    from f2.apps.douyin.model import PostComment
+    from f2.utils.json_backend import dumps
+
+    document = {
+        "status_code": 0,
+        "has_more": 1,
+        "total": 2,
+        "cursor": 20,
+        "comments": [
+            {"cid": "1", "text": "a", "user": {"uid": "10", "nickname": "x"}},
+            {"cid": "2", "text": "b", "user": {"uid": "11", "nickname": "y"}},
+        ],
+        "extra": {"now": 1700000000, "fatal_item_ids": []},
+        "log_pb": {"impr_id": "abc"},
+    }
+
+    crawler = DouyinCrawler({"cookie": "", "client_pool": False})
+
+    async def get_fetch_data(url: str) -> httpx.Response:
+        request = httpx.Request("GET", url)
+        return httpx.Response(200, content=dumps(document), request=request)
+
+    crawler.get_fetch_data = get_fetch_data
+    response = await crawler.fetch_post_comment(
+        PostComment(aweme_id="1", msToken="token")
+    )
+
+    assert set(response) == set(PostCommentFilter._json_fields)
+    comment = PostCommentFilter(response)
+    assert comment.comment_id == ["1", "2"]
+    assert comment.nickname_raw == ["x", "y"]
+    assert comment.has_more == 1 and comment.cursor == 20
@@ -3,7 +3,7 @@
 import pytest
 import logging
 from pathlib import Path
-from f2.log.logger import LogManager
+from f2.log.logger import LazyLogger, LazyValue, LogManager
 
 LOG_DIR = Path("./test_logs")
 
@@ -50,3 +50,101 @@ def test_clean_logs(log_manager):
     manager.clean_logs(keep_last_n=3)
     log_files = list(temp_log_dir.glob("*.log"))
     assert len(log_files) == 1
+
+
+class CountingRepr:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "payload"
+
+
+@pytest.fixture
+def lazy_logger():
+    handler_records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            handler_records.append(record.getMessage())
+
+    test_logger = logging.getLogger("f2-lazy-test")
+    test_logger.handlers.clear()
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(ListHandler())
+    test_logger.addHandler(ListHandler())
+    yield LazyLogger(test_logger), handler_records
+    test_logger.handlers.clear()
+
+
+def test_lazy_logger_skips_disabled_levels(lazy_logger):
+    lazy, records = lazy_logger
+    payload = CountingRepr()
+
+    lazy.debug("[WssPackage] [{0}]", payload)
+    assert payload.calls == 0
+    assert records == []
+
+    # 两个 handler 共享同一次格式化 (Both handlers share one formatting pass)
+    lazy.info("[WssPackage] [{0}]", payload)
+    assert payload.calls == 1
+    assert records == ["[WssPackage] [payload]"] * 2
+
+
+def test_lazy_logger_sampling(lazy_logger):
+    lazy, records = lazy_logger
+
+    for i in range(7):
+        lazy.info("frame {0}", i, every=3)
+    assert records[::2] == [
+        "frame 0",
+        "frame 3 [已省略 2 条同类日志]",
+        "frame 6 [已省略 2 条同类日志]",
+    ]
+
+
+def test_lazy_logger_rate_limit(lazy_logger, monkeypatch):
+    lazy, records = lazy_logger
+    clock = [100.0]
+    monkeypatch.setattr("f2.log.logger.time.monotonic", lambda: clock[0])
+    formatted = []
+
+    def stamp(value):
+        formatted.append(value)
+        return value
+
+    for i in range(5):
+        lazy.info("recv {0}", LazyValue(stamp, i), interval=5)
+    clock[0] += 5
+    lazy.info("recv {0}", LazyValue(stamp, 5), interval=5)
+    # 不同 key 独立限流 (Keys are limited independently)
+    lazy.info("recv {0}", LazyValue(stamp, 6), interval=5, key="other")
+
+    assert records[::2] == ["recv 0", "recv 5 [已省略 4 条同类日志]", "recv 6"]
+    assert formatted == [0, 5, 6]
+
+
+def test_lazy_logger_records_the_caller():
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    test_logger = logging.getLogger("f2-lazy-caller-test")
+    test_logger.handlers.clear()
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(ListHandler())
+    lazy = LazyLogger(test_logger)
+
+    lazy.info("via helper")
+    lazy.log(logging.INFO, "via log")
+    test_logger.handlers.clear()
+
+    assert [record.funcName for record in records] == [
+        "test_lazy_logger_records_the_caller"
+    ] * 2
+    assert {record.filename for record in records} == {"test_logger.py"}
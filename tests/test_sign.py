@@ -0,0 +1,65 @@
+# path: tests/test_sign.py
+
+import pytest
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from f2.apps.douyin.utils import ABogusManager, XBogusManager
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
+BASE_ENDPOINT = "https://www.douyin.com/aweme/v1/web/aweme/post/"
+PARAMS_LIST = [
+    {"device_platform": "webapp", "aid": 6383, "max_cursor": cursor, "count": 18}
+    for cursor in range(0, 2000, 100)
+]
+
+
+def strip_signature(endpoint: str) -> str:
+    return endpoint.rsplit("&", 1)[0]
+
+
+def test_sign_many_keeps_order():
+    endpoints = XBogusManager.sign_many(USER_AGENT, BASE_ENDPOINT, PARAMS_LIST)
+
+    assert len(endpoints) == len(PARAMS_LIST)
+    for endpoint, params in zip(endpoints, PARAMS_LIST):
+        assert f"max_cursor={params['max_cursor']}&" in endpoint
+        assert "&X-Bogus=" in endpoint
+
+
+@pytest.mark.asyncio
+async def test_sign_many_async_thread_pool():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        endpoints = await ABogusManager.sign_many_async(
+            USER_AGENT, BASE_ENDPOINT, PARAMS_LIST, executor=pool, chunk_size=3
+        )
+
+    expected = [
+        ABogusManager.model_2_endpoint(USER_AGENT, BASE_ENDPOINT, params)
+        for params in PARAMS_LIST
+    ]
+    assert [strip_signature(e) for e in endpoints] == [
+        strip_signature(e) for e in expected
+    ]
+    assert all("&a_bogus=" in endpoint for endpoint in endpoints)
+
+
+@pytest.mark.asyncio
+async def test_sign_many_async_process_pool():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        endpoints = await ABogusManager.sign_many_async(
+            USER_AGENT, BASE_ENDPOINT, PARAMS_LIST, executor=pool, chunk_size=5
+        )
+
+    assert len(endpoints) == len(PARAMS_LIST)
+    assert [strip_signature(e) for e in endpoints] == [
+        strip_signature(
+            ABogusManager.model_2_endpoint(USER_AGENT, BASE_ENDPOINT, params)
+        )
+        for params in PARAMS_LIST
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sign_many_async_empty():
+    assert await XBogusManager.sign_many_async(USER_AGENT, BASE_ENDPOINT, []) == []
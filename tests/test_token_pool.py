@@ -0,0 +1,137 @@
+# path: tests/test_token_pool.py
+
+import asyncio
+import pytest
+
+from f2.utils.token_pool import TokenPool
+from f2.utils.token_provider import AsyncTokenProvider
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("F2_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+class CountingFactory:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        return f"token-{self.calls}"
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_pool_prefills_and_round_robins():
+    factory = CountingFactory()
+    pool = TokenPool("test_rr", factory, size=3)
+
+    first = await pool.get()
+    await wait_until(lambda: len(pool.fresh_tokens) >= 3)
+
+    tokens = [await pool.get() for _ in range(6)]
+    assert first in pool.fresh_tokens
+    assert tokens[:3] == tokens[3:]
+    assert len(set(tokens)) == 3
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_failed_and_expired_tokens():
+    factory = CountingFactory()
+    pool = TokenPool("test_expire", factory, size=2, ttl=0.2, refresh_interval=0.05)
+
+    await pool.get()
+    await wait_until(lambda: len(pool.fresh_tokens) == 2)
+    rejected = pool.fresh_tokens[0]
+
+    pool.report_failure(rejected)
+    assert rejected not in pool.fresh_tokens
+    await wait_until(lambda: len(pool.fresh_tokens) == 2)
+
+    old_tokens = set(pool.fresh_tokens)
+    await wait_until(
+        lambda: not old_tokens & set(pool.fresh_tokens) and len(pool.fresh_tokens) == 2
+    )
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_persists_between_runs():
+    pool = TokenPool("test_persist", CountingFactory(), size=2)
+    await pool.get()
+    await wait_until(lambda: len(pool.fresh_tokens) == 2)
+    await pool.stop()
+
+    factory = CountingFactory()
+    reloaded = TokenPool("test_persist", factory, size=2)
+    reloaded.load()
+    assert sorted(reloaded.fresh_tokens) == ["token-1", "token-2"]
+
+    await reloaded.get()
+    await reloaded.stop()
+    assert factory.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_with_async_factory():
+    async def gen_device_id():
+        return {"deviceId": "7444844253941876231", "cookie": "tt_chain_token=x"}
+
+    pool = TokenPool("test_device", gen_device_id, size=1)
+    device = await pool.get()
+    assert device["deviceId"] == "7444844253941876231"
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_provider_reports_failure_to_pool():
+    pool = TokenPool("test_provider", CountingFactory(), size=2)
+    provider = AsyncTokenProvider("msToken", pool.get, on_failure=pool.report_failure)
+
+    token = await provider.get()
+    await wait_until(lambda: len(pool.fresh_tokens) == 2)
+
+    provider.report_failure()
+    assert token not in pool.fresh_tokens
+    assert await provider.get() != token
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_douyin_wss_crawler_takes_ttwid_from_pool(monkeypatch):
+    from f2.apps.douyin import crawler as douyin_crawler
+    from f2.apps.douyin.model import LiveWebcast
+
+    factory = CountingFactory()
+    pool = TokenPool("test_douyin_ttwid", factory, size=1, persist=False)
+    monkeypatch.setattr(douyin_crawler, "ttwid_pool", pool)
+
+    # 创建爬虫时不生成令牌 (Building the crawler mints nothing)
+    wss = douyin_crawler.DouyinWebSocketCrawler({"show_message": False}, relay=object())
+    assert factory.calls == 0
+
+    async def connect_websocket(uri):
+        raise ConnectionError(wss.wss_headers["Cookie"])
+
+    wss.connect_websocket = connect_websocket
+    params = LiveWebcast(
+        room_id="1", user_unique_id="2", cursor="", internal_ext="", signature=""
+    )
+    with pytest.raises(ConnectionError, match="ttwid=token-1;"):
+        await wss.fetch_live_danmaku(params)
+
+    await pool.stop()
@@ -0,0 +1,135 @@
+# path: tests/test_token_provider.py
+
+import time
+import asyncio
+import pytest
+
+from f2.utils.token_provider import AsyncTokenProvider
+
+
+class CountingFactory:
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.calls = 0
+        self.fail = fail
+        self.delay = delay
+
+    def __call__(self) -> str:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("network down")
+        return f"token-{self.calls}"
+
+
+def test_provider_is_lazy():
+    factory = CountingFactory()
+    provider = AsyncTokenProvider("msToken", factory)
+    assert factory.calls == 0
+
+    assert provider.current() == "token-1"
+    assert provider.current() == "token-1"
+    assert factory.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_refreshes_once():
+    factory = CountingFactory(delay=0.05)
+    provider = AsyncTokenProvider("msToken", factory)
+
+    tokens = await asyncio.gather(*(provider.get() for _ in range(10)))
+    assert set(tokens) == {"token-1"}
+    assert factory.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_refreshes_after_ttl():
+    factory = CountingFactory()
+    provider = AsyncTokenProvider("msToken", factory, ttl=0.05)
+
+    assert await provider.get() == "token-1"
+    await asyncio.sleep(0.06)
+    assert await provider.get() == "token-2"
+
+    provider.invalidate()
+    assert await provider.get() == "token-3"
+
+
+@pytest.mark.asyncio
+async def test_fallback_on_failure():
+    factory = CountingFactory(fail=True)
+    provider = AsyncTokenProvider(
+        "msToken", factory, fallback=lambda: "false-token", retry_after=0.05
+    )
+
+    assert await provider.get() == "false-token"
+    assert await provider.get() == "false-token"
+    assert factory.calls == 1
+
+    factory.fail = False
+    await asyncio.sleep(0.06)
+    assert await provider.get() == "token-2"
+
+
+@pytest.mark.asyncio
+async def test_failure_without_fallback_raises():
+    provider = AsyncTokenProvider("msToken", CountingFactory(fail=True))
+    with pytest.raises(RuntimeError, match="network down"):
+        await provider.get()
+
+
+@pytest.mark.asyncio
+async def test_async_failure_without_fallback_raises():
+    error = ValueError("bad token")
+
+    async def factory():
+        raise error
+
+    provider = AsyncTokenProvider("deviceId", factory)
+    with pytest.raises(ValueError) as excinfo:
+        await provider.get()
+    assert excinfo.value is error
+
+
+def test_on_error_outside_except_block():
+    provider = AsyncTokenProvider("msToken", CountingFactory())
+    error = RuntimeError("network down")
+    # 在 except 块之外调用时也要抛出原始异常
+    with pytest.raises(RuntimeError) as excinfo:
+        provider._on_error(error)
+    assert excinfo.value is error
+
+    provider.fallback = lambda: "false-token"
+    assert provider._on_error(error) == "false-token"
+
+
+@pytest.mark.asyncio
+async def test_current_does_not_block_loop():
+    factory = CountingFactory(delay=0.05)
+    provider = AsyncTokenProvider(
+        "msToken", factory, ttl=0.05, fallback=lambda: "false-token"
+    )
+
+    # 尚无令牌时返回备用值并在后台生成 (Fallback first, real token in background)
+    assert provider.current() == "false-token"
+    await asyncio.sleep(0.08)
+    assert provider.current() == "token-1"
+
+    # 过期后返回旧令牌并在后台刷新 (Stale token while refreshing)
+    await asyncio.sleep(0.06)
+    assert provider.current() == "token-1"
+    await asyncio.sleep(0.08)
+    assert provider.current() == "token-2"
+
+
+@pytest.mark.asyncio
+async def test_async_factory():
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        return "async-token"
+
+    provider = AsyncTokenProvider("deviceId", factory)
+    assert await provider.get() == "async-token"
+    assert await provider.get() == "async-token"
+    assert len(calls) == 1
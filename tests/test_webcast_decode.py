@@ -0,0 +1,125 @@
+# path: tests/test_webcast_decode.py
+
+import json
+import time
+import pytest
+
+from pathlib import Path
+from google.protobuf import json_format
+
+from f2.apps.douyin.crawler import DouyinWebSocketCrawler
+from f2.apps.douyin.proto import douyin_webcast_pb2
+from f2.apps.tiktok.crawler import TiktokWebSocketCrawler
+from f2.apps.tiktok.proto import tiktok_webcast_pb2
+from f2.utils.json_backend import JSON_BACKEND, dumps
+
+DATA_PATH = Path(__file__).parent / "data"
+
+# 录制数据对应的回调与消息类型 (Callbacks and message types of the recorded frames)
+WEBCAST_MESSAGES = {
+    "douyin": (
+        DouyinWebSocketCrawler,
+        douyin_webcast_pb2,
+        {
+            "WebcastLiveShoppingMessage": "LiveShoppingMessage",
+            "WebcastProductChangeMessage": "ProductChangeMessage",
+            "WebcastRoomUserSeqMessage": "RoomUserSeqMessage",
+            "WebcastUpdateFanTicketMessage": "UpdateFanTicketMessage",
+        },
+    ),
+    "tiktok": (
+        TiktokWebSocketCrawler,
+        tiktok_webcast_pb2,
+        {
+            "WebcastChatMessage": "ChatMessage",
+            "WebcastGiftMessage": "GiftMessage",
+            "WebcastLikeMessage": "LikeMessage",
+            "WebcastMemberMessage": "MemberMessage",
+            "WebcastRoomUserSeqMessage": "RoomUserSeqMessage",
+            "WebcastSocialMessage": "SocialMessage",
+            "WebcastOecLiveShoppingMessage": "OecLiveShoppingMessage",
+        },
+    ),
+}
+
+
+def load_frames(app: str) -> list:
+    """
+    读取录制的消息，返回 (回调, 消息类型, 字节数据) 列表。
+    dict 目录中的 JSON 会先编码为 protobuf，protobuf 目录中的数据直接使用。
+    """
+    crawler, pb2, methods = WEBCAST_MESSAGES[app]
+    webcast_path = DATA_PATH / app / "webcast"
+    frames = []
+
+    for method, message_name in methods.items():
+        message_cls = getattr(pb2, message_name)
+        callback = getattr(crawler, method)
+
+        dict_path = webcast_path / "dict" / f"{method}.json"
+        if dict_path.exists() and dict_path.stat().st_size:
+            data = json.loads(dict_path.read_text(encoding="utf-8"))
+            for item in data if isinstance(data, list) else [data]:
+                message = json_format.ParseDict(
+                    item, message_cls(), ignore_unknown_fields=True
+                )
+                frames.append((callback, message_cls, message.SerializeToString()))
+
+        for bin_path in sorted(webcast_path.glob(f"protobuf/{method}_*.bin")):
+            frames.append((callback, message_cls, bin_path.read_bytes()))
+
+    return frames
+
+
+def legacy_decode(message_cls, payload: bytes) -> dict:
+    message = message_cls()
+    message.ParseFromString(payload)
+    return json.loads(
+        json_format.MessageToJson(
+            message, preserving_proto_field_name=True, ensure_ascii=False
+        )
+    )
+
+
+@pytest.fixture(autouse=True)
+def quiet_callbacks(monkeypatch):
+    monkeypatch.setattr(DouyinWebSocketCrawler, "show_message", False)
+    monkeypatch.setattr(TiktokWebSocketCrawler, "show_message", False)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("app", ["douyin", "tiktok"])
+async def test_callbacks_match_json_round_trip(app):
+    frames = load_frames(app)
+    assert frames
+
+    for callback, message_cls, payload in frames:
+        result = await callback(data=payload)
+        assert result == legacy_decode(message_cls, payload)
+        assert json.loads(dumps(result)) == result
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_webcast_messages_per_second():
+    frames = load_frames("douyin") + load_frames("tiktok")
+    rounds = 20
+    total = rounds * len(frames)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _callback, message_cls, payload in frames:
+            json.dumps(legacy_decode(message_cls, payload), ensure_ascii=False)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for callback, _message_cls, payload in frames:
+            dumps(await callback(data=payload))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\nWebcast 消息（解码 + 序列化，{JSON_BACKEND}）：{total / elapsed:.0f} 条/秒，"
+        f"JSON 往返：{total / legacy_elapsed:.0f} 条/秒"
+    )
+    assert elapsed < legacy_elapsed
@@ -0,0 +1,110 @@
+# path: tests/test_websocket_queue.py
+
+import asyncio
+import pytest
+
+from websockets.exceptions import ConnectionClosedOK
+
+from f2.crawlers.base_crawler import FrameSpill, WebSocketCrawler
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("F2_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+class FakeWebSocket:
+    closed = False
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    async def recv(self):
+        if not self.frames:
+            raise ConnectionClosedOK(None, None)
+        # 让出事件循环但不给处理协程足够时间 (Yield without letting workers catch up)
+        await asyncio.sleep(0)
+        return self.frames.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class SlowCrawler(WebSocketCrawler):
+    def __init__(self, frames, delay=0.0, **kwargs):
+        super().__init__(wss_headers={}, timeout=2, **kwargs)
+        self.websocket = FakeWebSocket(frames)
+        self.delay = delay
+        self.handled = []
+
+    async def on_message(self, message):
+        await asyncio.sleep(self.delay)
+        self.handled.append(message)
+
+
+FRAMES = [f"frame-{i}".encode() for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_receive_hands_frames_to_workers():
+    crawler = SlowCrawler(FRAMES, delay=0.01, workers=8)
+
+    assert await crawler.receive_messages() == "closed"
+    assert sorted(crawler.handled) == sorted(FRAMES)
+    assert crawler.stats.received == crawler.stats.processed == 50
+    assert crawler.stats.max_lag > 0
+    assert crawler.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_default_worker_keeps_arrival_order():
+    crawler = SlowCrawler(FRAMES, delay=0.001)
+
+    await crawler.receive_messages()
+    assert crawler.handled == FRAMES
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_when_full():
+    crawler = SlowCrawler(FRAMES, delay=0.05, queue_size=5, workers=1)
+
+    await crawler.receive_messages()
+    assert crawler.stats.dropped > 0
+    assert len(crawler.handled) == 50 - crawler.stats.dropped
+    # 最新的帧总会被保留 (The newest frames are always kept)
+    assert crawler.handled[-1] == FRAMES[-1]
+    assert crawler.stats.max_depth == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow", ["block", "spill"])
+async def test_lossless_policies_keep_order(overflow):
+    crawler = SlowCrawler(
+        FRAMES, delay=0.001, queue_size=3, workers=1, overflow=overflow
+    )
+
+    await crawler.receive_messages()
+    assert crawler.handled == FRAMES
+    assert crawler.stats.dropped == 0
+    if overflow == "spill":
+        assert crawler.stats.spilled > 0
+        assert crawler.stats.max_depth > 3
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        WebSocketCrawler(wss_headers={}, overflow="ignore")
+
+
+def test_frame_spill_round_trip():
+    spill = FrameSpill()
+    spill.push(1.0, b"\x00binary")
+    spill.push(2.0, "文本")
+    assert spill.pop() == (1.0, b"\x00binary")
+    assert spill.pop() == (2.0, "文本")
+    assert spill.pop() is None
+
+    spill.push(3.0, b"again")
+    assert spill.pop() == (3.0, b"again")
+    spill.close()
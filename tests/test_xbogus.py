@@ -1,5 +1,7 @@
 # path: tests/test_xbogus.py
 
+import time
+
 from f2.utils.xbogus import XBogus
 
 
@@ -8,3 +10,28 @@ def test_get_xbogus():
         "aweme_id=7196239141472980280&aid=1128&version_name=23.5.0&device_platform=android&os_version=2333"
     )
     assert xb is not None
+
+
+def test_xbogus_golden_vector(monkeypatch):
+    # 固定时间时，重写前的实现生成的结果 (Output of the previous implementation)
+    monkeypatch.setattr(time, "time", lambda: 1700000000.123)
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0"
+
+    xb = XBogus(user_agent).getXBogus(
+        "aweme_id=7196239141472980280&aid=1128&version_name=23.5.0&device_platform=android&os_version=2333"
+    )
+
+    assert xb[1] == "DFSzswVY7OiANJXJtmWx-e9WX7j2"
+
+
+def test_benchmark_xbogus_signatures_per_second():
+    xbogus = XBogus()
+    params = "aweme_id=7196239141472980280&aid=1128&version_name=23.5.0&device_platform=android"
+    rounds = 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        xbogus.getXBogus(params)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nX-Bogus: {rounds / elapsed:.0f} 次/秒")